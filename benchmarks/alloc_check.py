@@ -0,0 +1,146 @@
+import argparse
+import gc
+import os
+import pickle
+import sys
+import tracemalloc
+
+# Run without a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game.ball import Ball
+from game.game_engine import GameEngine
+from game.paddle import Paddle
+
+# Allocation check for the steady-state update()/render_dirty() cycle
+#
+# A whole series is played once to fill the text and layer caches, then the
+# engine is restored to its start and the same series is played three more
+# times under tracemalloc, each from a full redraw. Blocks allocated from
+# game/ are counted (after a full collection, which also empties the float
+# free list) before and after every incremental render_dirty() call: a
+# steady-state frame must not leave more than it found (it may free what an
+# earlier frame showed). Ticks may swap state values for new ones (an int
+# position becoming a float, a prediction appearing), so they are only held
+# to the same block count at the end of the last two passes; the first one
+# lets values that were allocated before tracing die out. Ball and Paddle
+# must use __slots__ and hand out the same Rect from every rect() call.
+
+WIDTH, HEIGHT = 800, 600
+GAME_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "game")
+
+
+def make_engine(seed):
+    engine = GameEngine(WIDTH, HEIGHT, seed=seed)
+    engine.sound_manager.enabled = False
+    engine._start_series(3)
+    return engine
+
+
+def tick(engine):
+    """One tick with both paddles played by the AI"""
+    engine.player.auto_track(engine.ball, HEIGHT, 1.0, side='left')
+    engine.update()
+    if engine.state == 'game_over':
+        engine._next_game()
+
+
+def play_series(engine, screen, frames=None):
+    """Play until the series ends (or for frames frames); returns the frame count"""
+    count = 0
+    while engine.state != 'series_over' and count != frames:
+        tick(engine)
+        engine.render_dirty(screen, 0.5)
+        count += 1
+    return count
+
+
+def game_blocks():
+    """Live blocks allocated by code in game/"""
+    gc.collect()
+    # Grouping by file is much cheaper than a Filter, which globs every trace
+    stats = tracemalloc.take_snapshot().statistics('filename')
+    return sum(stat.count for stat in stats
+               if stat.traceback[0].filename.startswith(GAME_DIR + os.sep))
+
+
+def check_layout():
+    ball = Ball(400, 300, 7, 7, WIDTH, HEIGHT)
+    paddle = Paddle(10, 250, 10, 100)
+    ok = True
+    for obj in (ball, paddle):
+        name = type(obj).__name__
+        has_dict = hasattr(obj, '__dict__')
+        first = obj.rect()
+        obj.y += 5.5
+        second = obj.rect()
+        reused = first is second and second.y == int(obj.y)
+        print(f"{name}: {'__dict__' if has_dict else '__slots__'}, {sys.getsizeof(obj)} bytes, "
+              f"rect() reused and updated: {'yes' if reused else 'NO'}")
+        ok = ok and not has_dict and reused
+    return ok
+
+
+def check_frames(seed, max_frames):
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    engine = make_engine(seed)
+    start = engine.snapshot()
+    frames = play_series(engine, screen, max_frames)
+
+    # Everything alive now is warm-up; keep the collector from walking it
+    gc.collect()
+    gc.freeze()
+    tracemalloc.start()
+    # Restore traced copies of the start values, or a pass could end with
+    # an untraced one that the next pass replaces with a traced one. The
+    # random states (11:14) are copied into the generators, so keep those
+    # as they are; thousands of traced ints would slow every snapshot
+    values = pickle.loads(pickle.dumps(start[:11] + start[14:]))
+    start = values[:11] + start[11:14] + values[11:]
+    passes = []
+    steady = leaky = 0   # Steady-state frames, and those that left blocks behind
+    for _ in range(3):
+        engine.restore(start)
+        # What was last drawn may come from an earlier pass, or predate tracing
+        engine.request_full_redraw()
+        for _ in range(frames):
+            tick(engine)
+            if engine.state != 'playing' or engine._dirty_state != 'playing':
+                engine.render_dirty(screen, 0.5)   # Full redraw
+                continue
+            before = game_blocks()
+            engine.render_dirty(screen, 0.5)
+            steady += 1
+            if game_blocks() > before:
+                leaky += 1
+        passes.append(game_blocks())
+    _, before, after = passes
+    tracemalloc.stop()
+    gc.unfreeze()
+    pygame.quit()
+
+    print(f"3 x {frames} frames: {leaky} of {steady} steady-state frames left blocks "
+          f"allocated from game/ behind; game/ blocks at the end of the last two passes {before} -> {after}")
+    return leaky == 0 and after == before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tracemalloc check of the update()/render_dirty() cycle")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-frames", type=int, default=200000,
+                        help="stop the series after this many frames")
+    args = parser.parse_args()
+
+    ok = check_layout()
+    ok = check_frames(args.seed, args.max_frames) and ok
+    if not ok:
+        raise SystemExit(1)
+    print("OK: steady-state frames allocate no net blocks")
+
+
+if __name__ == "__main__":
+    main()
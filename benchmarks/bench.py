@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Run without a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game import state_codec, synth
+from game.game_engine import GameEngine, SOUND_PARAMS
+from game.sound_variants import VariantCache
+
+# Benchmark suite for the physics, AI and rendering hot paths
+#
+# Each benchmark is timed in several rounds; the reported latency is the
+# median per-call time across rounds. Results can be saved as a baseline and
+# later runs compared against it to flag regressions.
+
+WIDTH, HEIGHT = 800, 600
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def make_engine(state='playing', seed=1234, ball_count=1):
+    """Engine with rendering enabled, put into the requested state"""
+    engine = GameEngine(WIDTH, HEIGHT, seed=seed)
+    engine.sound_manager.enabled = False
+    engine.ball_count = ball_count
+    if state == 'menu':
+        return engine
+    engine._start_series(5)
+    # Move into a mid-rally position
+    for _ in range(40):
+        engine.update()
+    if state == 'game_over':
+        engine.player_score = engine.winning_score
+        engine._check_game_winner()
+    elif state == 'series_over':
+        engine.player_games_won = engine.series_target - 1
+        engine.player_score = engine.winning_score
+        engine._check_game_winner()
+    return engine
+
+
+def time_call(func, number, rounds):
+    """Median seconds per call of func over several timing rounds"""
+    for _ in range(min(number, 100)):
+        func()  # Warm up caches (text, layers, ...)
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples)
+
+
+def benchmarks(screen):
+    """Yield (name, callable, calls per round) for every benchmark"""
+    engine = make_engine('playing')
+    ball, player, ai = engine.ball, engine.player, engine.ai
+
+    # Physics and AI on a ball in the middle of a rally
+    def ball_move():
+        ball.x, ball.y = 400.0, 300.0
+        ball.move()
+    yield 'ball.move', ball_move, 20000
+    yield 'ball.check_collision', lambda: ball.check_collision(player, ai), 20000
+    yield 'paddle.auto_track', lambda: ai.auto_track(ball, HEIGHT), 20000
+    yield 'paddle.predict_track', lambda: ai.predict_track(ball, HEIGHT, 0.0, 0), 20000
+
+    # Full simulation ticks, resetting the rally whenever a game ends
+    sim = make_engine('playing')
+    def update():
+        sim.update()
+        if sim.state != 'playing':
+            sim._next_game()
+    yield 'engine.update', update, 20000
+
+    # Rollback building blocks
+    snapshot = sim.snapshot()
+    yield 'engine.snapshot', sim.snapshot, 20000
+    yield 'engine.restore', lambda: sim.restore(snapshot), 20000
+
+    # Binary state records: packing in place and a one-tick delta
+    record, base = bytearray(state_codec.STATE_SIZE), bytearray(state_codec.STATE_SIZE)
+    delta = bytearray(state_codec.DELTA_MAX_SIZE)
+    state_codec.pack_into(sim, base)
+    update()
+    state_codec.pack_into(sim, record)
+    yield 'codec.pack_into', lambda: state_codec.pack_into(sim, record), 20000
+    yield 'codec.encode_delta', lambda: state_codec.encode_delta(base, record, delta), 20000
+
+    # Sound variants: the cached lookup every hit in a rally makes, and
+    # deriving a new variant on a cache miss
+    frequency, _, channels = pygame.mixer.get_init()
+    variants = VariantCache()
+    base = synth.render(SOUND_PARAMS['paddle_hit'], frequency, channels)
+    variants.add_base('paddle_hit', pygame.sndarray.make_sound(base))
+    yield 'sound.variant_hit', lambda: variants.get('paddle_hit', -0.95, 7.3), 20000
+    def variant_miss():
+        variants.sounds.clear()
+        variants.get('paddle_hit', -0.95, 7.3)
+    yield 'sound.variant_miss', variant_miss, 2000
+
+    # Each render path on its own
+    menu = make_engine('menu')
+    game_over = make_engine('game_over')
+    series_over = make_engine('series_over')
+    yield 'render.menu', lambda: menu._render_menu(screen), 500
+    yield 'render.game', lambda: engine._render_game(screen, 0.5), 500
+    yield 'render.game_over', lambda: game_over._render_game_over(screen), 500
+    yield 'render.series_over', lambda: series_over._render_series_over(screen), 500
+
+    # Whole frames (tick + render + present) per state
+    for name, frame_engine in (('menu', menu), ('playing', sim),
+                               ('game_over', game_over), ('series_over', series_over)):
+        def frame(frame_engine=frame_engine):
+            if frame_engine.state == 'playing':
+                update()
+            screen.fill((0, 0, 0))
+            frame_engine.render(screen, 0.5)
+            pygame.display.flip()
+        yield f'frame.{name}', frame, 300
+
+    def dirty_frame():
+        update()
+        pygame.display.update(sim.render_dirty(screen, 0.5))
+    yield 'frame.playing_dirty', dirty_frame, 300
+
+    # Chaos mode with 500 balls: one tick, one render and a whole frame
+    chaos = make_engine('playing', ball_count=500)
+    def chaos_update():
+        chaos.update()
+        if chaos.state != 'playing':
+            chaos._next_game()
+    yield 'chaos.update', chaos_update, 2000
+    yield 'render.chaos', lambda: chaos._render_game(screen, 0.5), 300
+    def chaos_frame():
+        chaos_update()
+        pygame.display.update(chaos.render_dirty(screen, 0.5))
+    yield 'frame.chaos', chaos_frame, 300
+
+
+def run(rounds, only=None):
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    results = {}
+    for name, func, number in benchmarks(screen):
+        if only and not any(part in name for part in only):
+            continue
+        seconds = time_call(func, number, rounds)
+        results[name] = {'us_per_call': seconds * 1e6, 'calls_per_second': 1 / seconds}
+        fps = f"{1 / seconds:12,.0f} FPS" if name.startswith('frame.') else ''
+        print(f"{name:24} {seconds * 1e6:10.2f} us/call {fps}")
+    pygame.quit()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print and return the benchmarks that got slower than the threshold"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            # Not a regression, but it is not being guarded either
+            print(f"WARNING {name}: no baseline entry ({result['us_per_call']:.2f} us/call); "
+                  f"run with --save to record it")
+            continue
+        before = baseline[name]['us_per_call']
+        ratio = result['us_per_call'] / before
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            print(f"REGRESSION {name}: {before:.2f} -> {result['us_per_call']:.2f} us/call "
+                  f"({(ratio - 1):+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for physics, AI and rendering")
+    parser.add_argument("--rounds", type=int, default=7, help="timing rounds per benchmark")
+    parser.add_argument("--only", nargs="+", help="run only benchmarks whose name contains one of these")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE,
+                        help="write results as the new baseline (default benchmarks/baseline.json)")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE,
+                        help="compare against a baseline and exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before flagging a regression (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = run(args.rounds, args.only)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({'python': platform.python_version(), 'pygame': pygame.version.ver,
+                       'machine': platform.machine(), 'results': results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
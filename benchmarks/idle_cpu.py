@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# CPU use of the main loop on idle screens
+#
+# Runs main.py's loop in a fresh process for a few seconds on the menu and
+# game over screens, once rendering at full rate (IDLE_WAIT = False) and
+# once sleeping in pygame.event.wait() (IDLE_WAIT = True), and reports the
+# process CPU time per second of wall time. An optional synthetic key press
+# every --key-interval seconds checks that input still redraws promptly.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(state, idle_wait, seconds, key_interval):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import pygame
+    import main
+
+    main.IDLE_WAIT = idle_wait
+    main.engine.replay_dir = None
+    main.TELEMETRY_DB = None
+    if state == 'game_over':
+        engine = main.engine
+        engine._start_series(3)
+        engine.player_score = engine.winning_score
+        engine._check_game_winner()
+
+    # Count presented frames by wrapping the present calls
+    frames = [0]
+    def counted(present):
+        def wrapper(*args):
+            frames[0] += 1
+            return present(*args)
+        return wrapper
+    pygame.display.update = counted(pygame.display.update)
+    pygame.display.flip = counted(pygame.display.flip)
+
+    # Menu navigation keys wake the idle loop and must be redrawn
+    if key_interval:
+        key = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN, mod=0, unicode='', scancode=0)
+        pygame.time.set_timer(key, int(key_interval * 1000))
+    pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), loops=1)
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    main.main()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    print(json.dumps({'cpu': cpu / wall, 'fps': frames[0] / wall}))
+
+
+def run(state, idle_wait, seconds, key_interval):
+    command = [sys.executable, os.path.abspath(__file__), "--child", state,
+               "--seconds", str(seconds), "--key-interval", str(key_interval)]
+    if idle_wait:
+        command.append("--idle-wait")
+    result = subprocess.run(command, capture_output=True, text=True, check=True, cwd=ROOT)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU use of the main loop on idle screens")
+    parser.add_argument("--seconds", type=float, default=5.0, help="time spent on each screen")
+    parser.add_argument("--key-interval", type=float, default=1.0,
+                        help="seconds between synthetic key presses (0 = none)")
+    parser.add_argument("--child", choices=['menu', 'game_over'], help=argparse.SUPPRESS)
+    parser.add_argument("--idle-wait", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.idle_wait, args.seconds, args.key_interval)
+        return
+
+    print(f"{args.seconds:g} s per screen, a key press every {args.key_interval:g} s")
+    for state in ('menu', 'game_over'):
+        for idle_wait in (False, True):
+            result = run(state, idle_wait, args.seconds, args.key_interval)
+            mode = "event.wait" if idle_wait else "full rate"
+            print(f"{state:10} {mode:11} CPU {result['cpu']:6.1%}  {result['fps']:7.1f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
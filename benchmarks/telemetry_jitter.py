@@ -0,0 +1,167 @@
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+# Run without a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game.game_engine import GameEngine
+from game.telemetry import SCHEMA, Telemetry
+
+# Frame-time jitter with rally telemetry on
+#
+# Plays AI-vs-AI rallies (tick + dirty render + present per frame, capped at
+# main.py's frame rate or uncapped) in interleaved rounds with telemetry off,
+# with the ring buffer and background writer, and with every event written
+# and committed on the game thread, which is what update() must not do.
+# The frame times of all rounds are pooled per mode, so the p99 rests on
+# enough frames that one scheduler hiccup does not decide the result. Fails
+# if the background writer raises the p99 frame time above running without
+# telemetry, beyond a small tolerance. Rally events land on well under 1% of
+# frames, so the cost of committing them on the game thread hardly shows in
+# the p99: frames that reported a hit or a point are also timed on their own,
+# and with the background writer their median must be clearly below the
+# synchronous one.
+
+WIDTH, HEIGHT = 800, 600
+
+
+class SyncTelemetry(Telemetry):
+    """Writes and commits every event on the calling thread (for comparison)"""
+    def __init__(self, path):
+        super().__init__(path, flush_interval=3600.0)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def _append(self, event):
+        super()._append(event)
+        self._flush(self.db)
+
+    def close(self):
+        super().close()
+        self.db.close()
+
+
+def play(engine, screen, frames, fps=0):
+    """
+    Per-frame work times in seconds, and those of the frames with a paddle
+    hit or a point, sleeping out the rest of each frame at fps
+    """
+    times, event_times = [], []
+    period = 1.0 / fps if fps else 0.0
+    for _ in range(frames):
+        start = time.perf_counter()
+        engine.player.auto_track(engine.ball, HEIGHT, 1.0, side='left')
+        engine.player.prev_y = engine.player.y
+        engine.ai.prev_y = engine.ai.y
+        rally = (engine.ball.velocity_x > 0, engine.player_score + engine.ai_score)
+        engine.update()
+        event = rally != (engine.ball.velocity_x > 0, engine.player_score + engine.ai_score)
+        if engine.state == 'game_over':
+            engine._next_game()
+        elif engine.state == 'series_over':
+            engine._start_series(7)
+        pygame.display.update(engine.render_dirty(screen, 1.0))
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        if event:
+            event_times.append(elapsed)
+        if period > elapsed:
+            time.sleep(period - elapsed)
+    return times, event_times
+
+
+def stats(rounds):
+    """Mean, stdev, p99 and max of the frame times of all rounds pooled, and the median event frame"""
+    times = sorted(elapsed for round_times, _ in rounds for elapsed in round_times)
+    event_times = [elapsed for _, round_times in rounds for elapsed in round_times]
+    return {'mean': statistics.mean(times), 'stdev': statistics.stdev(times),
+            'p99': times[int(len(times) * 0.99)], 'max': times[-1],
+            'event': statistics.median(event_times)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame-time jitter with rally telemetry on")
+    parser.add_argument("--rounds", type=int, default=5, help="interleaved rounds per mode")
+    parser.add_argument("--frames", type=int, default=3000, help="frames per round")
+    parser.add_argument("--fps", type=int, default=144, help="frame rate cap like main.py (0 = uncapped)")
+    parser.add_argument("--flush-interval", type=float, default=0.1,
+                        help="background writer period in seconds")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative growth of p99 over telemetry off")
+    parser.add_argument("--slack", type=float, default=0.05,
+                        help="allowed absolute growth of p99 over telemetry off in ms")
+    parser.add_argument("--sync-ratio", type=float, default=2.0,
+                        help="how many times slower synchronous event frames must be")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    directory = tempfile.mkdtemp()
+    modes = {
+        'off': lambda: None,
+        'background': lambda: Telemetry(os.path.join(directory, "background.db"),
+                                        flush_interval=args.flush_interval),
+        'synchronous': lambda: SyncTelemetry(os.path.join(directory, "sync.db")),
+    }
+    engines = {}
+    for mode in modes:
+        engine = GameEngine(WIDTH, HEIGHT, seed=1234)
+        engine.sound_manager.enabled = False
+        engine._start_series(7)
+        engine.telemetry = modes[mode]()
+        engines[mode] = engine
+    play(engines['off'], screen, 300)   # Warm the text and layer caches
+
+    times = {mode: [] for mode in modes}
+    for _ in range(args.rounds):
+        for mode, engine in engines.items():
+            times[mode].append(play(engine, screen, args.frames, args.fps))
+
+    print(f"{args.rounds} x {args.frames} frames per mode at {args.fps or 'uncapped'} FPS "
+          f"(pooled)")
+    print(f"{'mode':12} {'mean ms':>8} {'stdev ms':>9} {'p99 ms':>7} {'max ms':>7} "
+          f"{'event ms':>9} {'events':>7}")
+    results = {}
+    for mode, engine in engines.items():
+        telemetry = engine.telemetry
+        events = ""
+        if telemetry is not None:
+            telemetry.close()
+            events = telemetry.written
+            if telemetry.dropped:
+                events = f"{events} ({telemetry.dropped} dropped)"
+        results[mode] = stats(times[mode])
+        row = results[mode]
+        print(f"{mode:12} {row['mean'] * 1e3:8.3f} {row['stdev'] * 1e3:9.3f} "
+              f"{row['p99'] * 1e3:7.3f} {row['max'] * 1e3:7.2f} {row['event'] * 1e3:9.3f} {events:>7}")
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+    off, background, synchronous = (results[mode] for mode in modes)
+    ok = True
+    if background['p99'] > off['p99'] * (1 + args.tolerance) + args.slack / 1e3:
+        print(f"p99 grew with telemetry on: {background['p99'] * 1e3:.3f} ms against "
+              f"{off['p99'] * 1e3:.3f} ms off")
+        ok = False
+    if background['event'] * args.sync_ratio > synchronous['event']:
+        print(f"Event frames with the background writer are not {args.sync_ratio:g}x faster than "
+              f"with synchronous writes: {background['event'] * 1e3:.3f} ms against "
+              f"{synchronous['event'] * 1e3:.3f} ms")
+        ok = False
+    if not ok:
+        raise SystemExit(1)
+    print(f"p99 with telemetry on is within {args.tolerance:.0%} (+{args.slack:g} ms) of "
+          f"telemetry off; event frames are {synchronous['event'] / background['event']:.1f}x "
+          f"faster than with synchronous writes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pygame
+
+# Low-latency audio
+#
+# AudioEngine opens the mixer with a chosen sample rate and buffer size and
+# reserves channels for each sound category, so a burst of effects never
+# waits for (or cuts off) whatever pygame would pick from its shared pool.
+# When every voice of a category is busy, its stealing rule decides:
+#   'oldest': restart the voice that has been playing longest
+#   'none':   keep the playing voices and drop the new sound
+#
+# The CLI measures the delay from play() until the buffer holding the
+# sound's first sample is handed to the audio device, using SDL's "disk"
+# driver, which writes every submitted buffer to a file at the device's
+# pace. The file is written through a 4 KB stdio buffer, so submission times
+# come from a straight-line fit of file size against time rather than from
+# individual writes.
+
+# Category -> (reserved voices, stealing rule)
+CATEGORIES = {
+    'hit': (2, 'oldest'),
+    'wall': (2, 'oldest'),
+    'score': (1, 'none'),
+}
+
+# Sound name -> category
+SOUND_CATEGORIES = {
+    'paddle_hit': 'hit',
+    'wall_bounce': 'wall',
+    'score': 'score',
+}
+
+FREE_CHANNELS = 4   # Left unreserved for Sound.play() outside any category
+
+
+class AudioEngine:
+    """Mixer with dedicated, voice-stealing channels per sound category"""
+    def __init__(self, frequency=22050, buffer=512, channels=2, categories=CATEGORIES):
+        pygame.mixer.init(frequency=frequency, size=-16, channels=channels, buffer=buffer)
+        self.format = pygame.mixer.get_init()
+        self.buffer = buffer
+        self.categories = categories
+
+        # Reserved channels are never handed out by Sound.play()
+        reserved = sum(voices for voices, _ in categories.values())
+        pygame.mixer.set_num_channels(reserved + FREE_CHANNELS)
+        pygame.mixer.set_reserved(reserved)
+        self.voices = {}
+        index = 0
+        for category, (voices, _) in categories.items():
+            self.voices[category] = [pygame.mixer.Channel(i) for i in range(index, index + voices)]
+            index += voices
+        self.started = {}   # Channel -> time it was last started
+
+        # Stats per category
+        self.played = dict.fromkeys(categories, 0)
+        self.stolen = dict.fromkeys(categories, 0)
+        self.dropped = dict.fromkeys(categories, 0)
+
+    @property
+    def buffer_latency(self):
+        """Duration of one mixer buffer in seconds"""
+        return self.buffer / self.format[0]
+
+    def play(self, category, sound):
+        """
+        Play sound on one of the category's voices.
+
+        Returns:
+            The Channel used, or None if the sound was dropped
+        """
+        voices = self.voices[category]
+        for channel in voices:
+            if not channel.get_busy():
+                break
+        else:
+            if self.categories[category][1] != 'oldest':
+                self.dropped[category] += 1
+                return None
+            channel = min(voices, key=lambda voice: self.started.get(voice, 0.0))
+            self.stolen[category] += 1
+        channel.play(sound)
+        self.started[channel] = time.perf_counter()
+        self.played[category] += 1
+        return channel
+
+    def stop(self):
+        pygame.mixer.stop()
+
+    def close(self):
+        pygame.mixer.quit()
+
+
+def click(format, length=256):
+    """Full-scale square click whose first sample is easy to find in the output"""
+    frequency, _, channels = format
+    samples = np.full((length, channels), 16000, dtype=np.int16)
+    return pygame.sndarray.make_sound(samples if channels > 1 else samples[:, 0])
+
+
+def _watch(path, timeline, stop):
+    """Record (time, file size) whenever the disk driver writes a buffer"""
+    size = -1
+    while not stop.is_set():
+        try:
+            current = os.path.getsize(path)
+        except OSError:
+            current = 0
+        if current != size:
+            size = current
+            timeline.append((time.perf_counter(), size))
+        time.sleep(0.0002)
+
+
+def measure_latency(frequency, buffer, plays=40, seed=0):
+    """
+    Play clicks at random moments on the disk audio driver, find where each
+    one starts in the written stream and when the buffer holding that
+    sample was submitted.
+
+    Returns:
+        (list of play()-to-submission delays in seconds, whether every click
+        started on a buffer boundary, i.e. the mixer really used buffer)
+    """
+    path = os.path.join(tempfile.mkdtemp(), "audio.raw")
+    os.environ["SDL_AUDIODRIVER"] = "disk"
+    os.environ["SDL_DISKAUDIOFILE"] = path
+    audio = AudioEngine(frequency, buffer)
+    channels = audio.format[2]
+    frame_bytes = 2 * channels
+    sound = click(audio.format)
+    rng = random.Random(seed)
+
+    timeline = []
+    stop = threading.Event()
+    watcher = threading.Thread(target=_watch, args=(path, timeline, stop), daemon=True)
+    watcher.start()
+    time.sleep(0.2)   # Let the device start streaming
+    played = []       # (time of play(), frames already written then)
+    for _ in range(plays):
+        time.sleep(rng.uniform(0.05, 0.1))
+        played.append((time.perf_counter(), os.path.getsize(path) // frame_bytes))
+        audio.play('hit', sound)
+    time.sleep(4 * audio.buffer_latency + 0.2)
+    stop.set()
+    watcher.join()
+    audio.close()
+
+    stream = np.abs(np.fromfile(path, dtype=np.int16).reshape(-1, channels)[:, 0]) > 8000
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+    onsets = np.flatnonzero(stream[1:] & ~stream[:-1]) + 1
+    # Time at which the stream had reached a given frame
+    written = np.array([size // frame_bytes for _, size in timeline[1:]])
+    write_times = np.array([when for when, _ in timeline[1:]])
+    slope, intercept = np.polyfit(written, write_times, 1)
+    delays = []
+    previous = -1
+    for when, position in played:
+        # The first click start after this play() (and after the last one found)
+        later = onsets[onsets > max(position - 1, previous)]
+        if not len(later):
+            break
+        previous = later[0]
+        # ...submitted when the stream reached the end of its buffer
+        end = (previous // buffer + 1) * buffer
+        delays.append(float(slope * end + intercept - when))
+    aligned = bool(np.all(onsets % buffer == 0))
+    return delays, aligned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure play()-to-submission audio latency")
+    parser.add_argument("--frequencies", type=int, nargs="+", default=[22050, 44100, 48000])
+    parser.add_argument("--buffers", type=int, nargs="+", default=[128, 256, 512, 1024])
+    parser.add_argument("--plays", type=int, default=40, help="clicks per configuration")
+    parser.add_argument("--child", type=int, nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_latency(*args.child, args.plays)))
+        return
+
+    # One process per configuration: SDL reads the driver settings at start
+    # and the disk driver logs a warning we do not want in the table
+    print(f"{'rate':>6} {'buffer':>6} {'buffer ms':>9} {'median ms':>9} {'max ms':>7}")
+    for frequency in args.frequencies:
+        for buffer in args.buffers:
+            result = subprocess.run([sys.executable, "-m", "game.audio", "--plays", str(args.plays),
+                                     "--child", str(frequency), str(buffer)],
+                                    capture_output=True, text=True, check=True)
+            delays, aligned = json.loads(result.stdout.strip().splitlines()[-1])
+            if len(delays) < args.plays:
+                print(f"{frequency:6} {buffer:6}  only {len(delays)}/{args.plays} clicks found")
+                continue
+            print(f"{frequency:6} {buffer:6} {buffer / frequency * 1e3:9.1f} "
+                  f"{statistics.median(delays) * 1e3:9.1f} {max(delays) * 1e3:7.1f}"
+                  + ("" if aligned else "  (mixer changed the buffer size)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+import argparse
+import time
+
+import numpy as np
+
+from .game_engine import GameEngine
+
+# Vectorized headless simulator
+#
+# Holds N independent matches as a structure of arrays and advances all of
+# them with one set of NumPy operations per step. The rules mirror
+# GameEngine.update(): Ball.move (wall bounce), Ball.check_collision (swept
+# paddle crossing + spin from _bounce_off_paddle + speed cap), scoring and
+# Paddle.auto_track, in that order.
+
+# Match geometry, identical to GameEngine / Ball / Paddle
+PADDLE_WIDTH = 10
+PADDLE_HEIGHT = 100
+PADDLE_SPEED = 7
+PLAYER_X = 10
+BALL_SIZE = 7
+DEAD_ZONE = 20
+SERVE_VX = np.array([-5, 5])
+SERVE_VY = np.array([-3, 3])
+
+# Values stored in BatchSimulator.winner
+NO_WINNER = 0
+PLAYER_WON = 1
+AI_WON = 2
+
+
+class BatchSimulator:
+    """Advances N headless matches at once using NumPy arrays"""
+    def __init__(self, n, width=800, height=600, winning_score=5, difficulty=0.8, seed=None,
+                 serve=None):
+        self.n = n
+        self.width = width
+        self.height = height
+        self.winning_score = winning_score
+        self.difficulty = difficulty
+        self.rng = np.random.default_rng(seed)
+        # Optional callable(lanes) -> (velocity_x, velocity_y) replacing random serves
+        self.serve = serve
+
+        self.ai_x = width - 20
+        self.player_edge = PLAYER_X + PADDLE_WIDTH
+        self.start_x = width // 2
+        self.start_y = height // 2
+
+        self.ball_x = np.zeros(n)
+        self.ball_y = np.zeros(n)
+        self.prev_x = np.zeros(n)
+        self.prev_y = np.zeros(n)
+        self.velocity_x = np.zeros(n)
+        self.velocity_y = np.zeros(n)
+        self.player_y = np.zeros(n)
+        self.ai_y = np.zeros(n)
+        self.player_score = np.zeros(n, dtype=np.int32)
+        self.ai_score = np.zeros(n, dtype=np.int32)
+        self.hits = np.zeros(n, dtype=np.int32)
+        self.frames = np.zeros(n, dtype=np.int32)
+        self.winner = np.zeros(n, dtype=np.int8)
+        # Lanes where each side scored on the latest step
+        self.player_point = np.zeros(n, dtype=bool)
+        self.ai_point = np.zeros(n, dtype=bool)
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """Start fresh matches in the selected lanes (all lanes by default)"""
+        if mask is None:
+            mask = np.ones(self.n, dtype=bool)
+        self.player_y[mask] = self.height // 2 - 50
+        self.ai_y[mask] = self.height // 2 - 50
+        self.player_score[mask] = 0
+        self.ai_score[mask] = 0
+        self.hits[mask] = 0
+        self.frames[mask] = 0
+        self.winner[mask] = NO_WINNER
+        self._serve(mask)
+
+    def _serve(self, mask):
+        """Put the ball back in the middle with a random direction (Ball.reset)"""
+        self.ball_x[mask] = self.start_x
+        self.ball_y[mask] = self.start_y
+        self.prev_x[mask] = self.start_x
+        self.prev_y[mask] = self.start_y
+        if self.serve is not None:
+            self.velocity_x[mask], self.velocity_y[mask] = self.serve(np.flatnonzero(mask))
+        else:
+            count = int(np.count_nonzero(mask))
+            self.velocity_x[mask] = self.rng.choice(SERVE_VX, size=count)
+            self.velocity_y[mask] = self.rng.choice(SERVE_VY, size=count)
+
+    def load_engines(self, engines):
+        """Copy the current state of GameEngine objects into the lanes"""
+        for i, engine in enumerate(engines):
+            ball = engine.ball
+            self.ball_x[i] = ball.x
+            self.ball_y[i] = ball.y
+            self.prev_x[i] = ball.prev_x
+            self.prev_y[i] = ball.prev_y
+            self.velocity_x[i] = ball.velocity_x
+            self.velocity_y[i] = ball.velocity_y
+            self.player_y[i] = engine.player.y
+            self.ai_y[i] = engine.ai.y
+            self.player_score[i] = engine.player_score
+            self.ai_score[i] = engine.ai_score
+            self.winner[i] = NO_WINNER if engine.state == 'playing' else (
+                PLAYER_WON if engine.winner == 'player' else AI_WON)
+
+    def step(self, player_dy=None):
+        """
+        Advance every unfinished match by one frame.
+
+        Args:
+            player_dy: Optional array of player paddle moves for this frame
+                       (e.g. -10, 0 or 10 like the W/S keys)
+
+        Returns:
+            Boolean array of lanes in which a point was scored this frame
+        """
+        active = self.winner == NO_WINNER
+        height = self.height
+        max_y = height - BALL_SIZE
+        max_paddle_y = height - PADDLE_HEIGHT
+
+        # Player input (GameEngine.handle_input runs before update)
+        if player_dy is not None:
+            moved = np.clip(self.player_y + player_dy, 0, max_paddle_y)
+            self.player_y = np.where(active, moved, self.player_y)
+
+        # Ball.move
+        x = np.where(active, self.ball_x + self.velocity_x, self.ball_x)
+        y = np.where(active, self.ball_y + self.velocity_y, self.ball_y)
+        self.prev_x = np.where(active, self.ball_x, self.prev_x)
+        self.prev_y = np.where(active, self.ball_y, self.prev_y)
+        wall = active & ((y <= 0) | (y + BALL_SIZE >= height))
+        vy = np.where(wall, -self.velocity_y, self.velocity_y)
+        y = np.where(wall, np.clip(y, 0, max_y), y)
+        vx = self.velocity_x
+
+        # Ball.check_collision: swept crossing of the paddle face plus a
+        # vertical overlap test on the float positions
+        left = (active & (vx < 0) & (self.prev_x >= self.player_edge) & (x <= self.player_edge)
+                & self._overlaps(y, self.player_y))
+        right = (active & (vx > 0) & (self.prev_x + BALL_SIZE <= self.ai_x)
+                 & (x + BALL_SIZE >= self.ai_x) & self._overlaps(y, self.ai_y))
+        hit = left | right
+
+        # Ball._bounce_off_paddle
+        paddle_y = np.where(left, self.player_y, self.ai_y)
+        vx = np.where(hit, -vx, vx)
+        x = np.where(left, self.player_edge, np.where(right, self.ai_x - BALL_SIZE, x))
+        paddle_center = paddle_y + PADDLE_HEIGHT / 2
+        ball_center = y + BALL_SIZE / 2
+        relative_hit = (ball_center - paddle_center) / (PADDLE_HEIGHT / 2)
+        vy = np.where(hit, np.clip(vy + relative_hit * 2, -8, 8), vy)
+        boost = hit & (np.abs(vx) < 12)
+        vx = np.where(boost, np.where(vx > 0, vx + 0.3, vx - 0.3), vx)
+        self.hits += hit
+
+        self.ball_x = x
+        self.ball_y = y
+        self.velocity_x = vx
+        self.velocity_y = vy
+
+        # Scoring
+        ai_point = active & (x <= 0)
+        player_point = active & ~ai_point & (x >= self.width)
+        scored = ai_point | player_point
+        self.player_point = player_point
+        self.ai_point = ai_point
+        self.ai_score += ai_point
+        self.player_score += player_point
+        self.winner[scored & (self.player_score >= self.winning_score)] = PLAYER_WON
+        self.winner[scored & (self.winner == NO_WINNER) & (self.ai_score >= self.winning_score)] = AI_WON
+        serving = scored & (self.winner == NO_WINNER)
+        if serving.any():
+            self._serve(serving)
+
+        # Paddle.auto_track for the AI paddle
+        self.ai_y = np.where(active, self._auto_track(), self.ai_y)
+        self.frames += active
+        return scored
+
+    def _overlaps(self, ball_y, paddle_y):
+        """Vectorized Ball._check_vertical_overlap"""
+        return ~((ball_y + BALL_SIZE < paddle_y) | (ball_y > paddle_y + PADDLE_HEIGHT))
+
+    def _auto_track(self):
+        """Vectorized Paddle.auto_track, returns the new AI paddle positions"""
+        difficulty = self.difficulty
+        paddle_center = self.ai_y + PADDLE_HEIGHT / 2
+        ball_center = self.ball_y + BALL_SIZE / 2
+
+        # Tracking: same alternating error term as Paddle.auto_track
+        error_margin = (1 - difficulty) * 50
+        sign = np.where(np.trunc(self.ball_y) % 2 == 0, 1, -1)
+        target = ball_center + sign * error_margin
+        step = PADDLE_SPEED * difficulty
+        tracking = np.where(target < paddle_center - DEAD_ZONE, -step,
+                            np.where(target > paddle_center + DEAD_ZONE, step, 0.0))
+
+        # Ball moving away: drift back to the center
+        screen_center = self.height / 2
+        drift = PADDLE_SPEED * 0.3
+        returning = np.where(paddle_center < screen_center - DEAD_ZONE, drift,
+                             np.where(paddle_center > screen_center + DEAD_ZONE, -drift, 0.0))
+
+        dy = np.where(self.velocity_x > 0, tracking, returning)
+        moved = np.clip(self.ai_y + dy, 0, self.height - PADDLE_HEIGHT)
+        return np.where(dy != 0, moved, self.ai_y)
+
+    def run(self, max_frames, player_dy=None):
+        """Step until every match has a winner or max_frames is reached"""
+        for _ in range(max_frames):
+            if not (self.winner == NO_WINNER).any():
+                break
+            self.step(player_dy)
+        return self.winner
+
+
+def _scripted_inputs(ball_y, paddle_y, rng):
+    """Noisy W/S presses that chase the ball so parity runs include rallies"""
+    target = ball_y + rng.integers(-60, 61, size=np.shape(ball_y))
+    center = np.asarray(paddle_y) + PADDLE_HEIGHT / 2
+    return np.where(target < center - 10, -10, np.where(target > center + 10, 10, 0))
+
+
+def verify_parity(n=64, frames=5000, seed=0):
+    """
+    Run n object-based GameEngines and a BatchSimulator side by side and
+    check that every lane matches its engine exactly on every frame.
+
+    Serves are random in both engines, so the batch simulator takes each
+    new serve velocity from the matching engine's Ball.reset().
+
+    Returns:
+        Number of frames compared
+    """
+    engines = []
+    for i in range(n):
+        engine = GameEngine(800, 600, headless=True, seed=seed * n + i)
+        engine._start_series(3)
+        engines.append(engine)
+
+    def engine_serves(lanes):
+        return ([engines[i].ball.velocity_x for i in lanes],
+                [engines[i].ball.velocity_y for i in lanes])
+
+    sim = BatchSimulator(n, 800, 600, winning_score=engines[0].winning_score, serve=engine_serves)
+    sim.load_engines(engines)
+    input_rng = np.random.default_rng(seed)
+
+    for frame in range(frames):
+        ball_y = np.array([engine.ball.y for engine in engines])
+        player_y = np.array([engine.player.y for engine in engines])
+        dy = _scripted_inputs(ball_y, player_y, input_rng)
+
+        for engine, move in zip(engines, dy):
+            if engine.state == 'playing' and move:
+                engine.player.move(int(move), engine.height)
+            engine.update()
+        sim.step(dy)
+
+        for i, engine in enumerate(engines):
+            expected = (engine.ball.x, engine.ball.y, engine.ball.velocity_x, engine.ball.velocity_y,
+                        engine.player.y, engine.ai.y, engine.player_score, engine.ai_score)
+            actual = (sim.ball_x[i], sim.ball_y[i], sim.velocity_x[i], sim.velocity_y[i],
+                      sim.player_y[i], sim.ai_y[i], sim.player_score[i], sim.ai_score[i])
+            if expected != actual:
+                raise AssertionError(
+                    f"Lane {i} diverged on frame {frame}: engine={expected} batch={actual}")
+
+        if all(engine.state != 'playing' for engine in engines):
+            return frame + 1
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless vectorized ping pong simulator")
+    parser.add_argument("--matches", type=int, default=4096, help="number of parallel matches")
+    parser.add_argument("--frames", type=int, default=20000, help="maximum frames to simulate")
+    parser.add_argument("--difficulty", type=float, default=0.8, help="AI difficulty (0.0 - 1.0)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--parity", action="store_true",
+                        help="check the batch engine against GameEngine instead of benchmarking")
+    args = parser.parse_args()
+
+    if args.parity:
+        compared = verify_parity(seed=args.seed)
+        print(f"Parity OK: {compared} frames matched GameEngine exactly")
+        return
+
+    sim = BatchSimulator(args.matches, difficulty=args.difficulty, seed=args.seed)
+    start = time.perf_counter()
+    sim.run(args.frames)
+    elapsed = time.perf_counter() - start
+    total = int(sim.frames.sum())
+    print(f"Simulated {total} match frames in {elapsed:.2f}s ({total / elapsed:,.0f} frames/s)")
+    print(f"Player wins: {np.count_nonzero(sim.winner == PLAYER_WON)} | "
+          f"AI wins: {np.count_nonzero(sim.winner == AI_WON)} | "
+          f"Unfinished: {np.count_nonzero(sim.winner == NO_WINNER)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import argparse
+import time
+
+import numpy as np
+
+from .batch_sim import BatchSimulator, NO_WINNER
+from .game_engine import GameEngine
+
+# Reinforcement learning environments
+#
+# Gym-style reset()/step() wrappers that let an agent play the left paddle
+# against Paddle.auto_track. PongEnv drives one headless GameEngine;
+# VectorPongEnv steps many matches at once on top of BatchSimulator and
+# resets finished ones automatically.
+#
+# Actions:      0 = stay, 1 = up (W), 2 = down (S)
+# Observations: float32 [ball_x, ball_y, velocity_x, velocity_y, player_y, ai_y],
+#               positions divided by the screen size, velocities by their caps
+# Rewards:      +1 when the agent scores, -1 when the AI scores
+# Episodes:     one game (first to winning_score), truncated after max_steps
+
+WIDTH, HEIGHT = 800, 600
+OBSERVATION_SIZE = 6
+ACTION_DY = np.array([0, -10, 10])   # Paddle move per frame, like the W/S keys
+MAX_VELOCITY_X = 12.0
+MAX_VELOCITY_Y = 8.0
+
+
+class PongEnv:
+    """Single headless match with a Gym-style interface"""
+    def __init__(self, frame_skip=1, winning_score=5, difficulty=0.8, max_steps=10000, seed=None):
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.engine = GameEngine(WIDTH, HEIGHT, headless=True, seed=seed)
+        self.engine.winning_score = winning_score
+        self.engine.ai_difficulty = difficulty
+        self.engine.sound_manager.enabled = False
+        self.steps = 0
+
+    def observation(self):
+        engine = self.engine
+        ball = engine.ball
+        return np.array([ball.x / WIDTH, ball.y / HEIGHT,
+                         ball.velocity_x / MAX_VELOCITY_X, ball.velocity_y / MAX_VELOCITY_Y,
+                         engine.player.y / HEIGHT, engine.ai.y / HEIGHT], dtype=np.float32)
+
+    def reset(self, seed=None):
+        """Start a new game; returns (observation, info)"""
+        if seed is not None:
+            self.engine.rng.seed(seed)
+        self.engine._start_series(1)
+        self.steps = 0
+        return self.observation(), {}
+
+    def step(self, action):
+        """
+        Apply action for frame_skip frames.
+
+        Returns:
+            (observation, reward, terminated, truncated, info)
+        """
+        engine = self.engine
+        dy = int(ACTION_DY[action])
+        reward = 0
+        for _ in range(self.frame_skip):
+            player_score, ai_score = engine.player_score, engine.ai_score
+            if dy:
+                engine.player.move(dy, engine.height)
+            engine.update()
+            reward += (engine.player_score - player_score) - (engine.ai_score - ai_score)
+            if engine.state != 'playing':
+                break
+        self.steps += 1
+        terminated = engine.state != 'playing'
+        truncated = not terminated and self.steps >= self.max_steps
+        info = {'player_score': engine.player_score, 'ai_score': engine.ai_score}
+        return self.observation(), float(reward), terminated, truncated, info
+
+
+class VectorPongEnv:
+    """Many matches stepped together; finished ones reset automatically"""
+    def __init__(self, num_envs, frame_skip=1, winning_score=5, difficulty=0.8, max_steps=10000,
+                 seed=None):
+        self.num_envs = num_envs
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.sim = BatchSimulator(num_envs, WIDTH, HEIGHT, winning_score, difficulty, seed)
+        self.steps = np.zeros(num_envs, dtype=np.int32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.obs = np.empty((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+
+    def observation(self):
+        """Observation matrix of shape (num_envs, 6), updated in place"""
+        sim, obs = self.sim, self.obs
+        np.multiply(sim.ball_x, 1 / WIDTH, out=obs[:, 0], casting='unsafe')
+        np.multiply(sim.ball_y, 1 / HEIGHT, out=obs[:, 1], casting='unsafe')
+        np.multiply(sim.velocity_x, 1 / MAX_VELOCITY_X, out=obs[:, 2], casting='unsafe')
+        np.multiply(sim.velocity_y, 1 / MAX_VELOCITY_Y, out=obs[:, 3], casting='unsafe')
+        np.multiply(sim.player_y, 1 / HEIGHT, out=obs[:, 4], casting='unsafe')
+        np.multiply(sim.ai_y, 1 / HEIGHT, out=obs[:, 5], casting='unsafe')
+        return obs
+
+    def reset(self, seed=None):
+        """Start new games in every environment; returns (observations, info)"""
+        if seed is not None:
+            self.sim.rng = np.random.default_rng(seed)
+        self.sim.reset()
+        self.steps[:] = 0
+        return self.observation(), {}
+
+    def step(self, actions):
+        """
+        Apply one action per environment for frame_skip frames.
+
+        Returns:
+            (observations, rewards, terminated, truncated, info). Finished
+            environments are reset before returning; their last observation
+            is in info['final_observation'].
+        """
+        sim = self.sim
+        dy = ACTION_DY[actions]
+        rewards = self.rewards
+        rewards[:] = 0
+        for _ in range(self.frame_skip):
+            sim.step(dy)
+            rewards += sim.player_point
+            rewards -= sim.ai_point
+        self.steps += 1
+        terminated = sim.winner != NO_WINNER
+        truncated = ~terminated & (self.steps >= self.max_steps)
+        done = terminated | truncated
+        info = {}
+        obs = self.observation()
+        if done.any():
+            info['final_observation'] = obs.copy()
+            sim.reset(done)
+            self.steps[done] = 0
+            obs = self.observation()
+        return obs, rewards.copy(), terminated, truncated, info
+
+
+def tracking_policy(obs):
+    """Baseline policy: move toward the ball (works on one or many observations)"""
+    ball_center = obs[..., 1] * HEIGHT + 3.5
+    paddle_center = obs[..., 4] * HEIGHT + 50
+    return np.where(ball_center < paddle_center - 10, 1, np.where(ball_center > paddle_center + 10, 2, 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the RL environments")
+    parser.add_argument("--envs", type=int, default=1024, help="environments in the vector env")
+    parser.add_argument("--steps", type=int, default=2000, help="vector steps to time")
+    parser.add_argument("--frame-skip", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    env = PongEnv(frame_skip=args.frame_skip, seed=args.seed)
+    obs, _ = env.reset()
+    steps, episodes, total_reward = 20000, 0, 0.0
+    start = time.perf_counter()
+    for _ in range(steps):
+        obs, reward, terminated, truncated, _ = env.step(int(tracking_policy(obs)))
+        total_reward += reward
+        if terminated or truncated:
+            episodes += 1
+            obs, _ = env.reset()
+    elapsed = time.perf_counter() - start
+    print(f"PongEnv: {steps / elapsed:,.0f} steps/s, {episodes} episodes, "
+          f"tracking policy reward {total_reward:+.0f}")
+
+    vec = VectorPongEnv(args.envs, frame_skip=args.frame_skip, seed=args.seed)
+    obs, _ = vec.reset()
+    episodes, total_reward = 0, 0.0
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        actions = rng.integers(0, 3, size=args.envs)
+        obs, rewards, terminated, truncated, _ = vec.step(actions)
+        total_reward += rewards.sum()
+        episodes += int(np.count_nonzero(terminated | truncated))
+    elapsed = time.perf_counter() - start
+    steps = args.envs * args.steps
+    print(f"VectorPongEnv x{args.envs}: {steps / elapsed:,.0f} steps/s "
+          f"({steps * args.frame_skip / elapsed:,.0f} frames/s), {episodes} episodes, "
+          f"random policy reward {total_reward:+.0f}")
+
+
+if __name__ == "__main__":
+    main()
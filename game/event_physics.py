@@ -0,0 +1,532 @@
+import argparse
+import math
+import random
+import time
+
+from .game_engine import GameEngine
+from .paddle import predict_intercept
+from .tournament import AIConfig, mean_interval, wilson_interval
+
+# Event-driven physics
+#
+# Instead of integrating the ball one frame at a time, EventSimulator solves
+# for the exact time of the next event (wall bounce, paddle face hit, paddle
+# top/bottom edge hit, point scored, or a paddle starting/stopping next to
+# the ball) and jumps straight to it, so the cost is per event rather than
+# per frame and any step size gives the same result. Time is measured in
+# frames and velocities in pixels per frame, like Ball and Paddle.
+#
+# Paddles either stand still or play the predictive AI: after every velocity
+# change they wait reaction_delay frames, then move at full speed toward
+# paddle.predict_intercept (plus noise) and stop there, which makes their
+# path piecewise linear. The reactive auto_track AI decides per frame and
+# cannot be skipped over.
+#
+# Rules follow Ball._bounce_off_paddle (spin, speed-up) and GameEngine
+# scoring. Unlike the frame-stepped engine, wall bounces reflect exactly
+# (Ball.move clamps the ball to the wall and loses the overshoot), several
+# bounces can happen within one frame, and a ball that misses the paddle
+# face can still glance off its top or bottom edge.
+
+EPSILON = 1e-9
+MAX_EVENTS = 1_000_000   # Per advance() call, guards against squeezed balls
+
+
+class EventBall:
+    """Ball state for the event simulator (same fields as Ball)"""
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.velocity_x = 0.0
+        self.velocity_y = 0.0
+
+
+class EventPaddle:
+    """
+    Paddle with piecewise-linear motion: at rest at y0 until move_start,
+    then moving at velocity until move_stop.
+
+    noise=None makes a stationary paddle; otherwise it plays the predictive
+    AI with that aiming noise and reaction_delay.
+    """
+    def __init__(self, x, y, width=10, height=100, speed=7, noise=None, reaction_delay=0):
+        self.x = x
+        self.width = width
+        self.height = height
+        self.speed = speed
+        self.noise = noise
+        self.reaction_delay = reaction_delay
+
+        self.y0 = y
+        self.velocity = 0.0
+        self.move_start = 0.0
+        self.move_stop = 0.0
+
+    @property
+    def is_ai(self):
+        return self.noise is not None
+
+    def y_at(self, t):
+        if t <= self.move_start:
+            return self.y0
+        return self.y0 + self.velocity * (min(t, self.move_stop) - self.move_start)
+
+    def velocity_at(self, t):
+        return self.velocity if self.move_start <= t < self.move_stop else 0.0
+
+    def segment(self, t):
+        """(start, y at start, velocity, end) of the constant-velocity piece containing t"""
+        if t < self.move_start:
+            return -math.inf, self.y0, 0.0, self.move_start
+        if t < self.move_stop:
+            return self.move_start, self.y0, self.velocity, self.move_stop
+        return self.move_stop, self.y_at(self.move_stop), 0.0, math.inf
+
+    def next_breakpoint(self, t):
+        """Time of the next start or stop of movement after t, or None"""
+        for breakpoint in (self.move_start, self.move_stop):
+            if breakpoint > t + EPSILON:
+                return breakpoint
+        return None
+
+    def retarget(self, t, target_center, screen_height):
+        """Head for target_center after the reaction delay (Paddle.predict_track)"""
+        y = self.y_at(t)
+        goal = max(0, min(target_center - self.height / 2, screen_height - self.height))
+        distance = goal - y
+        self.y0 = y
+        self.move_start = t + self.reaction_delay
+        self.velocity = math.copysign(self.speed, distance) if distance else 0.0
+        self.move_stop = self.move_start + abs(distance) / self.speed
+
+
+class EventSimulator:
+    """
+    One game simulated from event to event.
+
+    The ball's x/y are its position at anchor_time; between events it moves
+    in a straight line and only events re-anchor it. Event times are solved
+    from the anchors alone, so advancing in many small steps or in one big
+    one gives bit-identical results.
+    """
+    def __init__(self, width=800, height=600, left=None, right=None, winning_score=5, seed=None):
+        self.width = width
+        self.height = height
+        self.winning_score = winning_score
+        self.rng = random.Random(seed)   # Serves and AI noise
+
+        self.ball = EventBall(width // 2, height // 2, 7, 7)
+        self.left = left or EventPaddle(10, height // 2 - 50)
+        self.right = right or EventPaddle(width - 20, height // 2 - 50)
+        self.time = 0.0
+        self.anchor_time = 0.0
+        self.player_score = 0
+        self.ai_score = 0
+        self.winner = None
+        self.hits = 0
+        self.events = {'wall': 0, 'face': 0, 'edge': 0, 'score': 0, 'paddle': 0}
+        self._edge_paddle = None   # Paddle whose edge was hit this flight
+
+    def position(self, t=None):
+        """Ball (x, y) at time t (default: now)"""
+        ball = self.ball
+        elapsed = (self.time if t is None else t) - self.anchor_time
+        return ball.x + ball.velocity_x * elapsed, ball.y + ball.velocity_y * elapsed
+
+    # State changes
+
+    def serve(self):
+        """Ball.reset: back to the middle in a random direction"""
+        self.set_ball(self.width // 2, self.height // 2,
+                      self.rng.choice([-5, 5]), self.rng.choice([-3, 3]))
+
+    def set_ball(self, x, y, velocity_x, velocity_y):
+        ball = self.ball
+        ball.x, ball.y, ball.velocity_x, ball.velocity_y = x, y, velocity_x, velocity_y
+        self.anchor_time = self.time
+        self._edge_paddle = None
+        self._velocity_changed()
+
+    def _velocity_changed(self):
+        """AI paddles re-predict whenever the ball's velocity changes"""
+        for paddle in (self.left, self.right):
+            if not paddle.is_ai:
+                continue
+            target = predict_intercept(paddle.x, paddle.width, self.ball, self.height)
+            if target is None:
+                target = self.height / 2
+            elif paddle.noise:
+                target += self.rng.gauss(0, paddle.noise)
+            paddle.retarget(self.time, target, self.height)
+
+    # Event search (all times absolute)
+
+    def _overlaps(self, ball_y, paddle_y, paddle):
+        return not (ball_y + self.ball.height < paddle_y or ball_y > paddle_y + paddle.height)
+
+    def _level_interval(self, paddle):
+        """(enter, leave) times in which the ball is horizontally level with the paddle"""
+        ball = self.ball
+        low, high = paddle.x - ball.width - ball.x, paddle.x + paddle.width - ball.x
+        if ball.velocity_x == 0:
+            return (self.anchor_time, math.inf) if low <= 0 <= high else (math.inf, -math.inf)
+        enter, leave = sorted((low / ball.velocity_x, high / ball.velocity_x))
+        return self.anchor_time + enter, self.anchor_time + leave
+
+    def _edge_time(self, paddle, enter, leave):
+        """Time the ball touches the paddle's top or bottom edge in its current motion segment"""
+        ball = self.ball
+        vy = ball.velocity_y
+        t0 = self.anchor_time
+
+        # The paddle moves at a constant velocity until its next breakpoint
+        start, paddle_y, velocity, end = paddle.segment(self.time)
+        leave = min(leave, end)
+        reference = max(t0, start)
+        ball_y = ball.y + vy * (reference - t0)
+        if velocity:
+            paddle_y += velocity * (reference - start)
+
+        relative = vy - velocity
+        above = paddle_y - (ball_y + ball.height)
+        below = ball_y - (paddle_y + paddle.height)
+        if above >= -EPSILON and relative > 0:
+            t = reference + max(0.0, above) / relative
+        elif below >= -EPSILON and relative < 0:
+            t = reference + max(0.0, below) / -relative
+        else:
+            return None
+        return t if enter <= t <= leave else None
+
+    def next_event(self, end):
+        """(time, kind, paddle) of the first event up to end, kind None if none"""
+        ball = self.ball
+        x, y, vx, vy = ball.x, ball.y, ball.velocity_x, ball.velocity_y
+        t0 = self.anchor_time
+        now = self.time - EPSILON
+        best_time, best_kind, best_paddle = end, None, None
+
+        def consider(t, kind, paddle=None):
+            nonlocal best_time, best_kind, best_paddle
+            if t is not None and now <= t < best_time:
+                best_time, best_kind, best_paddle = t, kind, paddle
+
+        # Top and bottom walls
+        if vy < 0:
+            consider(t0 + y / -vy, 'wall')
+        elif vy > 0:
+            consider(t0 + (self.height - ball.height - y) / vy, 'wall')
+
+        # Goal lines (GameEngine scores once ball.x passes 0 or the width)
+        if vx < 0:
+            consider(t0 + x / -vx, 'score')
+        elif vx > 0:
+            consider(t0 + (self.width - x) / vx, 'score')
+
+        # Paddle faces, only counted if the ball overlaps the paddle then
+        face = self.left.x + self.left.width
+        if vx < 0 and x >= face:
+            t = t0 + (x - face) / -vx
+            if now <= t < best_time and self._overlaps(y + vy * (t - t0), self.left.y_at(t), self.left):
+                consider(t, 'face', self.left)
+        face = self.right.x - ball.width
+        if vx > 0 and x <= face:
+            t = t0 + (face - x) / vx
+            if now <= t < best_time and self._overlaps(y + vy * (t - t0), self.right.y_at(t), self.right):
+                consider(t, 'face', self.right)
+
+        # Paddle edges, while the ball is level with a paddle. Only then do
+        # the paddle's start/stop times matter, so they are events only then.
+        for paddle in (self.left, self.right):
+            enter, leave = self._level_interval(paddle)
+            if enter >= best_time or leave < now:
+                continue
+            consider(paddle.next_breakpoint(self.time), 'paddle', paddle)
+            if paddle is not self._edge_paddle:
+                consider(self._edge_time(paddle, enter, leave), 'edge', paddle)
+
+        return best_time, best_kind, best_paddle
+
+    # Event handling
+
+    def _apply(self, kind, paddle):
+        self.events[kind] += 1
+        if kind == 'paddle':
+            return  # A paddle started or stopped; the ball is unaffected
+        ball = self.ball
+        ball.x, ball.y = self.position()
+        self.anchor_time = self.time
+        if kind == 'wall':
+            ball.velocity_y = -ball.velocity_y
+            ball.y = 0 if ball.velocity_y > 0 else self.height - ball.height
+            self._velocity_changed()
+        elif kind == 'face':
+            self._bounce_off_paddle(paddle)
+            self._edge_paddle = None
+            self._velocity_changed()
+        elif kind == 'edge':
+            # Reflect off the edge, relative to the paddle's own movement
+            ball.velocity_y = 2 * paddle.velocity_at(self.time) - ball.velocity_y
+            self._edge_paddle = paddle
+            self._velocity_changed()
+        elif kind == 'score':
+            if ball.velocity_x < 0:
+                self.ai_score += 1
+            else:
+                self.player_score += 1
+            if self.player_score >= self.winning_score:
+                self.winner = 'player'
+            elif self.ai_score >= self.winning_score:
+                self.winner = 'ai'
+            else:
+                self.serve()
+
+    def _bounce_off_paddle(self, paddle):
+        """Ball._bounce_off_paddle at the exact moment of impact"""
+        ball = self.ball
+        ball.velocity_x *= -1
+        if paddle is self.left:
+            ball.x = paddle.x + paddle.width
+        else:
+            ball.x = paddle.x - ball.width
+        paddle_center = paddle.y_at(self.time) + paddle.height / 2
+        relative_hit = (ball.y + ball.height / 2 - paddle_center) / (paddle.height / 2)
+        ball.velocity_y = max(-8, min(8, ball.velocity_y + relative_hit * 2))
+        if abs(ball.velocity_x) < 12:
+            ball.velocity_x += 0.3 if ball.velocity_x > 0 else -0.3
+        self.hits += 1
+
+    def step_event(self, end=math.inf):
+        """Jump to the next event (or to end); returns its kind, None if end came first"""
+        t, kind, paddle = self.next_event(end)
+        self.time = max(self.time, t)
+        if kind is not None:
+            self._apply(kind, paddle)
+        return kind
+
+    def advance(self, frames):
+        """Simulate `frames` frames (any size); stops early when the game is won"""
+        end = self.time + frames
+        for _ in range(MAX_EVENTS):
+            if self.winner is not None or self.step_event(end) is None:
+                return
+        raise RuntimeError("Too many events in one advance() call")
+
+    def run_game(self, max_frames=math.inf):
+        """Play until someone reaches winning_score; returns the winner (None on timeout)"""
+        self.advance(max_frames - self.time)
+        return self.winner
+
+
+def _random_flight(rng, width, height):
+    """Random mid-rally ball state and paddle positions"""
+    velocity_x = rng.choice([-1, 1]) * rng.uniform(5, 12)
+    velocity_y = rng.uniform(-8, 8)
+    return (rng.uniform(100, width - 100), rng.uniform(0, height - 7), velocity_x, velocity_y,
+            rng.uniform(0, height - 100), rng.uniform(0, height - 100))
+
+
+def _flight_y(x, y, velocity_x, velocity_y, t, height):
+    """Ball y after t frames with paddles out of the way (exact wall reflections)"""
+    sim = EventSimulator(height=height, left=EventPaddle(-1000, 0), right=EventPaddle(10 ** 6, 0))
+    sim.set_ball(x, y, velocity_x, velocity_y)
+    sim.advance(t)
+    return sim.position()[1]
+
+
+def compare_flights(count=2000, seed=0, width=800, height=600):
+    """
+    Fly the ball from random states to the first paddle hit or point in both
+    the frame-stepped GameEngine and the event simulator (paddles standing
+    still) and compare when and where it arrives.
+
+    The frame engine detects a hit on the first frame after the crossing, and
+    each of its wall bounces drops up to |velocity_y| pixels of travel, so
+    the allowed y error is (bounces + 1) * |velocity_y| + 1 and the time
+    error is under one frame. Flights that graze a paddle end within that
+    tolerance may legitimately end differently and are counted separately,
+    as are balls that glance off a paddle's top or bottom edge (which the
+    frame engine lets pass).
+    """
+    rng = random.Random(seed)
+    engine = GameEngine(width, height, headless=True, seed=seed)
+    engine.ai_mode = 'remote'
+    engine.sound_manager.enabled = False
+    agree = grazing = edges = 0
+    worst_time = worst_ratio = 0.0
+
+    for _ in range(count):
+        x, y, vx, vy, left_y, right_y = _random_flight(rng, width, height)
+
+        engine._init_game_objects()
+        engine.state = 'playing'
+        ball = engine.ball
+        ball.x, ball.y, ball.velocity_x, ball.velocity_y = x, y, vx, vy
+        ball.prev_x, ball.prev_y = x, y
+        engine.player.y, engine.ai.y = left_y, right_y
+        frames = 0
+        while True:
+            frames += 1
+            engine.update()
+            if engine.player_score or engine.ai_score:
+                frame_result, frame_y = ('score', 'left' if engine.ai_score else 'right'), None
+                break
+            if (ball.velocity_x > 0) != (vx > 0):
+                frame_result, frame_y = ('face', 'left' if vx < 0 else 'right'), ball.y
+                break
+
+        sim = EventSimulator(width, height, EventPaddle(10, left_y), EventPaddle(width - 20, right_y))
+        sim.set_ball(x, y, vx, vy)
+        while True:
+            kind = sim.step_event()
+            if kind in ('face', 'score', 'edge'):
+                break
+        side = 'left' if vx < 0 else 'right'
+        event_result = ('face' if kind == 'face' else 'score', side)
+        event_y = sim.ball.y if kind == 'face' else None
+        tolerance = (sim.events['wall'] + 1) * abs(vy) + 1
+
+        if kind == 'edge' and frame_result == ('score', side):
+            # Corner hit: the frame engine lets the ball pass the paddle
+            edges += 1
+            continue
+
+        if frame_result != event_result or kind == 'edge':
+            # Only acceptable if the ball passed within tolerance of a paddle end
+            paddle_y = left_y if side == 'left' else right_y
+            face = 20 if side == 'left' else width - 27
+            crossing = _flight_y(x, y, vx, vy, (face - x) / vx, height)
+            margin = min(abs(crossing + 7 - paddle_y), abs(crossing - paddle_y - 100))
+            if margin > tolerance:
+                raise AssertionError(f"Flight {(x, y, vx, vy, left_y, right_y)}: frame engine "
+                                     f"{frame_result}, event engine {kind} {event_result}")
+            grazing += 1
+            continue
+
+        agree += 1
+        worst_time = max(worst_time, frames - sim.time)
+        if frame_y is not None:
+            worst_ratio = max(worst_ratio, abs(frame_y - event_y) / tolerance)
+        if not -EPSILON <= frames - sim.time < 1 + EPSILON:
+            raise AssertionError(f"Flight {(x, y, vx, vy)}: frame {frames}, event time {sim.time:.3f}")
+        if frame_y is not None and abs(frame_y - event_y) > tolerance:
+            raise AssertionError(f"Flight {(x, y, vx, vy)}: frame y {frame_y:.2f}, event y {event_y:.2f}")
+
+    print(f"Flights: {agree}/{count} matched (time error < {worst_time:.3f} frames, "
+          f"y error at most {worst_ratio:.0%} of tolerance), {grazing} grazing a paddle end, "
+          f"{edges} glancing off a paddle edge")
+    return agree, grazing, edges
+
+
+def check_step_invariance(frames=100000, chunk=1.0, seed=0):
+    """The same game advanced in chunk-frame steps and in one call must agree"""
+    def make():
+        sim = EventSimulator(left=EventPaddle(10, 250, noise=25.0, reaction_delay=6),
+                             right=EventPaddle(780, 250, noise=25.0, reaction_delay=6),
+                             winning_score=10 ** 6, seed=seed)
+        sim.serve()
+        return sim
+
+    stepped, jumped = make(), make()
+    steps = int(frames / chunk)
+    for _ in range(steps):
+        stepped.advance(chunk)
+    jumped.advance(steps * chunk)
+    a = (stepped.ball.x, stepped.ball.y, stepped.player_score, stepped.ai_score, stepped.hits)
+    b = (jumped.ball.x, jumped.ball.y, jumped.player_score, jumped.ai_score, jumped.hits)
+    if a[2:] != b[2:] or abs(a[0] - b[0]) > 1e-6 or abs(a[1] - b[1]) > 1e-6:
+        raise AssertionError(f"Step size changed the result: {a} vs {b}")
+    print(f"Step invariance: {steps} x advance({chunk:g}) == advance({steps * chunk:g}) "
+          f"({jumped.hits} hits, score {jumped.player_score}-{jumped.ai_score})")
+
+
+def _frame_game(left, right, seed, winning_score, max_frames):
+    """One game in the frame-stepped engine: (winner, hits, frames)"""
+    engine = GameEngine(800, 600, headless=True, seed=seed)
+    engine.winning_score = winning_score
+    right.apply_to_engine(engine)
+    engine._start_series(1)
+    hits = frames = 0
+    while engine.state == 'playing' and frames < max_frames:
+        direction = engine.ball.velocity_x
+        points = engine.player_score + engine.ai_score
+        left.move_player(engine)
+        engine.update()
+        frames += 1
+        if engine.player_score + engine.ai_score == points and (engine.ball.velocity_x > 0) != (direction > 0):
+            hits += 1
+    return engine.winner, hits, frames
+
+
+def compare_games(games=100, noise=25.0, delay=6, seed=0, winning_score=5):
+    """
+    Play predictive-AI games in both engines and compare the statistics
+    (left win rate, paddle hits per game, frames per game) with 95% CIs.
+    Individual games diverge quickly because spin amplifies tiny
+    differences, so only the distributions are expected to agree.
+    """
+    config = AIConfig('predictive', noise=noise, reaction_delay=delay)
+    results = {}
+    timings = {}
+    max_frames = 60 * 60 * 10
+    for name in ('frame', 'event'):
+        wins = 0
+        sums = {'hits': [0, 0], 'frames': [0, 0]}
+        start = time.perf_counter()
+        for game in range(games):
+            game_seed = random.Random(f"{seed}:{game}").getrandbits(64)
+            if name == 'frame':
+                winner, hits, frames = _frame_game(config, config, game_seed, winning_score, max_frames)
+            else:
+                sim = EventSimulator(left=EventPaddle(10, 250, noise=noise, reaction_delay=delay),
+                                     right=EventPaddle(780, 250, noise=noise, reaction_delay=delay),
+                                     winning_score=winning_score, seed=game_seed)
+                sim.serve()
+                winner = sim.run_game(max_frames)
+                hits, frames = sim.hits, sim.time
+            wins += winner == 'player'
+            for key, value in (('hits', hits), ('frames', frames)):
+                sums[key][0] += value
+                sums[key][1] += value * value
+        timings[name] = time.perf_counter() - start
+        results[name] = {
+            'left_win': wilson_interval(wins, games),
+            'hits': mean_interval(sums['hits'][0], sums['hits'][1], games),
+            'frames': mean_interval(sums['frames'][0], sums['frames'][1], games),
+            'total_frames': sums['frames'][0],
+        }
+
+    for name, result in results.items():
+        rate, low, high = result['left_win']
+        hits, hits_margin = result['hits']
+        frames, frames_margin = result['frames']
+        speed = result['total_frames'] / timings[name]
+        print(f"{name:>5}: left wins {rate:.0%} [{low:.0%}, {high:.0%}], "
+              f"hits/game {hits:.1f} ± {hits_margin:.1f}, frames/game {frames:.0f} ± {frames_margin:.0f}, "
+              f"{speed:,.0f} frames/s")
+    print(f"Event engine fast-forward: {timings['frame'] / timings['event']:.0f}x faster than frame stepping")
+
+    # The confidence intervals of the means must overlap
+    for key in ('hits', 'frames'):
+        (a, da), (b, db) = results['frame'][key], results['event'][key]
+        if abs(a - b) > da + db:
+            raise AssertionError(f"{key} per game differs: frame {a:.1f} ± {da:.1f}, event {b:.1f} ± {db:.1f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the event-driven physics against GameEngine")
+    parser.add_argument("--flights", type=int, default=2000, help="random ball flights to compare")
+    parser.add_argument("--games", type=int, default=100, help="AI games to compare statistically")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    compare_flights(args.flights, args.seed)
+    check_step_invariance(seed=args.seed)
+    compare_games(args.games, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import json
+import os
+
+import pygame
+
+# Font loading with a persistent path cache
+#
+# pygame.font.SysFont() scans every installed font the first time it is
+# called in a process, which can take a large part of startup. The file each
+# (name, bold) pair resolves to is stored in a small JSON file instead, so
+# later launches open the font file directly and never scan.
+#
+# A font that was not found is remembered together with the modification
+# times of the system font directories, and looked up again once any of
+# them changes (e.g. after the font was installed).
+
+CACHE_PATH = os.path.join("fonts", "cache.json")
+
+# Where pygame's font scan looks on Linux (fontconfig), macOS and Windows
+FONT_DIRS = [
+    "/usr/share/fonts", "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"), os.path.expanduser("~/.local/share/fonts"),
+    "/Library/Fonts", "/System/Library/Fonts", os.path.expanduser("~/Library/Fonts"),
+    os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+]
+
+_cache = None   # {'paths': {(name, bold) key: font file}, 'misses': {...}, 'dirs': fingerprint}
+
+
+def _key(name, bold):
+    return f"{name.lower()}:{'bold' if bold else 'regular'}"
+
+
+def _font_dirs_fingerprint():
+    """Modification times of the font directories and their subdirectories"""
+    fingerprint = {}
+    for directory in FONT_DIRS:
+        try:
+            fingerprint[directory] = os.stat(directory).st_mtime
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        fingerprint[entry.path] = entry.stat().st_mtime
+        except OSError:
+            continue
+    return fingerprint
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    if not isinstance(cache.get('paths'), dict):
+        cache = {}   # Missing, or the old flat format: resolve again
+    cache.setdefault('paths', {})
+    cache.setdefault('misses', [])
+    cache.setdefault('dirs', None)
+    return cache
+
+
+def _save_cache(cache, cache_path):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Write then rename so an interrupted launch never leaves half a file
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass  # Read-only install, resolve again next launch
+
+
+def resolve(name, bold=False, cache_path=CACHE_PATH):
+    """
+    Path of the system font file for name (None when it is not installed),
+    scanning the system fonts only on a cache miss.
+    """
+    global _cache
+    if _cache is None:
+        _cache = _load_cache(cache_path)
+    key = _key(name, bold)
+    path = _cache['paths'].get(key)
+    if path is not None and os.path.exists(path):
+        return path
+    if key in _cache['misses']:
+        fingerprint = _font_dirs_fingerprint()
+        if fingerprint == _cache['dirs']:
+            return None
+        # Fonts were added or removed since: every miss needs a new look
+        _cache['misses'] = []
+        _cache['dirs'] = fingerprint
+
+    path = pygame.font.match_font(name, bold=bold)
+    if path is None:
+        _cache['misses'].append(key)
+        if _cache['dirs'] is None:
+            _cache['dirs'] = _font_dirs_fingerprint()
+    else:
+        _cache['paths'][key] = path
+    _save_cache(_cache, cache_path)
+    return path
+
+
+def load(name, size, bold=False, cache_path=CACHE_PATH):
+    """Drop-in replacement for pygame.font.SysFont(name, size, bold)"""
+    path = resolve(name, bold, cache_path)
+    if bold and path is None:
+        # No bold face installed: embolden the regular one, like SysFont
+        path = resolve(name, False, cache_path)
+        font = pygame.font.Font(path, size)
+        font.set_bold(True)
+        return font
+    return pygame.font.Font(path, size)
+
+
+def clear_cache(cache_path=CACHE_PATH):
+    """Forget every resolved path (the next load scans the system fonts again)"""
+    global _cache
+    _cache = None
+    try:
+        os.remove(cache_path)
+    except OSError:
+        pass
@@ -1,55 +1,872 @@
 import pygame
 from .paddle import Paddle
 from .ball import Ball
+from .multi_ball import BallArray
+from . import fonts
+from .audio import AudioEngine, SOUND_CATEGORIES
+from .sound_variants import VariantCache
+from . import synth
+from .text_cache import TextCache
+from .layers import LayerCache
+from .replay import ReplayRecorder
+from .profiler import FrameProfiler
+import os
+import random
+import threading
 
 # Game Engine
 
 WHITE = (255, 255, 255)
+GRAY = (128, 128, 128)
+GREEN = (0, 255, 0)
+RED = (255, 50, 50)
+YELLOW = (255, 255, 0)
+BLACK = (0, 0, 0)
+
+# Procedural sound descriptions, rendered by synth.render()
+SOUND_PARAMS = {
+    'paddle_hit': {'wave': 'tone', 'frequency': 440, 'duration': 0.05},
+    'wall_bounce': {'wave': 'tone', 'frequency': 220, 'duration': 0.04},
+    'score': {'wave': 'sweep', 'start_frequency': 440, 'end_frequency': 880,
+              'duration': 0.3, 'peak': 0.5},
+}
+
+class TrackedRandom(random.Random):
+    """
+    random.Random that remembers its state until the next draw, so engine
+    snapshots can reuse the same state tuple while a stream is unused
+    (getstate() otherwise builds a fresh 625-int tuple every call).
+    """
+    def __init__(self, seed=None):
+        self._state = None
+        super().__init__(seed)
+
+    def seed(self, *args, **kwargs):
+        self._state = None
+        super().seed(*args, **kwargs)
+
+    def random(self):
+        self._state = None
+        return super().random()
+
+    def getrandbits(self, k):
+        self._state = None
+        return super().getrandbits(k)
+
+    def gauss(self, mu=0.0, sigma=1.0):
+        self._state = None
+        return super().gauss(mu, sigma)
+
+    def getstate(self):
+        if self._state is None:
+            self._state = super().getstate()
+        return self._state
+
+    def setstate(self, state):
+        if state is self._state:
+            return  # Not drawn from since this state was taken
+        super().setstate(state)
+        self._state = state
+
+
+class SoundManager:
+    """Manages game sound effects"""
+    def __init__(self, headless=False, background=False, frequency=22050, buffer=512,
+                 cache_dir=synth.CACHE_DIR):
+        self.sounds = {}
+        self.enabled = not headless
+        self.audio = None
+        
+        # Panned, speed-scaled versions of the loaded sounds (see play())
+        self.variants = VariantCache()
+        
+        # Set once every sound is loaded (play() skips sounds still loading)
+        self.ready = threading.Event()
+        
+        # Synthesized sounds are cached here between launches (None: never)
+        self.cache_dir = cache_dir
+        
+        # Headless engines (simulation, tests) never touch the mixer
+        if headless:
+            self.ready.set()
+            return
+        
+        # Open the mixer with reserved channels per sound category; a smaller
+        # buffer lowers latency (see game/audio.py). SDL subsystems are
+        # started from the main thread
+        self.audio = AudioEngine(frequency, buffer)
+        
+        # background=True loads the sounds on a worker thread so the first
+        # frame does not wait for them
+        if background:
+            threading.Thread(target=self._load, name="sound-loader", daemon=True).start()
+        else:
+            self._load()
+    
+    def _load(self):
+        """Load or create every sound, then mark the manager ready"""
+        self._load_or_create_sounds()
+        for name, sound in self.sounds.items():
+            self.variants.add_base(name, sound)
+        self.ready.set()
+    
+    def _load_or_create_sounds(self):
+        """Load sound files or create them programmatically"""
+        sound_dir = "sounds"
+        
+        # Try to load from files first
+        sound_files = {
+            'paddle_hit': 'paddle_hit.wav',
+            'wall_bounce': 'wall_bounce.wav',
+            'score': 'score.wav'
+        }
+        
+        # Check if sound directory exists
+        if os.path.exists(sound_dir):
+            for sound_name, filename in sound_files.items():
+                filepath = os.path.join(sound_dir, filename)
+                if os.path.exists(filepath):
+                    try:
+                        self.sounds[sound_name] = pygame.mixer.Sound(filepath)
+                        print(f"Loaded {sound_name} from file")
+                        continue
+                    except:
+                        pass
+        
+        # Create sounds programmatically if not loaded
+        if 'paddle_hit' not in self.sounds:
+            self.sounds['paddle_hit'] = self._create_paddle_sound()
+        if 'wall_bounce' not in self.sounds:
+            self.sounds['wall_bounce'] = self._create_wall_sound()
+        if 'score' not in self.sounds:
+            self.sounds['score'] = self._create_score_sound()
+    
+    def _create_paddle_sound(self):
+        """Create a paddle hit sound (short click)"""
+        # 50ms A note with a linear decay
+        return self._create_sound('paddle_hit', SOUND_PARAMS['paddle_hit'], volume=0.3)
+    
+    def _create_wall_sound(self):
+        """Create a wall bounce sound (lower pitch)"""
+        # 40ms lower A note
+        return self._create_sound('wall_bounce', SOUND_PARAMS['wall_bounce'], volume=0.2)
+    
+    def _create_score_sound(self):
+        """Create a scoring sound (rising tone)"""
+        # 300ms sweep from 440Hz to 880Hz at half amplitude
+        return self._create_sound('score', SOUND_PARAMS['score'], volume=0.4)
+    
+    def _create_sound(self, name, params, volume):
+        """Build a Sound from a cached (or freshly synthesized) buffer"""
+        wave = synth.load_or_render(name, params, pygame.mixer.get_init(), self.cache_dir)
+        sound = pygame.sndarray.make_sound(wave)
+        sound.set_volume(volume)
+        return sound
+    
+    def play(self, sound_name, pan=None, speed=None):
+        """
+        Play a sound by name.
+        
+        Args:
+            pan: Optional stereo position from -1 (left) to +1 (right)
+            speed: Optional ball speed; faster balls play higher and louder
+        """
+        if not self.enabled or sound_name not in self.sounds:
+            return
+        if (pan is None and speed is None) or not self.ready.is_set():
+            sound = self.sounds[sound_name]
+        else:
+            sound = self.variants.get(sound_name, pan or 0.0, speed or 0.0)
+        self.audio.play(SOUND_CATEGORIES[sound_name], sound)
+    
+    def toggle(self):
+        """Toggle sound on/off"""
+        self.enabled = not self.enabled
+        return self.enabled
+
 
 class GameEngine:
-    def __init__(self, width, height):
+    def __init__(self, width, height, headless=False, seed=None, background_audio=False,
+                 audio_frequency=22050, audio_buffer=512, sound_manager=None):
         self.width = width
         self.height = height
         self.paddle_width = 10
         self.paddle_height = 100
+        
+        # Seeded random streams: the master stream picks a seed for every
+        # series, which in turn seeds separate ball (serve) and AI streams
+        self.rng = TrackedRandom(seed)
+        self._seed_streams(self.rng.getrandbits(64))
+        
+        # Replay recording (see game/replay.py); set replay_dir to enable
+        self.replay_dir = None
+        self.replay_recorder = None
+        
+        # Rally telemetry (see game/telemetry.py); single-ball play only
+        self.telemetry = None
+        
+        # Game states: 'menu', 'playing', 'game_over', 'series_over'
+        self.state = 'menu'
+        self.winner = None
+        
+        # Scoring system
+        self.winning_score = 5  # Points per game
+        self.series_mode = None  # 'best_of_3', 'best_of_5', 'best_of_7'
+        self.series_target = 0   # Games needed to win series
+        
+        # Match tracking
+        self.player_games_won = 0
+        self.ai_games_won = 0
+        
+        # AI opponent: 'reactive' uses Paddle.auto_track with ai_difficulty,
+        # 'predictive' uses Paddle.predict_track with ai_noise/ai_reaction_delay,
+        # 'remote' leaves the right paddle to a second (networked) player
+        self.ai_mode = 'reactive'
+        self.ai_difficulty = 0.8
+        self.ai_noise = 25.0
+        self.ai_reaction_delay = 6
+        
+        # Chaos mode: more than one ball in play at once (see game/multi_ball.py)
+        self.ball_count = 1
+        
+        # Menu selection
+        self.menu_options = ['Best of 3', 'Best of 5', 'Best of 7', 'Exit']
+        self.selected_option = 0
+        
+        # Headless engines skip audio and fonts so they can run without a display
+        self.headless = headless
+        
+        # Sound manager (background_audio loads it while the first frames draw);
+        # pass one in to share it, or a headless one for views that never play
+        if sound_manager is None:
+            sound_manager = SoundManager(headless=headless, background=background_audio,
+                                         frequency=audio_frequency, buffer=audio_buffer)
+        self.sound_manager = sound_manager
+        
+        # M key debounce
+        self.m_key_pressed = False
+        
+        # Dirty-rectangle renderer bookkeeping (see render_dirty)
+        self._dirty_state = None
+        self._drawn_elements = {}   # key -> [bounds last drawn, content last drawn]
+        
+        # Gameplay elements and their interpolated rects are built once and
+        # updated in place every frame (see _game_elements)
+        self._player_rect = pygame.Rect(0, 0, self.paddle_width, self.paddle_height)
+        self._ai_rect = pygame.Rect(0, 0, self.paddle_width, self.paddle_height)
+        self._ball_rect = pygame.Rect(0, 0, 7, 7)
+        self._elements = None
+        
+        # Frame profiler (disabled until toggled, see game/profiler.py)
+        self.profiler = FrameProfiler()
+        
+        # Initialize game objects
+        self._init_game_objects()
+        
+        # Fonts
+        if headless:
+            return
+        self.text_cache = TextCache()
+        self.layers = LayerCache((width, height))
+        # Resolved through a persistent path cache instead of SysFont's font scan
+        self.font = fonts.load("Arial", 30)
+        self.large_font = fonts.load("Arial", 60, bold=True)
+        self.medium_font = fonts.load("Arial", 36)
+        self.small_font = fonts.load("Arial", 24)
 
-        self.player = Paddle(10, height // 2 - 50, self.paddle_width, self.paddle_height)
-        self.ai = Paddle(width - 20, height // 2 - 50, self.paddle_width, self.paddle_height)
-        self.ball = Ball(width // 2, height // 2, 7, 7, width, height)
+    def _seed_streams(self, seed):
+        """Reseed the per-series random streams"""
+        self.series_seed = seed
+        self.ball_rng = TrackedRandom(f"{seed}:ball")
+        self.ai_rng = TrackedRandom(f"{seed}:ai")
 
+    def snapshot(self):
+        """
+        Capture the simulation state (positions, velocities, prev_* fields,
+        scores, series state and random streams) as nested tuples that
+        restore() can return to. Settings, caches and the renderer are not
+        included.
+        """
+        return (self.state, self.winner, self.player_score, self.ai_score,
+                self.player_games_won, self.ai_games_won, self.series_mode,
+                self.series_target, self.selected_option, self.m_key_pressed,
+                self.series_seed, self.rng.getstate(), self.ball_rng.getstate(),
+                self.ai_rng.getstate(), self.player.snapshot(), self.ai.snapshot(),
+                self.ball.snapshot(), self.balls and self.balls.snapshot())
+
+    def restore(self, snapshot):
+        """Return to a state captured by snapshot()"""
+        (self.state, self.winner, self.player_score, self.ai_score,
+         self.player_games_won, self.ai_games_won, self.series_mode,
+         self.series_target, self.selected_option, self.m_key_pressed,
+         self.series_seed, rng_state, ball_rng_state, ai_rng_state,
+         player, ai, ball, balls) = snapshot
+        self.rng.setstate(rng_state)
+        self.ball_rng.setstate(ball_rng_state)
+        self.ai_rng.setstate(ai_rng_state)
+        self.player.restore(player)
+        self.ai.restore(ai)
+        self.ball.restore(ball)
+        if balls is not None:
+            self.balls.restore(balls)
+
+    def _init_game_objects(self):
+        """Initialize or reset game objects"""
+        self.player = Paddle(10, self.height // 2 - 50, self.paddle_width, self.paddle_height, self.ai_rng)
+        self.ai = Paddle(self.width - 20, self.height // 2 - 50, self.paddle_width, self.paddle_height, self.ai_rng)
+        self.ball = Ball(self.width // 2, self.height // 2, 7, 7, self.width, self.height, self.ball_rng)
+        # In chaos mode self.ball only mirrors the ball the AI is tracking
+        self.balls = None
+        if self.ball_count > 1:
+            self.balls = BallArray(self.ball_count, self.width, self.height, 7,
+                                   seed=self.ball_rng.getrandbits(64))
         self.player_score = 0
         self.ai_score = 0
-        self.font = pygame.font.SysFont("Arial", 30)
 
-    def handle_input(self):
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_w]:
-            self.player.move(-10, self.height)
-        if keys[pygame.K_s]:
-            self.player.move(10, self.height)
+    def step(self, keys=None):
+        """
+        Run one fixed simulation tick: remember the previous positions for
+        render interpolation, then apply input and update the game.
+        
+        Args:
+            keys: Pressed-key lookup (defaults to pygame.key.get_pressed());
+                  replays pass their recorded input here
+        """
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        if self.replay_recorder is not None:
+            self.replay_recorder.record(keys)
+        self.player.prev_y = self.player.y
+        self.ai.prev_y = self.ai.y
+        
+        profiler = self.profiler
+        start = profiler.clock()
+        result = self.handle_input(keys)
+        profiler.add('input', start)
+        start = profiler.clock()
+        self.update()
+        profiler.add('update', start)
+        if self.replay_recorder is not None and self.state == 'series_over':
+            self.finish_replay()
+        return result
+
+    def handle_input(self, keys=None):
+        """Handle keyboard input based on game state"""
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        
+        if self.state == 'menu':
+            return self._handle_menu_input(keys)
+        
+        elif self.state == 'playing':
+            # Player paddle controls
+            if keys[pygame.K_w]:
+                self.player.move(-10, self.height)
+            if keys[pygame.K_s]:
+                self.player.move(10, self.height)
+            
+            # Toggle sound with M key (with debounce)
+            if keys[pygame.K_m]:
+                if not self.m_key_pressed:
+                    self.m_key_pressed = True
+                    enabled = self.sound_manager.toggle()
+                    if not self.headless:
+                        print(f"Sound: {'ON' if enabled else 'OFF'}")
+            else:
+                self.m_key_pressed = False
+        
+        elif self.state == 'game_over':
+            # Continue to next game in series
+            if keys[pygame.K_SPACE]:
+                self._next_game()
+        
+        elif self.state == 'series_over':
+            # Return to menu or exit
+            if keys[pygame.K_SPACE] or keys[pygame.K_r]:
+                self._reset_series()
+                self.state = 'menu'
+            if keys[pygame.K_ESCAPE]:
+                return 'quit'
+        
+        return None
+
+    def _handle_menu_input(self, keys):
+        """Handle menu navigation"""
+        pass  # Will be handled by handle_menu_events
+
+    def handle_menu_events(self, events):
+        """Handle menu events (should be called from main.py)"""
+        if self.state != 'menu':
+            return None
+        
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    self.selected_option = (self.selected_option - 1) % len(self.menu_options)
+                elif event.key == pygame.K_DOWN:
+                    self.selected_option = (self.selected_option + 1) % len(self.menu_options)
+                elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
+                    return self._select_menu_option()
+                elif event.key == pygame.K_ESCAPE:
+                    return 'quit'
+        return None
+
+    def _select_menu_option(self):
+        """Process menu selection"""
+        option = self.menu_options[self.selected_option]
+        
+        if option == 'Best of 3':
+            self._start_series(3)
+        elif option == 'Best of 5':
+            self._start_series(5)
+        elif option == 'Best of 7':
+            self._start_series(7)
+        elif option == 'Exit':
+            return 'quit'
+        
+        return None
+
+    def _start_series(self, best_of, seed=None):
+        """Start a new series (seed replays a recorded one)"""
+        if seed is None:
+            seed = self.rng.getrandbits(64)
+        self._seed_streams(seed)
+        self.series_mode = f'best_of_{best_of}'
+        self.series_target = (best_of // 2) + 1
+        self.player_games_won = 0
+        self.ai_games_won = 0
+        self.m_key_pressed = False
+        self._init_game_objects()
+        self.state = 'playing'
+        
+        # Replays record a single ball and the local player's input, so chaos
+        # mode and networked series (the right paddle is remote) are not saved
+        if self.replay_dir is not None and self.balls is None and self.ai_mode != 'remote':
+            self.replay_recorder = ReplayRecorder(seed, best_of, self.winning_score)
+
+    def finish_replay(self):
+        """Save the replay being recorded (if any) and return its path"""
+        recorder, self.replay_recorder = self.replay_recorder, None
+        if recorder is None or not recorder.frames:
+            return None
+        return recorder.save(self, self.replay_dir)
+
+    def _next_game(self):
+        """Start next game in the series"""
+        self._init_game_objects()
+        self.state = 'playing'
+
+    def _reset_series(self):
+        """Reset everything for a new series"""
+        self.player_games_won = 0
+        self.ai_games_won = 0
+        self.series_mode = None
+        self.series_target = 0
+        self.selected_option = 0
 
     def update(self):
-        self.ball.move()
-        self.ball.check_collision(self.player, self.ai)
-
-        if self.ball.x <= 0:
-            self.ai_score += 1
-            self.ball.reset()
-        elif self.ball.x >= self.width:
-            self.player_score += 1
-            self.ball.reset()
-
-        self.ai.auto_track(self.ball, self.height)
-
-    def render(self, screen):
-        # Draw paddles and ball
-        pygame.draw.rect(screen, WHITE, self.player.rect())
-        pygame.draw.rect(screen, WHITE, self.ai.rect())
-        pygame.draw.ellipse(screen, WHITE, self.ball.rect())
-        pygame.draw.aaline(screen, WHITE, (self.width//2, 0), (self.width//2, self.height))
-
-        # Draw score
-        player_text = self.font.render(str(self.player_score), True, WHITE)
-        ai_text = self.font.render(str(self.ai_score), True, WHITE)
-        screen.blit(player_text, (self.width//4, 20))
-        screen.blit(ai_text, (self.width * 3//4, 20))
+        """Update game logic based on state"""
+        if self.state == 'playing' and self.balls is not None:
+            self._update_multi_ball()
+        elif self.state == 'playing':
+            # Move ball
+            self.ball.move()
+            
+            # Check wall bounces (velocity_y changed means wall bounce)
+            if self.ball.velocity_y != self.ball.prev_velocity_y:
+                # Wall bounce detected
+                self._play_ball_sound('wall_bounce')
+            
+            # Check paddle collisions
+            collision = self.ball.check_collision(self.player, self.ai)
+            if collision:
+                # Paddle hit detected
+                self._play_ball_sound('paddle_hit')
+                if self.telemetry is not None:
+                    self.telemetry.hit(self)
+
+            # Check for scoring
+            if self.ball.x <= 0:
+                self.ai_score += 1
+                self.sound_manager.play('score')
+                if self.telemetry is not None:
+                    self.telemetry.point(self, 'ai')
+                self._check_game_winner()
+                if self.state == 'playing':
+                    self._serve()
+            elif self.ball.x >= self.width:
+                self.player_score += 1
+                self.sound_manager.play('score')
+                if self.telemetry is not None:
+                    self.telemetry.point(self, 'player')
+                self._check_game_winner()
+                if self.state == 'playing':
+                    self._serve()
+
+            # AI movement ('remote' paddles are moved by network input instead)
+            if self.ai_mode == 'predictive':
+                self.ai.predict_track(self.ball, self.height, self.ai_noise, self.ai_reaction_delay)
+            elif self.ai_mode == 'reactive':
+                self.ai.auto_track(self.ball, self.height, self.ai_difficulty)
+
+    def _serve(self):
+        """Serve a new ball after a point"""
+        self.ball.reset()
+        # A serve can repeat the velocity of the rally that just ended, so
+        # drop the predictive AI's cached intercepts for the old ball
+        self.player.prediction_velocity = None
+        self.ai.prediction_velocity = None
+
+    def _play_ball_sound(self, name):
+        """Play a sound panned to the ball's position and scaled by its speed"""
+        pan = self.ball.x / self.width * 2 - 1
+        self.sound_manager.play(name, pan, abs(self.ball.velocity_x))
+
+    def _update_multi_ball(self):
+        """update() for chaos mode: every ball is moved, bounced and scored at once"""
+        balls = self.balls
+        if balls.move():
+            self.sound_manager.play('wall_bounce')
+        if balls.check_collisions(self.player, self.ai):
+            self.sound_manager.play('paddle_hit')
+        
+        # Each ball that leaves the field is a point; the game can end mid-tick
+        ai_points, player_points = balls.score()
+        if ai_points or player_points:
+            self.ai_score += ai_points
+            self.player_score += player_points
+            self.sound_manager.play('score')
+            self._check_game_winner()
+        
+        # The AI follows whichever ball will reach it first
+        if self.ai_mode != 'remote':
+            balls.threat(self.ai, self.ball)
+        if self.ai_mode == 'predictive':
+            self.ai.predict_track(self.ball, self.height, self.ai_noise, self.ai_reaction_delay)
+        elif self.ai_mode == 'reactive':
+            self.ai.auto_track(self.ball, self.height, self.ai_difficulty)
+
+    def _check_game_winner(self):
+        """Check if someone won this game"""
+        if self.player_score >= self.winning_score:
+            self.winner = 'player'
+            self.player_games_won += 1
+            self._check_series_winner()
+        elif self.ai_score >= self.winning_score:
+            self.winner = 'ai'
+            self.ai_games_won += 1
+            self._check_series_winner()
+
+    def _check_series_winner(self):
+        """Check if someone won the series"""
+        if self.player_games_won >= self.series_target:
+            self.state = 'series_over'
+            self.winner = 'player'
+        elif self.ai_games_won >= self.series_target:
+            self.state = 'series_over'
+            self.winner = 'ai'
+        else:
+            self.state = 'game_over'
+
+    def render(self, screen, alpha=1.0):
+        """
+        Render game based on current state
+        
+        Args:
+            screen: Surface to draw on
+            alpha: 0.0 to 1.0, how far rendering is between the previous and
+                   the current simulation tick (1.0 draws the current state)
+        """
+        if self.state == 'menu':
+            self._render_menu(screen)
+        elif self.state == 'playing':
+            self._render_game(screen, alpha)
+        elif self.state == 'game_over':
+            self._render_game_over(screen)
+        elif self.state == 'series_over':
+            self._render_series_over(screen)
+
+    def _render_menu(self, screen):
+        """Render main menu"""
+        # Title
+        title = self.text_cache.render(self.large_font, "PING PONG", WHITE)
+        title_rect = title.get_rect(center=(self.width//2, 100))
+        screen.blit(title, title_rect)
+        
+        # Subtitle
+        subtitle = self.text_cache.render(self.small_font, "Select Game Mode", GRAY)
+        subtitle_rect = subtitle.get_rect(center=(self.width//2, 160))
+        screen.blit(subtitle, subtitle_rect)
+        
+        # Menu options
+        start_y = 240
+        spacing = 70
+        
+        for i, option in enumerate(self.menu_options):
+            if i == self.selected_option:
+                color = YELLOW
+                prefix = "> "
+                font = self.medium_font
+            else:
+                color = WHITE
+                prefix = "  "
+                font = self.font
+            
+            option_text = self.text_cache.render(font, prefix + option, color)
+            option_rect = option_text.get_rect(center=(self.width//2, start_y + i * spacing))
+            screen.blit(option_text, option_rect)
+        
+        # Instructions
+        instructions = self.text_cache.render(self.small_font, "↑↓ to select | ENTER to confirm | ESC to exit", GRAY)
+        instructions_rect = instructions.get_rect(center=(self.width//2, self.height - 40))
+        screen.blit(instructions, instructions_rect)
+
+    def _render_game(self, screen, alpha=1.0):
+        """Render normal gameplay"""
+        # Draw center line
+        self._draw_playfield(screen)
+        
+        # Draw paddles, ball, scores and indicators
+        for element in self._game_elements(alpha):
+            self._draw_element(screen, element)
+        if self.balls is not None:
+            self.balls.draw(screen, alpha)
+
+    def _draw_playfield(self, screen, area=None):
+        """Draw the static background layer (black with the center line)"""
+        background = self.layers.get('background', None, self._compose_background)
+        if area is None:
+            screen.blit(background, (0, 0))
+        else:
+            screen.blit(background, area, area)
+
+    def _compose_background(self, surface):
+        """Build the playfield background layer"""
+        surface.fill(BLACK)
+        pygame.draw.aaline(surface, WHITE, (self.width//2, 0), (self.width//2, self.height))
+
+    def _game_elements(self, alpha):
+        """
+        Describe everything that moves or changes during gameplay.
+        
+        Returns:
+            List of [key, kind, rect, content, value] entries where kind is
+            'rect', 'ellipse' or 'text'; content is (string, surface) for
+            text, rendered from value. The same list, entries and rects are
+            updated in place and returned on every call
+        """
+        if self._elements is None:
+            self._elements = [
+                ['player', 'rect', self._player_rect, None, None],
+                ['ai', 'rect', self._ai_rect, None, None],
+                ['ball', 'ellipse', self._ball_rect, None, None],
+                ['player_score', 'text', None, None, None],
+                ['ai_score', 'text', None, None, None],
+                ['series', 'text', None, None, None],
+                ['sound', 'text', None, None, None],
+            ]
+            # Chaos mode draws its balls separately
+            self._chaos_elements = self._elements[:2] + self._elements[3:]
+        _, _, _, player_score, ai_score, series, sound = self._elements
+        
+        self._interpolated_paddle_rect(self.player, alpha, self._player_rect)
+        self._interpolated_paddle_rect(self.ai, alpha, self._ai_rect)
+        self._interpolated_ball_rect(alpha, self._ball_rect)
+        
+        # Text is only formatted and looked up when what it shows changed
+        # Current game scores
+        if player_score[4] != self.player_score:
+            self._set_text(player_score, self.player_score, self.font, str(self.player_score),
+                           WHITE, topleft=(self.width//4, 20))
+        if ai_score[4] != self.ai_score:
+            self._set_text(ai_score, self.ai_score, self.font, str(self.ai_score),
+                           WHITE, topleft=(self.width * 3//4, 20))
+        
+        # Series score
+        games = (self.player_games_won, self.ai_games_won)
+        if series[4] != games:
+            self._set_text(series, games, self.small_font,
+                           f"Games Won - Player: {self.player_games_won} | AI: {self.ai_games_won}",
+                           GRAY, center=(self.width//2, self.height - 20))
+        
+        # Sound indicator
+        enabled = self.sound_manager.enabled
+        if sound[4] is not enabled:
+            self._set_text(sound, enabled, self.small_font,
+                           f"Sound: {'ON' if enabled else 'OFF'} (M)",
+                           GRAY, topleft=(10, self.height - 30))
+        return self._elements if self.balls is None else self._chaos_elements
+
+    def _set_text(self, element, value, font, text, color, **position):
+        """Point a text element at the (cached) surface for text"""
+        surface = self.text_cache.render(font, text, color)
+        element[2] = surface.get_rect(**position)
+        element[3] = (text, surface)
+        element[4] = value
+
+    def _draw_element(self, screen, element):
+        """Draw one entry from _game_elements"""
+        _, kind, rect, content, _ = element
+        if kind == 'rect':
+            pygame.draw.rect(screen, WHITE, rect)
+        elif kind == 'ellipse':
+            pygame.draw.ellipse(screen, WHITE, rect)
+        else:
+            screen.blit(content[1], rect)
+
+    def render_dirty(self, screen, alpha=1.0):
+        """
+        Dirty-rectangle rendering: during gameplay only the regions whose
+        contents changed since the last call are erased and redrawn.
+        Other states (and the first gameplay frame) are drawn in full, as is
+        chaos mode, where balls cover the whole field anyway.
+        
+        Returns:
+            List of rects to present with pygame.display.update()
+        """
+        if self.state != 'playing' or self._dirty_state != 'playing' or self.balls is not None:
+            self._dirty_state = self.state
+            screen.fill(BLACK)
+            self.render(screen, alpha)
+            if self.state == 'playing':
+                self._drawn_elements = {key: [rect.copy(), content]
+                                        for key, _, rect, content, _ in self._game_elements(alpha)}
+            return [screen.get_rect()]
+        
+        elements = self._game_elements(alpha)
+        
+        # Collect old and new bounds of everything that moved or changed
+        dirty = []
+        drawn_elements = self._drawn_elements
+        for key, _, rect, content, _ in elements:
+            drawn = drawn_elements.get(key)
+            if drawn is None:
+                drawn_elements[key] = [rect.copy(), content]
+                dirty.append(rect)
+            elif drawn[0] != rect or drawn[1] is not content:
+                dirty.append(drawn[0])
+                dirty.append(rect)
+                drawn[0] = rect.copy()
+                drawn[1] = content
+        
+        # The profiler overlay is drawn over the frame afterwards; repaint
+        # where it was last time so a smaller (or hidden) overlay leaves
+        # nothing behind
+        overlay = self.profiler.drawn_rect
+        if overlay is not None:
+            dirty.append(overlay)
+        
+        # Erase each region and redraw whatever overlaps it, clipped so
+        # untouched pixels (e.g. antialiased text edges) are not drawn twice
+        screen_rect = screen.get_rect()
+        dirty = [rect.clip(screen_rect) for rect in dirty]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+        for region in dirty:
+            screen.set_clip(region)
+            self._draw_playfield(screen, region)
+            for element in elements:
+                if element[2].colliderect(region):
+                    self._draw_element(screen, element)
+        screen.set_clip(None)
+        return dirty
+
+    def request_full_redraw(self):
+        """Make the next render_dirty() call redraw and present the whole screen"""
+        self._dirty_state = None
+
+    def _interpolated_paddle_rect(self, paddle, alpha, rect=None):
+        """Paddle rect blended between the previous and current tick (written into rect if given)"""
+        y = paddle.prev_y + (paddle.y - paddle.prev_y) * alpha
+        if rect is None:
+            return pygame.Rect(paddle.x, y, paddle.width, paddle.height)
+        # Truncate like pygame.Rect(); the setters round
+        rect.x = int(paddle.x)
+        rect.y = int(y)
+        return rect
+
+    def _interpolated_ball_rect(self, alpha, rect=None):
+        """Ball rect blended between the previous and current tick (written into rect if given)"""
+        ball = self.ball
+        x = ball.prev_x + (ball.x - ball.prev_x) * alpha
+        y = ball.prev_y + (ball.y - ball.prev_y) * alpha
+        if rect is None:
+            return pygame.Rect(x, y, ball.width, ball.height)
+        rect.x = int(x)
+        rect.y = int(y)
+        return rect
+
+    def _render_game_over(self, screen):
+        """Render game over screen"""
+        # Nothing moves while this screen is shown, so it is composited once
+        key = (self.winner, self.player_score, self.ai_score, self.player_games_won,
+               self.ai_games_won, self.series_target, self.ball.x, self.ball.y,
+               self.balls and self.balls.x.sum(), self.player.y, self.ai.y,
+               self.sound_manager.enabled)
+        screen.blit(self.layers.get('game_over', key, self._compose_game_over), (0, 0))
+
+    def _compose_game_over(self, screen):
+        """Build the game over layer: final game state, dimmed, plus text"""
+        self._render_game(screen)
+        screen.blit(self.layers.overlay(180), (0, 0))
+        
+        if self.winner == 'player':
+            winner_text = self.text_cache.render(self.large_font, "PLAYER WINS GAME!", GREEN)
+        else:
+            winner_text = self.text_cache.render(self.large_font, "AI WINS GAME!", RED)
+        
+        winner_rect = winner_text.get_rect(center=(self.width//2, self.height//2 - 80))
+        screen.blit(winner_text, winner_rect)
+        
+        series_text = self.text_cache.render(
+            self.medium_font,
+            f"Series: Player {self.player_games_won} - {self.ai_games_won} AI",
+            WHITE
+        )
+        series_rect = series_text.get_rect(center=(self.width//2, self.height//2))
+        screen.blit(series_text, series_rect)
+        
+        next_text = self.text_cache.render(self.font, f"First to {self.series_target} wins!", GRAY)
+        next_rect = next_text.get_rect(center=(self.width//2, self.height//2 + 60))
+        screen.blit(next_text, next_rect)
+        
+        continue_text = self.text_cache.render(self.font, "Press SPACE to continue", YELLOW)
+        continue_rect = continue_text.get_rect(center=(self.width//2, self.height//2 + 110))
+        screen.blit(continue_text, continue_rect)
+
+    def _render_series_over(self, screen):
+        """Render series over screen"""
+        key = (self.winner, self.player_games_won, self.ai_games_won)
+        screen.blit(self.layers.get('series_over', key, self._compose_series_over), (0, 0))
+
+    def _compose_series_over(self, screen):
+        """Build the series over layer (drawn over a cleared screen)"""
+        screen.fill(BLACK)
+        
+        if self.winner == 'player':
+            winner_text = self.text_cache.render(self.large_font, "PLAYER WINS SERIES!", GREEN)
+        else:
+            winner_text = self.text_cache.render(self.large_font, "AI WINS SERIES!", RED)
+        
+        winner_rect = winner_text.get_rect(center=(self.width//2, self.height//2 - 100))
+        screen.blit(winner_text, winner_rect)
+        
+        final_score = self.text_cache.render(
+            self.medium_font,
+            f"Final Score: {self.player_games_won} - {self.ai_games_won}",
+            WHITE
+        )
+        final_rect = final_score.get_rect(center=(self.width//2, self.height//2 - 20))
+        screen.blit(final_score, final_rect)
+        
+        # Trophy emoji might not render on all systems, using text instead
+        trophy = self.text_cache.render(self.large_font, "CHAMPION", YELLOW)
+        trophy_rect = trophy.get_rect(center=(self.width//2, self.height//2 + 50))
+        screen.blit(trophy, trophy_rect)
+        
+        restart_text = self.text_cache.render(self.font, "Press SPACE or R for Menu", GRAY)
+        restart_rect = restart_text.get_rect(center=(self.width//2, self.height//2 + 130))
+        screen.blit(restart_text, restart_rect)
+        
+        exit_text = self.text_cache.render(self.font, "Press ESC to Exit", GRAY)
+        exit_rect = exit_text.get_rect(center=(self.width//2, self.height//2 + 170))
+        screen.blit(exit_text, exit_rect)
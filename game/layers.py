@@ -0,0 +1,55 @@
+import pygame
+
+# Prebuilt render layers
+#
+# Screens that stay the same for many frames (the playfield background, the
+# game-over and series-over screens) are composited once into a full-screen
+# surface and then drawn with a single blit per frame. A layer is only
+# recomposited when the key it was built for changes.
+
+
+class LayerCache:
+    """Full-screen surfaces that are rebuilt only when their key changes"""
+    def __init__(self, size):
+        self.size = size
+        self.layers = {}     # name -> (key, surface)
+        self.overlays = {}   # alpha -> translucent black surface
+
+    def _new_surface(self):
+        """Allocate a screen-sized surface in the display's pixel format"""
+        surface = pygame.Surface(self.size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def get(self, name, key, build):
+        """
+        Return the layer called name, calling build(surface) to recomposite
+        it first if it was never built or was built for a different key.
+        The layer's surface is allocated once and reused for every rebuild.
+        """
+        entry = self.layers.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        surface = entry[1] if entry is not None else self._new_surface()
+        build(surface)
+        self.layers[name] = (key, surface)
+        return surface
+
+    def overlay(self, alpha):
+        """Preallocated translucent black surface used to dim the screen"""
+        surface = self.overlays.get(alpha)
+        if surface is None:
+            surface = self._new_surface()
+            surface.fill((0, 0, 0))
+            surface.set_alpha(alpha)
+            self.overlays[alpha] = surface
+        return surface
+
+    def invalidate(self, name=None):
+        """Force one layer (or every layer) to be rebuilt on next use"""
+        if name is None:
+            self.layers.clear()
+        else:
+            self.layers.pop(name, None)
@@ -0,0 +1,145 @@
+import numpy as np
+import pygame
+
+# Multi-ball ("chaos") mode
+#
+# All balls live in parallel NumPy arrays and are moved, bounced off the
+# walls, tested against both paddles and scored with one set of array
+# operations per tick, following the same rules as Ball.move,
+# Ball.check_collision and GameEngine.update. Rendering blits one cached
+# ball sprite per ball with a single Surface.blits() call.
+
+SPEED_X = (4.0, 6.0)   # Serve speed range, random direction
+SPEED_Y = 3.0          # Serve vertical speed in [-SPEED_Y, SPEED_Y]
+MAX_SPEED_X = 12
+MAX_SPEED_Y = 8
+
+
+class BallArray:
+    """Many balls stored as a structure of arrays"""
+    def __init__(self, count, screen_width, screen_height, size=7, seed=None):
+        self.count = count
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.width = self.height = size
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.prev_x = np.zeros(count)
+        self.prev_y = np.zeros(count)
+        self.velocity_x = np.zeros(count)
+        self.velocity_y = np.zeros(count)
+
+        self.sprite = None
+        self.reset()
+
+    def reset(self, mask=None):
+        """Serve the selected balls (all by default) from the center line"""
+        if mask is None:
+            mask = np.ones(self.count, dtype=bool)
+        count = int(np.count_nonzero(mask))
+        if not count:
+            return
+        rng = self.rng
+        self.x[mask] = self.screen_width // 2
+        self.y[mask] = rng.uniform(0.1, 0.9, count) * (self.screen_height - self.height)
+        self.prev_x[mask] = self.x[mask]
+        self.prev_y[mask] = self.y[mask]
+        self.velocity_x[mask] = rng.choice([-1.0, 1.0], count) * rng.uniform(*SPEED_X, count)
+        self.velocity_y[mask] = rng.uniform(-SPEED_Y, SPEED_Y, count)
+
+    def move(self):
+        """Ball.move for every ball; returns the number of wall bounces"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.x = self.x + self.velocity_x
+        y = self.y + self.velocity_y
+        wall = (y <= 0) | (y + self.height >= self.screen_height)
+        self.velocity_y = np.where(wall, -self.velocity_y, self.velocity_y)
+        self.y = np.clip(y, 0, self.screen_height - self.height)
+        return int(np.count_nonzero(wall))
+
+    def check_collisions(self, player, ai):
+        """
+        Ball.check_collision for every ball against both paddles at once.
+
+        Returns:
+            Number of balls that hit a paddle this tick
+        """
+        x, vx = self.x, self.velocity_x
+        player_edge = player.x + player.width
+        left = ((vx < 0) & (self.prev_x >= player_edge) & (x <= player_edge)
+                & self._overlaps(player))
+        right = ((vx > 0) & (self.prev_x + self.width <= ai.x) & (x + self.width >= ai.x)
+                 & self._overlaps(ai))
+        hit = left | right
+        if not hit.any():
+            return 0
+
+        # Ball._bounce_off_paddle
+        paddle_y = np.where(left, player.y, ai.y)
+        vx = np.where(hit, -vx, vx)
+        self.x = np.where(left, player_edge, np.where(right, ai.x - self.width, x))
+        relative_hit = (self.y + self.height / 2 - (paddle_y + player.height / 2)) / (player.height / 2)
+        self.velocity_y = np.where(hit, np.clip(self.velocity_y + relative_hit * 2,
+                                                -MAX_SPEED_Y, MAX_SPEED_Y), self.velocity_y)
+        boost = hit & (np.abs(vx) < MAX_SPEED_X)
+        self.velocity_x = np.where(boost, vx + np.copysign(0.3, vx), vx)
+        return int(np.count_nonzero(hit))
+
+    def _overlaps(self, paddle):
+        """Vectorized Ball._check_vertical_overlap"""
+        return ~((self.y + self.height < paddle.y) | (self.y > paddle.y + paddle.height))
+
+    def score(self):
+        """
+        Find balls that left the field and serve them again.
+
+        Returns:
+            (points for the AI, points for the player)
+        """
+        ai_points = self.x <= 0
+        player_points = self.x >= self.screen_width
+        scored = ai_points | player_points
+        if not scored.any():
+            return 0, 0
+        self.reset(scored)
+        return int(np.count_nonzero(ai_points)), int(np.count_nonzero(player_points))
+
+    def threat(self, paddle, ball):
+        """
+        Copy the ball that will reach paddle first into ball (a Ball), so
+        the single-ball AI can track it. Returns its index.
+        """
+        distance = (paddle.x - self.x) / self.velocity_x
+        incoming = np.where(distance > 0, distance, np.inf)
+        i = int(np.argmin(incoming))
+        ball.x, ball.y = float(self.x[i]), float(self.y[i])
+        ball.prev_x, ball.prev_y = float(self.prev_x[i]), float(self.prev_y[i])
+        ball.velocity_x, ball.velocity_y = float(self.velocity_x[i]), float(self.velocity_y[i])
+        return i
+
+    def draw(self, screen, alpha=1.0):
+        """Draw every ball, interpolated between ticks, with one blits() call"""
+        if self.sprite is None:
+            self.sprite = pygame.Surface((self.width, self.height))
+            self.sprite.set_colorkey((0, 0, 0))
+            pygame.draw.ellipse(self.sprite, (255, 255, 255), self.sprite.get_rect())
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        sprite = self.sprite
+        screen.blits([(sprite, position) for position in zip(x.astype(int).tolist(),
+                                                             y.astype(int).tolist())],
+                     doreturn=False)
+
+    def snapshot(self):
+        return (self.x.copy(), self.y.copy(), self.prev_x.copy(), self.prev_y.copy(),
+                self.velocity_x.copy(), self.velocity_y.copy(), self.rng.bit_generator.state)
+
+    def restore(self, state):
+        x, y, prev_x, prev_y, velocity_x, velocity_y, rng_state = state
+        self.x, self.y = x.copy(), y.copy()
+        self.prev_x, self.prev_y = prev_x.copy(), prev_y.copy()
+        self.velocity_x, self.velocity_y = velocity_x.copy(), velocity_y.copy()
+        self.rng.bit_generator.state = rng_state
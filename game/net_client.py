@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import struct
+import time
+
+from .netcode import (
+    JOIN, WELCOME, MSG_WELCOME, MSG_SNAPSHOT, MSG_FULL, MSG_LEAVE, PROTOCOL_VERSION,
+    FIELD_INDEX, PADDLE_FIELDS, NETWORK_KEYS, NO_BASE, STATES, WINNERS, INPUT_REDUNDANCY,
+    NetworkConditions, SimulatedLink, apply_move, decode_snapshot, encode_input,
+)
+from .replay import KEY_W, KEY_S, KEY_SPACE, encode_keys
+
+# Networked client
+#
+# Sends one input per tick and draws the latest server snapshot. The
+# player's own paddle is predicted locally: inputs are applied as soon as
+# they are pressed, and when a snapshot arrives the client restarts from the
+# server's paddle position and re-applies every input the server has not
+# processed yet (reconciliation).
+
+SNAPSHOT_HISTORY = 128
+PADDLE_HEIGHT = 100
+
+
+class MatchClient(asyncio.DatagramProtocol):
+    """UDP protocol for one player, with own-paddle prediction"""
+    def __init__(self, conditions=None):
+        self.conditions = conditions
+        self.link = None
+        self.slot = None
+        self.height = None
+        self.tick_rate = None
+        self.joined = asyncio.Event()
+        self.rejected = False
+
+        self.seq = 0
+        self.pending = []       # Unacknowledged (seq, bits), oldest first
+        self.history = {}       # tick -> decoded state tuple
+        self.tick = NO_BASE     # Newest snapshot tick received
+        self.state = None       # Newest snapshot state tuple
+        self.predicted_y = None
+
+        # Stats
+        self.snapshots = 0
+        self.corrections = 0
+
+    def connection_made(self, transport):
+        self.link = SimulatedLink(transport, asyncio.get_running_loop(), self.conditions)
+
+    def datagram_received(self, data, addr):
+        if not data:
+            return
+        try:
+            if data[0] == MSG_WELCOME:
+                self._welcome(data)
+            elif data[0] == MSG_FULL:
+                self.rejected = True
+                self.joined.set()
+            elif data[0] == MSG_SNAPSHOT and self.slot is not None:
+                self._receive_snapshot(data)
+        except (struct.error, ValueError):
+            pass   # Truncated or garbage datagram: drop it
+
+    def _welcome(self, data):
+        _, slot, tick_rate, _, height = WELCOME.unpack_from(data)
+        if slot not in (0, 1) or not tick_rate or not height:
+            raise ValueError("Bad WELCOME")
+        self.slot, self.tick_rate, self.height = slot, tick_rate, height
+        self.joined.set()
+
+    async def join(self, retry_interval=0.2, timeout=5.0):
+        """Send JOIN until the server answers; returns our slot"""
+        deadline = time.monotonic() + timeout
+        while not self.joined.is_set():
+            if time.monotonic() > deadline:
+                raise TimeoutError("No answer from server")
+            self.link.sendto(JOIN.pack(1, PROTOCOL_VERSION))
+            try:
+                await asyncio.wait_for(self.joined.wait(), retry_interval)
+            except asyncio.TimeoutError:
+                pass
+        if self.rejected:
+            raise ConnectionRefusedError("Server is full")
+        return self.slot
+
+    def _receive_snapshot(self, data):
+        decoded = decode_snapshot(data, self.history)
+        if decoded is None:
+            return
+        tick, ack_seq, state = decoded
+        self.history[tick] = state
+        self.history.pop(tick - SNAPSHOT_HISTORY, None)
+        if self.tick != NO_BASE and tick <= self.tick:
+            return  # Out of order, only useful as a delta base
+        self.tick = tick
+        self.state = state
+        self.snapshots += 1
+
+        # Reconcile: server position + every input it has not applied yet
+        self.pending = [(seq, bits) for seq, bits in self.pending if seq > ack_seq]
+        y = state[FIELD_INDEX[PADDLE_FIELDS[self.slot]]]
+        if self.playing:
+            for _, bits in self.pending:
+                y = apply_move(y, bits, self.height, PADDLE_HEIGHT)
+        if self.predicted_y is not None and y != self.predicted_y:
+            self.corrections += 1
+        self.predicted_y = y
+
+    def send_input(self, bits):
+        """Apply one tick of input locally and send it to the server"""
+        bits &= NETWORK_KEYS
+        self.seq += 1
+        self.pending.append((self.seq, bits))
+        # Older inputs can no longer be resent, so stop replaying them too
+        # (keeps pending bounded while no snapshots arrive)
+        del self.pending[:-INPUT_REDUNDANCY]
+        if self.predicted_y is not None and self.playing:
+            self.predicted_y = apply_move(self.predicted_y, bits, self.height, PADDLE_HEIGHT)
+        recent = [b for _, b in self.pending]
+        self.link.sendto(encode_input(self.seq, self.tick if self.tick != NO_BASE else 0, recent))
+
+    def leave(self):
+        if self.link is not None:
+            self.link.sendto(bytes([MSG_LEAVE]))
+
+    @property
+    def playing(self):
+        return self.state is not None and STATES[self.state[FIELD_INDEX['state']]] == 'playing'
+
+    def apply_to_engine(self, engine):
+        """Copy the latest snapshot (with our predicted paddle) into a GameEngine for rendering"""
+        state = self.state
+        ball = engine.ball
+        ball.x = ball.prev_x = state[FIELD_INDEX['ball_x']]
+        ball.y = ball.prev_y = state[FIELD_INDEX['ball_y']]
+        ball.velocity_x = state[FIELD_INDEX['velocity_x']]
+        ball.velocity_y = state[FIELD_INDEX['velocity_y']]
+        engine.player.y = engine.player.prev_y = state[FIELD_INDEX['player_y']]
+        engine.ai.y = engine.ai.prev_y = state[FIELD_INDEX['ai_y']]
+        own = engine.player if self.slot == 0 else engine.ai
+        own.y = own.prev_y = self.predicted_y
+        engine.player_score = state[FIELD_INDEX['player_score']]
+        engine.ai_score = state[FIELD_INDEX['ai_score']]
+        engine.player_games_won = state[FIELD_INDEX['player_games_won']]
+        engine.ai_games_won = state[FIELD_INDEX['ai_games_won']]
+        engine.state = STATES[state[FIELD_INDEX['state']]]
+        engine.winner = WINNERS[state[FIELD_INDEX['winner']]]
+
+
+async def connect(host, port, conditions=None):
+    """Open a client endpoint to the server and join; returns (transport, client)"""
+    loop = asyncio.get_running_loop()
+    client = MatchClient(conditions)
+    transport, _ = await loop.create_datagram_endpoint(lambda: client, remote_addr=(host, port))
+    await client.join()
+    return transport, client
+
+
+async def play(host, port, conditions):
+    """Pygame front end: read W/S/SPACE each tick and draw the match"""
+    import pygame
+    from .game_engine import GameEngine, SoundManager, WHITE
+
+    pygame.init()
+    transport, client = await connect(host, port, conditions)
+    screen = pygame.display.set_mode((800, client.height))
+    side = "left" if client.slot == 0 else "right"
+    pygame.display.set_caption(f"Ping Pong - Online ({side} paddle)")
+    # Only draws snapshots: no mixer to open and no sounds to load
+    view = GameEngine(800, client.height, sound_manager=SoundManager(headless=True))
+    waiting = view.font.render("Waiting for opponent...", True, WHITE)
+
+    tick_duration = 1.0 / client.tick_rate
+    next_tick = time.perf_counter()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+        client.send_input(encode_keys(pygame.key.get_pressed()))
+
+        screen.fill((0, 0, 0))
+        if client.state is None or STATES[client.state[FIELD_INDEX['state']]] == 'menu':
+            screen.blit(waiting, waiting.get_rect(center=screen.get_rect().center))
+        else:
+            client.apply_to_engine(view)
+            view.render(screen)
+        pygame.display.flip()
+
+        next_tick += tick_duration
+        await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+    client.leave()
+    transport.close()
+    pygame.quit()
+
+
+async def loopback_test(duration, conditions, best_of=3):
+    """
+    Run a server and two bot clients over 127.0.0.1 with simulated network
+    conditions, and report bandwidth and prediction statistics.
+    """
+    from .net_server import MatchServer, start_server
+
+    server = MatchServer(best_of, conditions=conditions, seed=1)
+    server_transport = await start_server('127.0.0.1', 0, server)
+    port = server_transport.get_extra_info('sockname')[1]
+    server_task = asyncio.create_task(server.run())
+
+    endpoints = [await connect('127.0.0.1', port, conditions) for _ in range(2)]
+    clients = [client for _, client in endpoints]
+
+    # Bots chase the ball as they see it in their latest snapshot
+    tick_duration = 1.0 / 60
+    start = time.perf_counter()
+    next_tick = start
+    while time.perf_counter() - start < duration:
+        for client in clients:
+            bits = 0
+            if client.state is not None and client.predicted_y is not None:
+                ball_center = client.state[FIELD_INDEX['ball_y']] + 3.5
+                paddle_center = client.predicted_y + PADDLE_HEIGHT / 2
+                if ball_center < paddle_center - 10:
+                    bits = KEY_W
+                elif ball_center > paddle_center + 10:
+                    bits = KEY_S
+                if not client.playing:
+                    bits = KEY_SPACE
+            client.send_input(bits)
+        next_tick += tick_duration
+        await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+    elapsed = time.perf_counter() - start
+    server_task.cancel()
+    for transport, client in endpoints:
+        client.leave()
+        transport.close()
+    server_transport.close()
+
+    engine = server.engine
+    print(f"Loopback {duration:.0f}s, latency {conditions.latency * 1000:.0f}ms "
+          f"±{conditions.jitter * 1000:.0f}ms, loss {conditions.loss:.0%}")
+    print(f"Server ticks: {server.tick}, score {engine.player_score}-{engine.ai_score}, "
+          f"games {engine.player_games_won}-{engine.ai_games_won}")
+    downstream = server.link.bytes_sent / len(clients) / elapsed
+    downstream_packets = server.link.packets_sent / len(clients)
+    for i, client in enumerate(clients):
+        upstream = client.link.bytes_sent / elapsed
+        own = client.state[FIELD_INDEX[PADDLE_FIELDS[client.slot]]] if client.state else None
+        print(f"Client {i} (slot {client.slot}): up {upstream:,.0f} B/s "
+              f"({client.link.bytes_sent / max(1, client.link.packets_sent):.1f} B/packet), "
+              f"snapshots received {client.snapshots}, corrections {client.corrections}, "
+              f"predicted y {client.predicted_y} vs server {own} (+{len(client.pending)} unacked inputs)")
+    print(f"Down per client: {downstream:,.0f} B/s "
+          f"({server.link.bytes_sent / max(1, server.link.packets_sent):.1f} B/snapshot, "
+          f"{downstream_packets:.0f} snapshots)")
+    return server, clients
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Networked ping pong client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=50007)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated one-way latency (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="simulated jitter (ms)")
+    parser.add_argument("--loss", type=float, default=0.0, help="simulated packet loss (0.0 - 1.0)")
+    parser.add_argument("--loopback", type=float, metavar="SECONDS",
+                        help="run a local server with two bot clients instead of playing")
+    args = parser.parse_args()
+
+    conditions = NetworkConditions(args.latency / 1000, args.jitter / 1000, args.loss, seed=0)
+    if args.loopback:
+        asyncio.run(loopback_test(args.loopback, conditions))
+    else:
+        asyncio.run(play(args.host, args.port, conditions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import argparse
+import asyncio
+import struct
+import time
+
+from .game_engine import GameEngine
+from .netcode import (
+    JOIN, WELCOME, MSG_JOIN, MSG_WELCOME, MSG_INPUT, MSG_LEAVE, MSG_FULL, PROTOCOL_VERSION,
+    NetworkConditions, SimulatedLink, advance, capture_state, decode_input, encode_snapshot,
+)
+
+# Authoritative match server
+#
+# Runs GameEngine.update() headless at a fixed tick rate for two remote
+# players and broadcasts delta-encoded snapshots after every tick. Slot 0
+# controls the left paddle, slot 1 the right one.
+
+WIDTH, HEIGHT = 800, 600
+HISTORY_TICKS = 128     # Snapshots kept as delta bases
+MAX_QUEUED_INPUTS = 8   # Inputs buffered per client before old ones are dropped
+
+
+class RemotePlayer:
+    """Server-side state for one connected client"""
+    def __init__(self, slot, addr):
+        self.slot = slot
+        self.addr = addr
+        self.last_seq = 0        # Newest input seq queued or applied
+        self.applied_seq = 0     # Input seq applied on the latest tick
+        self.queue = []          # Pending (seq, bits), oldest first
+        self.bits = 0            # Input held when the queue runs dry
+        self.acked_tick = None   # Newest snapshot the client confirmed
+        self.last_heard = time.monotonic()
+
+
+class MatchServer(asyncio.DatagramProtocol):
+    """UDP protocol hosting one two-player match"""
+    def __init__(self, best_of=3, tick_rate=60, conditions=None, seed=None, timeout=5.0):
+        self.best_of = best_of
+        self.tick_rate = tick_rate
+        self.conditions = conditions
+        self.timeout = timeout
+
+        self.engine = GameEngine(WIDTH, HEIGHT, headless=True, seed=seed)
+        self.engine.ai_mode = 'remote'
+        self.players = {}    # addr -> RemotePlayer
+        self.tick = 0
+        self.history = {}    # tick -> state tuple
+        self.link = None
+
+    def connection_made(self, transport):
+        self.link = SimulatedLink(transport, asyncio.get_running_loop(), self.conditions)
+
+    def datagram_received(self, data, addr):
+        if not data:
+            return
+        kind = data[0]
+        player = self.players.get(addr)
+        try:
+            if kind == MSG_JOIN:
+                self._join(data, addr)
+            elif player is None:
+                return
+            elif kind == MSG_INPUT:
+                self._receive_input(player, data)
+            elif kind == MSG_LEAVE:
+                del self.players[addr]
+        except struct.error:
+            pass   # Truncated or garbage datagram: drop it
+
+    def _join(self, data, addr):
+        _, version = JOIN.unpack_from(data)
+        if version != PROTOCOL_VERSION:
+            return
+        player = self.players.get(addr)
+        if player is None:
+            taken = {p.slot for p in self.players.values()}
+            free = [slot for slot in (0, 1) if slot not in taken]
+            if not free:
+                self.link.sendto(bytes([MSG_FULL]), addr)
+                return
+            player = RemotePlayer(free[0], addr)
+            self.players[addr] = player
+        # Answer repeated JOINs too, in case the WELCOME was lost
+        self.link.sendto(WELCOME.pack(MSG_WELCOME, player.slot, self.tick_rate, WIDTH, HEIGHT), addr)
+
+    def _receive_input(self, player, data):
+        _, ack_tick, inputs = decode_input(data)
+        player.last_heard = time.monotonic()
+        if player.acked_tick is None or ack_tick > player.acked_tick:
+            player.acked_tick = ack_tick
+        for seq, bits in inputs:
+            if seq > player.last_seq:
+                player.queue.append((seq, bits))
+                player.last_seq = seq
+        # Keep latency bounded if a client runs ahead of the server
+        del player.queue[:-MAX_QUEUED_INPUTS]
+
+    def _next_bits(self, player):
+        """Consume one input per tick; repeat the last one if none arrived"""
+        if player.queue:
+            player.applied_seq, player.bits = player.queue.pop(0)
+        return player.bits
+
+    def step(self):
+        """Run one authoritative tick and broadcast snapshots"""
+        engine = self.engine
+        by_slot = {p.slot: p for p in self.players.values()}
+        bits = [self._next_bits(by_slot[slot]) if slot in by_slot else 0 for slot in (0, 1)]
+
+        if len(by_slot) == 2:
+            advance(engine, bits[0], bits[1], self.best_of)
+
+        self.tick += 1
+        state = capture_state(engine)
+        self.history[self.tick] = state
+        self.history.pop(self.tick - HISTORY_TICKS, None)
+        for player in by_slot.values():
+            base = self.history.get(player.acked_tick)
+            packet = encode_snapshot(self.tick, player.applied_seq, state, player.acked_tick, base)
+            self.link.sendto(packet, player.addr)
+
+    def drop_silent_players(self):
+        """Forget clients we have not heard from within the timeout"""
+        now = time.monotonic()
+        for addr, player in list(self.players.items()):
+            if now - player.last_heard > self.timeout:
+                del self.players[addr]
+        if len(self.players) < 2 and self.engine.state != 'menu':
+            self.engine._reset_series()
+            self.engine.state = 'menu'
+
+    async def run(self, duration=None):
+        """Tick at a fixed rate until cancelled (or for duration seconds)"""
+        tick_duration = 1.0 / self.tick_rate
+        start = time.perf_counter()
+        next_tick = start
+        while duration is None or time.perf_counter() - start < duration:
+            self.step()
+            if self.tick % self.tick_rate == 0:
+                self.drop_silent_players()
+            next_tick += tick_duration
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+
+async def start_server(host, port, server):
+    """Bind the server's UDP endpoint; returns the transport (port 0 picks a free one)"""
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=(host, port))
+    return transport
+
+
+async def serve(host, port, server, duration=None):
+    """Bind the server on host:port and tick it until cancelled"""
+    transport = await start_server(host, port, server)
+    try:
+        await server.run(duration)
+    finally:
+        transport.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Authoritative UDP ping pong server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=50007)
+    parser.add_argument("--best-of", type=int, default=3, choices=[3, 5, 7])
+    parser.add_argument("--tick-rate", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated one-way latency (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="simulated jitter (ms)")
+    parser.add_argument("--loss", type=float, default=0.0, help="simulated packet loss (0.0 - 1.0)")
+    args = parser.parse_args()
+
+    conditions = NetworkConditions(args.latency / 1000, args.jitter / 1000, args.loss)
+    server = MatchServer(args.best_of, args.tick_rate, conditions)
+    print(f"Serving on {args.host}:{args.port} at {args.tick_rate} Hz")
+    try:
+        asyncio.run(serve(args.host, args.port, server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import random
+import struct
+
+from .replay import KEY_W, KEY_S, KEY_SPACE, ReplayKeys
+
+# Network protocol shared by net_server.py and net_client.py
+#
+# Every datagram starts with a one byte message type. Inputs travel client ->
+# server with the last few unacknowledged inputs repeated, so a lost packet
+# is covered by the next one. Snapshots travel server -> client and only
+# carry the fields that changed since the last snapshot the client
+# acknowledged (a bit mask says which ones are present).
+
+PROTOCOL_VERSION = 1
+
+MSG_JOIN = 1
+MSG_WELCOME = 2
+MSG_INPUT = 3
+MSG_SNAPSHOT = 4
+MSG_LEAVE = 5
+MSG_FULL = 6
+
+JOIN = struct.Struct('<BB')                   # type, protocol version
+WELCOME = struct.Struct('<BBHHH')             # type, slot, tick rate, width, height
+INPUT_HEADER = struct.Struct('<BIIB')         # type, newest input seq, acked snapshot tick, count
+SNAPSHOT_HEADER = struct.Struct('<BIIIH')     # type, tick, base tick, acked input seq, field mask
+NO_BASE = 0xFFFFFFFF                          # base tick of a full (non-delta) snapshot
+
+# Inputs repeated in every input packet (1 byte each)
+INPUT_REDUNDANCY = 32
+
+# Snapshot fields in wire order: (name, struct format)
+FIELDS = (
+    ('ball_x', 'f'),
+    ('ball_y', 'f'),
+    ('velocity_x', 'f'),
+    ('velocity_y', 'f'),
+    ('player_y', 'f'),
+    ('ai_y', 'f'),
+    ('player_score', 'B'),
+    ('ai_score', 'B'),
+    ('player_games_won', 'B'),
+    ('ai_games_won', 'B'),
+    ('state', 'B'),
+    ('winner', 'B'),
+)
+FIELD_STRUCTS = [struct.Struct('<' + fmt) for _, fmt in FIELDS]
+FIELD_INDEX = {name: i for i, (name, _) in enumerate(FIELDS)}
+STATES = ['menu', 'playing', 'game_over', 'series_over']
+WINNERS = [None, 'player', 'ai']
+
+# Which snapshot field holds each slot's own paddle
+PADDLE_FIELDS = ('player_y', 'ai_y')
+
+PADDLE_STEP = 10
+
+
+def apply_move(y, bits, screen_height, paddle_height):
+    """
+    Move a paddle position by one tick of W/S input, exactly like
+    GameEngine.handle_input (used by the server and by client prediction).
+    """
+    max_y = screen_height - paddle_height
+    if bits & KEY_W:
+        y = max(0, min(y - PADDLE_STEP, max_y))
+    if bits & KEY_S:
+        y = max(0, min(y + PADDLE_STEP, max_y))
+    return y
+
+
+# Key lookup used to pass SPACE on to GameEngine.handle_input
+SPACE_KEYS = ReplayKeys(KEY_SPACE)
+
+
+def advance(engine, left_bits, right_bits, best_of=3):
+    """
+    Run one tick of a two-player match from both players' input bits:
+    starts the series from the menu, moves both paddles while playing and
+    lets either player continue with SPACE. The server and rollback peers
+    all simulate through this so they stay in lockstep.
+    """
+    engine.player.prev_y = engine.player.y
+    engine.ai.prev_y = engine.ai.y
+    if engine.state == 'menu':
+        engine._start_series(best_of)
+    if engine.state == 'playing':
+        engine.player.y = apply_move(engine.player.y, left_bits, engine.height, engine.player.height)
+        engine.ai.y = apply_move(engine.ai.y, right_bits, engine.height, engine.ai.height)
+    elif (left_bits | right_bits) & KEY_SPACE:
+        engine.handle_input(SPACE_KEYS)
+    engine.update()
+
+
+def capture_state(engine):
+    """Snapshot tuple of everything a client needs to draw the match"""
+    ball = engine.ball
+    return (ball.x, ball.y, ball.velocity_x, ball.velocity_y,
+            engine.player.y, engine.ai.y,
+            engine.player_score, engine.ai_score,
+            engine.player_games_won, engine.ai_games_won,
+            STATES.index(engine.state), WINNERS.index(engine.winner))
+
+
+def encode_snapshot(tick, ack_seq, state, base_tick=NO_BASE, base_state=None):
+    """Pack a snapshot, delta-encoded against base_state when given"""
+    mask = 0
+    body = []
+    for i, value in enumerate(state):
+        if base_state is None or base_state[i] != value:
+            mask |= 1 << i
+            body.append(FIELD_STRUCTS[i].pack(value))
+    if base_state is None:
+        base_tick = NO_BASE
+    header = SNAPSHOT_HEADER.pack(MSG_SNAPSHOT, tick, base_tick, ack_seq, mask)
+    return header + b''.join(body)
+
+
+def decode_snapshot(data, history):
+    """
+    Unpack a snapshot, filling unchanged fields from the base snapshot.
+
+    Args:
+        data: Datagram starting with SNAPSHOT_HEADER
+        history: dict of tick -> state tuple previously decoded by this client
+
+    Returns:
+        (tick, acked input seq, state tuple), or None if the base snapshot
+        is no longer known
+
+    Raises:
+        struct.error if the datagram is truncated, ValueError if a full
+        snapshot lacks fields or its state or winner is out of range
+    """
+    _, tick, base_tick, ack_seq, mask = SNAPSHOT_HEADER.unpack_from(data)
+    if base_tick == NO_BASE:
+        base = None
+        if mask != (1 << len(FIELDS)) - 1:
+            raise ValueError("Full snapshot without every field")
+    else:
+        base = history.get(base_tick)
+        if base is None:
+            return None
+
+    offset = SNAPSHOT_HEADER.size
+    values = []
+    for i, field in enumerate(FIELD_STRUCTS):
+        if mask & (1 << i):
+            values.append(field.unpack_from(data, offset)[0])
+            offset += field.size
+        else:
+            values.append(base[i])
+    if values[FIELD_INDEX['state']] >= len(STATES) or values[FIELD_INDEX['winner']] >= len(WINNERS):
+        raise ValueError("Snapshot state out of range")
+    return tick, ack_seq, tuple(values)
+
+
+def encode_input(newest_seq, ack_tick, inputs):
+    """Pack the newest inputs (oldest first, newest last)"""
+    inputs = inputs[-INPUT_REDUNDANCY:]
+    return INPUT_HEADER.pack(MSG_INPUT, newest_seq, ack_tick, len(inputs)) + bytes(inputs)
+
+
+def decode_input(data):
+    """Returns (newest seq, acked tick, list of (seq, bits) oldest first)"""
+    _, newest_seq, ack_tick, count = INPUT_HEADER.unpack_from(data)
+    bits = data[INPUT_HEADER.size:INPUT_HEADER.size + count]
+    first = newest_seq - len(bits) + 1
+    return newest_seq, ack_tick, [(first + i, b) for i, b in enumerate(bits)]
+
+
+class NetworkConditions:
+    """Artificial latency, jitter and packet loss for loopback testing"""
+    def __init__(self, latency=0.0, jitter=0.0, loss=0.0, seed=None):
+        self.latency = latency   # seconds, one way
+        self.jitter = jitter     # seconds, uniform +/-
+        self.loss = loss         # probability of dropping a datagram
+        self.rng = random.Random(seed)
+
+    def is_ideal(self):
+        return not (self.latency or self.jitter or self.loss)
+
+
+class SimulatedLink:
+    """
+    Wraps a datagram transport: applies NetworkConditions to every send and
+    counts bytes and packets for bandwidth reporting.
+    """
+    def __init__(self, transport, loop, conditions=None):
+        self.transport = transport
+        self.loop = loop
+        self.conditions = conditions or NetworkConditions()
+        self.bytes_sent = 0
+        self.packets_sent = 0
+        self.packets_dropped = 0
+
+    def sendto(self, data, addr=None):
+        self.bytes_sent += len(data)
+        self.packets_sent += 1
+        conditions = self.conditions
+        if conditions.is_ideal():
+            self.transport.sendto(data, addr)
+            return
+        if conditions.rng.random() < conditions.loss:
+            self.packets_dropped += 1
+            return
+        delay = conditions.latency + conditions.rng.uniform(-conditions.jitter, conditions.jitter)
+        self.loop.call_later(max(0.0, delay), self._deliver, data, addr)
+
+    def _deliver(self, data, addr):
+        if not self.transport.is_closing():
+            self.transport.sendto(data, addr)
+
+
+# Input bits a networked client sends (M only toggles local sound)
+NETWORK_KEYS = KEY_W | KEY_S | KEY_SPACE
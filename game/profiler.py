@@ -0,0 +1,142 @@
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+# Frame profiler
+#
+# Times each phase of a frame with perf_counter and keeps the last `window`
+# samples per phase for rolling p50/p95/p99. While disabled, clock() and
+# add() return immediately, so the instrumented loop costs two cheap method
+# calls per phase.
+
+PHASES = ('events', 'menu_events', 'input', 'update', 'render', 'present', 'frame')
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    """Rolling per-phase frame timings with an on-screen overlay"""
+    def __init__(self, enabled=False, window=600, refresh_interval=0.5):
+        self.enabled = enabled
+        self.show_overlay = enabled
+        self.window = window
+        self.refresh_interval = refresh_interval
+        self.samples = {phase: deque(maxlen=window) for phase in PHASES}
+        self.totals = {phase: [0, 0.0, 0.0] for phase in PHASES}  # count, sum, max
+
+        # Overlay is re-rendered a few times per second, not every frame
+        self.font = None
+        self.overlay = None
+        self.overlay_time = 0.0
+        self.drawn_rect = None   # Where the overlay was last drawn, if anywhere
+
+    def clock(self):
+        """Start timing a phase (0.0 when disabled)"""
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+    def add(self, phase, start):
+        """Record the time since start (from clock()) for a phase"""
+        if not self.enabled:
+            return
+        elapsed = time.perf_counter() - start
+        self.samples[phase].append(elapsed)
+        totals = self.totals[phase]
+        totals[0] += 1
+        totals[1] += elapsed
+        if elapsed > totals[2]:
+            totals[2] = elapsed
+
+    def toggle(self):
+        """Turn profiling and its overlay on or off"""
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+        self.overlay = None
+        return self.enabled
+
+    def percentiles(self, phase):
+        """Rolling (p50, p95, p99) for a phase in seconds"""
+        ordered = sorted(self.samples[phase])
+        if not ordered:
+            return (0.0,) * len(PERCENTILES)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(last * p / 100 + 0.5))] for p in PERCENTILES)
+
+    def stats(self):
+        """Summary for every phase that has samples"""
+        summary = {}
+        for phase in PHASES:
+            count, total, worst = self.totals[phase]
+            if not count:
+                continue
+            p50, p95, p99 = self.percentiles(phase)
+            summary[phase] = {
+                'count': count,
+                'mean_ms': total / count * 1000,
+                'p50_ms': p50 * 1000,
+                'p95_ms': p95 * 1000,
+                'p99_ms': p99 * 1000,
+                'max_ms': worst * 1000,
+            }
+        return summary
+
+    def draw(self, screen):
+        """
+        Draw the overlay in the top-right corner.
+
+        Returns:
+            The rect drawn (for dirty-rect presentation), or None
+        """
+        if not self.show_overlay:
+            self.drawn_rect = None
+            return None
+        now = time.perf_counter()
+        if self.overlay is None or now - self.overlay_time >= self.refresh_interval:
+            self.overlay = self._build_overlay()
+            self.overlay_time = now
+        rect = self.overlay.get_rect(topright=(screen.get_width() - 10, 10))
+        screen.blit(self.overlay, rect)
+        self.drawn_rect = rect
+        return rect
+
+    def _build_overlay(self):
+        """Render the current percentile table into one surface"""
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+        lines = ["phase        p50    p95    p99 ms"]
+        for phase, row in self.stats().items():
+            lines.append(f"{phase:<11}{row['p50_ms']:6.2f} {row['p95_ms']:6.2f} {row['p99_ms']:6.2f}")
+        line_height = self.font.get_linesize()
+        width = max(self.font.size(line)[0] for line in lines) + 12
+        surface = pygame.Surface((width, line_height * len(lines) + 8))
+        surface.fill((20, 20, 20))
+        for i, line in enumerate(lines):
+            surface.blit(self.font.render(line, True, (0, 255, 0)), (6, 4 + i * line_height))
+        return surface
+
+    def export(self, directory):
+        """
+        Write the summary as CSV and JSON files into directory.
+
+        Returns:
+            List of written paths (empty if nothing was recorded)
+        """
+        summary = self.stats()
+        if not summary:
+            return []
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, time.strftime("profile-%Y%m%d-%H%M%S"))
+
+        with open(base + ".json", "w") as f:
+            json.dump(summary, f, indent=2)
+        with open(base + ".csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            columns = ['count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms']
+            writer.writerow(['phase'] + columns)
+            for phase, row in summary.items():
+                writer.writerow([phase] + [round(row[column], 4) for column in columns])
+        return [base + ".csv", base + ".json"]
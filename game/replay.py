@@ -0,0 +1,208 @@
+import argparse
+import os
+import struct
+import time
+import zlib
+
+import pygame
+
+# Compact binary replays
+#
+# A series is fully determined by its seed, its settings and the player's
+# input on every tick, so a replay stores only those: a fixed header plus one
+# 4-bit input field per frame (two frames per byte), zlib-compressed.
+# Playback re-simulates the series headless as fast as the CPU allows.
+
+MAGIC = b'PPRP'
+VERSION = 1
+# magic, version, seed, best_of, winning_score, width, height,
+# ai_mode, ai_difficulty, ai_noise, ai_reaction_delay, frame count
+HEADER = struct.Struct('<4sBQBBHHBddHI')
+AI_MODES = ['reactive', 'predictive']
+
+# Input bitfield layout
+KEY_W = 1
+KEY_S = 2
+KEY_M = 4
+KEY_SPACE = 8
+KEY_BITS = {pygame.K_w: KEY_W, pygame.K_s: KEY_S, pygame.K_m: KEY_M, pygame.K_SPACE: KEY_SPACE}
+
+
+def encode_keys(keys):
+    """Pack the keys the game reads during a series into a 4-bit field"""
+    bits = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            bits |= bit
+    return bits
+
+
+class ReplayKeys:
+    """Pressed-key lookup backed by a recorded input bitfield"""
+    __slots__ = ('bits',)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    def __getitem__(self, key):
+        return bool(self.bits & KEY_BITS.get(key, 0))
+
+
+class Replay:
+    """Seed, settings and per-frame input of one recorded series"""
+    def __init__(self, seed, best_of, winning_score, width, height,
+                 ai_mode='reactive', ai_difficulty=0.8, ai_noise=0.0, ai_reaction_delay=0,
+                 inputs=None):
+        self.seed = seed
+        self.best_of = best_of
+        self.winning_score = winning_score
+        self.width = width
+        self.height = height
+        self.ai_mode = ai_mode
+        self.ai_difficulty = ai_difficulty
+        self.ai_noise = ai_noise
+        self.ai_reaction_delay = ai_reaction_delay
+        self.inputs = inputs if inputs is not None else bytearray()
+
+    def to_bytes(self):
+        """Serialize: header followed by compressed, nibble-packed inputs"""
+        inputs = self.inputs
+        packed = bytearray((len(inputs) + 1) // 2)
+        for i in range(0, len(inputs), 2):
+            high = inputs[i + 1] if i + 1 < len(inputs) else 0
+            packed[i // 2] = inputs[i] | (high << 4)
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.best_of, self.winning_score,
+                             self.width, self.height, AI_MODES.index(self.ai_mode),
+                             self.ai_difficulty, self.ai_noise, self.ai_reaction_delay,
+                             len(inputs))
+        return header + zlib.compress(bytes(packed), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        (magic, version, seed, best_of, winning_score, width, height, ai_mode,
+         ai_difficulty, ai_noise, ai_reaction_delay, frames) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a ping pong replay (or an unsupported version)")
+        packed = zlib.decompress(data[HEADER.size:])
+        inputs = bytearray(frames)
+        inputs[0::2] = bytes(byte & 0x0F for byte in packed[:(frames + 1) // 2])
+        inputs[1::2] = bytes(byte >> 4 for byte in packed[:frames // 2])
+        return cls(seed, best_of, winning_score, width, height, AI_MODES[ai_mode],
+                   ai_difficulty, ai_noise, ai_reaction_delay, inputs)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """Collects per-frame input while a series is being played"""
+    def __init__(self, seed, best_of, winning_score):
+        self.seed = seed
+        self.best_of = best_of
+        self.winning_score = winning_score
+        self.frames = bytearray()
+
+    def record(self, keys):
+        self.frames.append(encode_keys(keys))
+
+    def to_replay(self, engine):
+        """Build the Replay, taking geometry and AI settings from the engine"""
+        return Replay(self.seed, self.best_of, self.winning_score, engine.width, engine.height,
+                      engine.ai_mode, engine.ai_difficulty, engine.ai_noise,
+                      engine.ai_reaction_delay, bytearray(self.frames))
+
+    def save(self, engine, directory):
+        """Write the replay into directory and return its path"""
+        os.makedirs(directory, exist_ok=True)
+        name = time.strftime("replay-%Y%m%d-%H%M%S") + f"-{self.seed:016x}.ppr"
+        path = os.path.join(directory, name)
+        self.to_replay(engine).save(path)
+        return path
+
+
+class ReplayPlayer:
+    """Re-simulates a replay headless, with checkpoints for fast seeking"""
+    def __init__(self, replay, checkpoint_interval=600):
+        # Imported here because game_engine imports this module for recording
+        from .game_engine import GameEngine
+
+        self.replay = replay
+        self.checkpoint_interval = checkpoint_interval
+        self.keys = ReplayKeys()
+
+        engine = GameEngine(replay.width, replay.height, headless=True)
+        engine.winning_score = replay.winning_score
+        engine.ai_mode = replay.ai_mode
+        engine.ai_difficulty = replay.ai_difficulty
+        engine.ai_noise = replay.ai_noise
+        engine.ai_reaction_delay = replay.ai_reaction_delay
+        engine._start_series(replay.best_of, replay.seed)
+        self.engine = engine
+        self.frame = 0
+        self.checkpoints = {0: engine.snapshot()}
+
+    @property
+    def frame_count(self):
+        return len(self.replay.inputs)
+
+    def step(self):
+        """Advance one recorded frame; returns False at the end of the replay"""
+        if self.frame >= self.frame_count:
+            return False
+        self.keys.bits = self.replay.inputs[self.frame]
+        self.engine.step(self.keys)
+        self.frame += 1
+        if self.frame % self.checkpoint_interval == 0 and self.frame not in self.checkpoints:
+            self.checkpoints[self.frame] = self.engine.snapshot()
+        return True
+
+    def run(self, until=None):
+        """Play forward as fast as possible up to frame until (or the end)"""
+        until = self.frame_count if until is None else min(until, self.frame_count)
+        while self.frame < until:
+            self.step()
+        return self.engine
+
+    def seek(self, frame):
+        """Jump to any frame, resuming from the nearest earlier checkpoint"""
+        frame = max(0, min(frame, self.frame_count))
+        start = max(f for f in self.checkpoints if f <= frame)
+        if not (start <= self.frame <= frame):
+            self.engine.restore(self.checkpoints[start])
+            self.frame = start
+        return self.run(frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded ping pong series headless")
+    parser.add_argument("path", help="replay file (.ppr)")
+    parser.add_argument("--seek", type=int, help="show the state at this frame")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    size = os.path.getsize(args.path)
+    print(f"{args.path}: {len(replay.inputs)} frames, {size} bytes, best of {replay.best_of}, seed {replay.seed:016x}")
+
+    player = ReplayPlayer(replay)
+    start = time.perf_counter()
+    engine = player.run()
+    elapsed = time.perf_counter() - start
+    realtime = player.frame_count / 60
+    print(f"Final: {engine.state}, winner {engine.winner}, games "
+          f"{engine.player_games_won}-{engine.ai_games_won}, last game {engine.player_score}-{engine.ai_score}")
+    print(f"Re-simulated {realtime:.0f}s of play in {elapsed:.3f}s ({realtime / elapsed:.0f}x real time)")
+
+    if args.seek is not None:
+        engine = player.seek(args.seek)
+        print(f"Frame {player.frame}: ball ({engine.ball.x:.1f}, {engine.ball.y:.1f}) "
+              f"score {engine.player_score}-{engine.ai_score} state {engine.state}")
+
+
+if __name__ == "__main__":
+    main()
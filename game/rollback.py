@@ -0,0 +1,324 @@
+import argparse
+import random
+import statistics
+import time
+import zlib
+
+from . import state_codec
+from .game_engine import GameEngine
+from .netcode import INPUT_REDUNDANCY, advance, decode_input, encode_input
+from .replay import KEY_W, KEY_S, KEY_SPACE
+
+# Rollback netcode (GGPO style)
+#
+# Each peer runs the whole match locally. Its own input is applied at once;
+# the remote player's input is predicted (the last input we received is
+# repeated). When the real remote input for a frame arrives and differs from
+# the prediction, the engine is restored to the snapshot taken before that
+# frame and every frame since is simulated again with the corrected input.
+# A peer that gets more than max_rollback frames ahead of the last confirmed
+# remote input stalls until the remote catches up.
+#
+# Input packets carry every local input the remote has not acknowledged yet
+# (oldest first, INPUT_REDUNDANCY at most) and, as the ack, the next remote
+# frame we are waiting for, so 0 means nothing has been confirmed. Peers
+# compare a CRC-32 of each confirmed frame's state_codec record; random
+# streams are not part of it, but a desync in them moves the next serve.
+
+FRAME_BUDGET = 1.0 / 60
+CHECKSUM_HISTORY = 600
+
+
+class RollbackSession:
+    """Rollback simulation for one peer of a two-player match"""
+    def __init__(self, engine, local_slot, best_of=3, max_rollback=8, input_delay=0):
+        self.engine = engine
+        self.local_slot = local_slot
+        self.best_of = best_of
+        self.max_rollback = max_rollback
+        self.input_delay = input_delay
+
+        self.frame = 0              # Next frame to simulate
+        self.local_inputs = {}      # frame -> bits
+        self.remote_inputs = {}     # frame -> bits (confirmed)
+        self.predicted = {}         # frame -> remote bits guessed while it was unconfirmed
+        self.confirmed_frame = -1   # Remote input is known for every frame up to here
+        self.remote_ack = -1        # Newest of our frames the remote has confirmed
+        self.rollback_frame = None  # Earliest frame simulated with a wrong guess
+        self.snapshots = {}         # frame -> (snapshot taken before simulating it, its CRC)
+        self.checksums = {}         # frame -> CRC of its final (confirmed) state
+        self.record = bytearray(state_codec.STATE_SIZE)
+
+        # Stats
+        self.rollbacks = 0
+        self.rollback_frames = 0
+        self.deepest_rollback = 0
+        self.stalls = 0
+        self.stall_run = 0          # Frames stalled in a row so far
+        self.longest_stall = 0
+
+    def add_local_input(self, bits):
+        """Queue this frame's local input (applied input_delay frames later)"""
+        frame = self.frame + self.input_delay
+        # While stalled the frame does not move on; keep the first input given
+        self.local_inputs.setdefault(frame, bits)
+        return frame
+
+    def add_remote_input(self, frame, bits):
+        """Record the remote player's real input for a frame"""
+        if frame <= self.confirmed_frame or frame in self.remote_inputs:
+            return
+        self.remote_inputs[frame] = bits
+        guess = self.predicted.pop(frame, None)
+        if guess is not None and guess != bits:
+            if self.rollback_frame is None or frame < self.rollback_frame:
+                self.rollback_frame = frame
+        while self.confirmed_frame + 1 in self.remote_inputs:
+            self.confirmed_frame += 1
+
+    def _remote_bits(self, frame):
+        bits = self.remote_inputs.get(frame)
+        if bits is None:
+            # Predict: the remote keeps holding whatever it held last
+            bits = self.remote_inputs.get(self.confirmed_frame, 0)
+            self.predicted[frame] = bits
+        return bits
+
+    def _simulate(self, frame):
+        self.snapshots[frame] = (self.engine.snapshot(), checksum(self.engine, self.record))
+        local = self.local_inputs.get(frame, 0)
+        remote = self._remote_bits(frame)
+        if self.local_slot == 0:
+            advance(self.engine, local, remote, self.best_of)
+        else:
+            advance(self.engine, remote, local, self.best_of)
+
+    def _rollback(self):
+        """Restore the first mispredicted frame and re-simulate up to now"""
+        start, end = self.rollback_frame, self.frame
+        self.rollback_frame = None
+        sound = self.engine.sound_manager
+        enabled, sound.enabled = sound.enabled, False  # Sounds already played once
+        self.engine.restore(self.snapshots[start][0])
+        for frame in range(start, end):
+            self._simulate(frame)
+        sound.enabled = enabled
+        self.rollbacks += 1
+        self.rollback_frames += end - start
+        self.deepest_rollback = max(self.deepest_rollback, end - start)
+
+    def advance_frame(self):
+        """
+        Correct any misprediction, then simulate the next frame.
+
+        Returns:
+            False if the session stalled waiting for remote input
+        """
+        if self.rollback_frame is not None:
+            self._rollback()
+        if self.frame - self.confirmed_frame > self.max_rollback:
+            self.stalls += 1
+            self.stall_run += 1
+            self.longest_stall = max(self.longest_stall, self.stall_run)
+            return False
+        self.stall_run = 0
+        self._simulate(self.frame)
+        self.frame += 1
+        self._prune()
+        return True
+
+    def _prune(self):
+        """Drop state that can no longer be rolled back to"""
+        for frame in [f for f in self.snapshots if f <= self.confirmed_frame]:
+            # Every input before this frame is final, so is its state
+            self.checksums[frame] = self.snapshots.pop(frame)[1]
+            self.checksums.pop(frame - CHECKSUM_HISTORY, None)
+            self.remote_inputs.pop(frame - 1, None)
+        # Inputs the remote has acknowledged are never sent again, and
+        # confirmed frames we have simulated are never simulated again
+        done = min(self.remote_ack, self.confirmed_frame, self.frame - 1)
+        for frame in [f for f in self.local_inputs if f <= done]:
+            del self.local_inputs[frame]
+
+    def input_packet(self):
+        """Input datagram: our unacknowledged inputs plus our own ack"""
+        first = self.remote_ack + 1
+        last = min(max(self.local_inputs, default=first - 1), first + INPUT_REDUNDANCY - 1)
+        inputs = [self.local_inputs.get(frame, 0) for frame in range(first, last + 1)]
+        return encode_input(last, self.confirmed_frame + 1, inputs)
+
+    def receive_packet(self, data):
+        newest, ack, inputs = decode_input(data)
+        self.remote_ack = max(self.remote_ack, ack - 1)   # ack is the next frame it needs
+        for frame, bits in inputs:
+            self.add_remote_input(frame, bits)
+
+
+def checksum(engine, record):
+    """CRC-32 of the engine's state, packed into record"""
+    state_codec.pack_into(engine, record)
+    return zlib.crc32(record)
+
+
+class DelayedChannel:
+    """One-way datagram queue with latency, jitter and loss counted in frames"""
+    def __init__(self, delay, jitter=0, loss=0.0, seed=None):
+        self.delay = delay
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.queue = []   # (deliver frame, data)
+
+    def send(self, now, data):
+        if self.rng.random() < self.loss:
+            return
+        self.queue.append((now + self.delay + self.rng.randint(-self.jitter, self.jitter), data))
+
+    def receive(self, now):
+        due = [data for when, data in self.queue if when <= now]
+        self.queue = [(when, data) for when, data in self.queue if when > now]
+        return due
+
+
+def bot_input(engine, slot, rng, hesitation=0.1):
+    """Chase the ball with the paddle; hesitate sometimes so predictions miss"""
+    if engine.state != 'playing':
+        return KEY_SPACE if rng.random() < 0.05 else 0
+    paddle = engine.player if slot == 0 else engine.ai
+    offset = (engine.ball.y + engine.ball.height / 2) - (paddle.y + paddle.height / 2)
+    if rng.random() < hesitation or abs(offset) < 15:
+        return 0
+    return KEY_S if offset > 0 else KEY_W
+
+
+def run_harness(frames=3600, delay=5, jitter=2, loss=0.05, max_rollback=8, input_delay=1,
+                best_of=3, seed=0, hesitation=0.1, max_stall=60, require_restart=False):
+    """
+    Run two peers in one process through DelayedChannels, then check that
+    both agree on every confirmed frame and match a plain simulation of the
+    same inputs, and that neither stalled more than max_stall frames in a
+    row. With require_restart the inputs must also have scored a point,
+    finished a game and continued with SPACE.
+    """
+    rng = random.Random(seed)
+    peers = []
+    for slot in (0, 1):
+        engine = GameEngine(800, 600, headless=True, seed=seed)
+        engine.ai_mode = 'remote'
+        peers.append(RollbackSession(engine, slot, best_of, max_rollback, input_delay))
+    channels = [DelayedChannel(delay, jitter, loss, seed=seed * 2 + i) for i in (0, 1)]
+    history = [{}, {}]   # slot -> every local input given, for the reference run
+    timings = []
+    compared = 0         # Frames 0..compared-1 were checked on both peers
+    desyncs = []
+
+    for now in range(frames):
+        for slot, peer in enumerate(peers):
+            for data in channels[1 - slot].receive(now):
+                peer.receive_packet(data)
+            frame = peer.add_local_input(bot_input(peer.engine, slot, rng, hesitation))
+            history[slot].setdefault(frame, peer.local_inputs[frame])
+            start = time.perf_counter()
+            peer.advance_frame()
+            timings.append(time.perf_counter() - start)
+            channels[slot].send(now, peer.input_packet())
+
+        # Both peers must agree on every frame as soon as both confirmed it
+        # (checksums only stay around for CHECKSUM_HISTORY frames)
+        first, second = peers[0].checksums, peers[1].checksums
+        while compared in first and compared in second:
+            if first[compared] != second[compared]:
+                desyncs.append(compared)
+            compared += 1
+
+    # ...and match a simulation that knew every input up front
+    check = max(compared - 1, 0)
+    reference = GameEngine(800, 600, headless=True, seed=seed)
+    reference.ai_mode = 'remote'
+    points = games_over = restarts = 0
+    for frame in range(check):
+        state, score = reference.state, reference.player_score + reference.ai_score
+        advance(reference, history[0].get(frame, 0), history[1].get(frame, 0), best_of)
+        points += reference.player_score + reference.ai_score > score
+        if reference.state != state:
+            games_over += reference.state in ('game_over', 'series_over')
+            restarts += state in ('game_over', 'series_over')
+    reference_ok = checksum(reference, bytearray(state_codec.STATE_SIZE)) == peers[0].checksums.get(check)
+
+    print(f"{frames} frames, delay {delay}±{jitter} frames, loss {loss:.0%}, "
+          f"input delay {input_delay}, max rollback {max_rollback}")
+    for slot, peer in enumerate(peers):
+        engine = peer.engine
+        print(f"Peer {slot}: frame {peer.frame}, rollbacks {peer.rollbacks} "
+              f"({peer.rollback_frames} frames re-simulated, deepest {peer.deepest_rollback}), "
+              f"stalls {peer.stalls} (longest {peer.longest_stall}), "
+              f"games {engine.player_games_won}-{engine.ai_games_won}, "
+              f"score {engine.player_score}-{engine.ai_score}")
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"advance_frame: median {statistics.median(timings) * 1e6:.1f} us, p99 {p99 * 1e6:.1f} us, "
+          f"max {timings[-1] * 1e6:.1f} us (budget {FRAME_BUDGET * 1e3:.1f} ms)")
+    print(f"Checked {compared} confirmed frames: {len(desyncs)} desyncs, "
+          f"reference match at frame {check}: {'yes' if reference_ok else 'NO'}")
+    print(f"Confirmed play: {points} points, {games_over} games over, {restarts} restarts")
+    stuck = [slot for slot, peer in enumerate(peers) if peer.longest_stall > max_stall]
+    if stuck:
+        print(f"Peer {', '.join(map(str, stuck))} stopped advancing "
+              f"(more than {max_stall} frames stalled in a row)")
+    played = not require_restart or points > 0 and games_over > 0 and restarts > 0
+    if not played:
+        print("Scenario did not score, finish a game and restart with SPACE")
+    return compared > 0 and not desyncs and reference_ok and not stuck and played
+
+
+def measure_worst_case(depth=8, repeats=2000, seed=0):
+    """Time restoring a snapshot and re-simulating depth frames"""
+    engine = GameEngine(800, 600, headless=True, seed=seed)
+    engine.ai_mode = 'remote'
+    for _ in range(120):
+        advance(engine, 0, 0)
+    record = bytearray(state_codec.STATE_SIZE)
+    samples = []
+    for _ in range(repeats):
+        snapshot = engine.snapshot()
+        start = time.perf_counter()
+        engine.restore(snapshot)
+        for _ in range(depth):
+            engine.snapshot()
+            checksum(engine, record)
+            advance(engine, 1, 2)
+        samples.append(time.perf_counter() - start)
+        engine.restore(snapshot)
+    samples.sort()
+    print(f"{depth}-frame rollback: median {statistics.median(samples) * 1e6:.1f} us, "
+          f"max {samples[-1] * 1e6:.1f} us ({samples[-1] / FRAME_BUDGET:.1%} of a 60 Hz frame)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Two-peer rollback harness with simulated delay")
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--delay", type=int, default=5, help="one-way latency in frames")
+    parser.add_argument("--jitter", type=int, default=2, help="latency jitter in frames")
+    parser.add_argument("--loss", type=float, default=0.05, help="packet loss (0.0 - 1.0)")
+    parser.add_argument("--max-rollback", type=int, default=8)
+    parser.add_argument("--input-delay", type=int, default=1)
+    parser.add_argument("--max-stall", type=int, default=60,
+                        help="fail if a peer stalls more frames than this in a row")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ok = run_harness(args.frames, args.delay, args.jitter, args.loss, args.max_rollback,
+                     args.input_delay, seed=args.seed, max_stall=args.max_stall)
+    # Hesitant bots let points through, so the same conditions also cover
+    # scoring, game over and SPACE to continue
+    print("\nScoring scenario:")
+    ok = run_harness(3000, args.delay, args.jitter, args.loss, args.max_rollback, args.input_delay,
+                     seed=args.seed, hesitation=0.7, max_stall=args.max_stall,
+                     require_restart=True) and ok
+    measure_worst_case(args.max_rollback, seed=args.seed)
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
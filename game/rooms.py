@@ -0,0 +1,453 @@
+import argparse
+import itertools
+import os
+import random
+import statistics
+import time
+from collections import deque
+from multiprocessing import Pipe, Process
+
+from .game_engine import GameEngine
+from .netcode import advance, capture_state
+from .tournament import AIConfig
+
+# Multi-room match hosting
+#
+# A RoomScheduler owns many headless GameEngines and ticks all of them in one
+# fixed-rate loop, timing every room. A RoomPool runs one scheduler per
+# worker process, places new rooms on the least loaded worker and moves rooms
+# between workers (room spec + engine snapshot + held input and metrics) when
+# their loads drift apart.
+
+WIDTH, HEIGHT = 800, 600
+
+
+def percentile(ordered, p):
+    """p-th percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    last = len(ordered) - 1
+    return ordered[min(last, int(last * p / 100 + 0.5))]
+
+
+class Room:
+    """
+    One hosted match.
+
+    'ai' rooms play AI against AI (left/right are AIConfig strings) and start
+    a new series when one ends. 'remote' rooms are driven by player input
+    bits through set_input(), like the UDP server.
+    """
+    def __init__(self, room_id, kind='ai', left='reactive:0.8', right='predictive:25:6',
+                 best_of=3, seed=None, window=600):
+        self.room_id = room_id
+        self.kind = kind
+        self.left_label = left
+        self.right_label = right
+        self.best_of = best_of
+        self.seed = seed
+
+        self.engine = GameEngine(WIDTH, HEIGHT, headless=True, seed=seed)
+        self.engine.sound_manager.enabled = False
+        if kind == 'ai':
+            self.left = AIConfig.parse(left)
+            AIConfig.parse(right).apply_to_engine(self.engine)
+            self.engine._start_series(best_of)
+        else:
+            self.engine.ai_mode = 'remote'
+        self.bits = [0, 0]
+
+        # Metrics
+        self.tick_times = deque(maxlen=window)
+        self.ticks = 0
+        self.series_played = 0
+
+    def spec(self):
+        """Constructor arguments, for moving the room to another worker"""
+        return {'kind': self.kind, 'left': self.left_label, 'right': self.right_label,
+                'best_of': self.best_of, 'seed': self.seed}
+
+    def carried(self):
+        """Held input and metrics, which a moved room keeps on its new worker"""
+        return {'bits': list(self.bits), 'tick_times': list(self.tick_times),
+                'ticks': self.ticks, 'series_played': self.series_played}
+
+    def carry_over(self, carried):
+        self.bits = list(carried['bits'])
+        self.tick_times.extend(carried['tick_times'])
+        self.ticks = carried['ticks']
+        self.series_played = carried['series_played']
+
+    def set_input(self, slot, bits):
+        """Held input bits for a player of a 'remote' room"""
+        self.bits[slot] = bits
+
+    def tick(self):
+        engine = self.engine
+        if self.kind == 'ai':
+            engine.player.prev_y = engine.player.y
+            engine.ai.prev_y = engine.ai.y
+            self.left.move_player(engine)
+            engine.update()
+            if engine.state == 'game_over':
+                engine._next_game()
+            elif engine.state == 'series_over':
+                self.series_played += 1
+                engine._start_series(self.best_of)
+        else:
+            advance(engine, self.bits[0], self.bits[1], self.best_of)
+        self.ticks += 1
+
+    def metrics(self):
+        ordered = sorted(self.tick_times)
+        return {
+            'ticks': self.ticks,
+            'series_played': self.series_played,
+            'p50_us': percentile(ordered, 50) * 1e6,
+            'p99_us': percentile(ordered, 99) * 1e6,
+            'max_us': (ordered[-1] if ordered else 0.0) * 1e6,
+        }
+
+
+class RoomScheduler:
+    """Ticks many rooms in one fixed-rate loop"""
+    def __init__(self, tick_rate=60, capacity=None, window=600):
+        self.tick_rate = tick_rate
+        self.tick_duration = 1.0 / tick_rate
+        self.capacity = capacity
+        self.window = window
+        self.rooms = {}   # room_id -> Room
+
+        # Metrics for whole batches (one tick of every room)
+        self.batch_times = deque(maxlen=window)
+        self.ticks = 0
+        self.overruns = 0       # Batches that took longer than a tick
+        self.skipped = 0        # Ticks dropped because the loop fell behind
+
+    def admit(self, room_id, spec, snapshot=None, carried=None):
+        """Create a room (restoring a migrated snapshot and state); False when full"""
+        if room_id in self.rooms or (self.capacity is not None and len(self.rooms) >= self.capacity):
+            return False
+        room = Room(room_id, window=self.window, **spec)
+        if snapshot is not None:
+            room.engine.restore(snapshot)
+        if carried is not None:
+            room.carry_over(carried)
+        self.rooms[room_id] = room
+        return True
+
+    def evict(self, room_id):
+        """Remove a room; returns (spec, snapshot, carried) so it can be re-admitted elsewhere"""
+        room = self.rooms.pop(room_id, None)
+        if room is None:
+            return None
+        return room.spec(), room.engine.snapshot(), room.carried()
+
+    def tick(self):
+        """Advance every room by one tick, timing each"""
+        clock = time.perf_counter
+        batch_start = clock()
+        for room in self.rooms.values():
+            start = clock()
+            room.tick()
+            room.tick_times.append(clock() - start)
+        elapsed = clock() - batch_start
+        self.batch_times.append(elapsed)
+        self.ticks += 1
+        if elapsed > self.tick_duration:
+            self.overruns += 1
+
+    def load(self):
+        """Mean share of the tick budget spent ticking rooms (1.0 = saturated)"""
+        if not self.batch_times:
+            return 0.0
+        return statistics.fmean(self.batch_times) / self.tick_duration
+
+    def metrics(self, per_room=True):
+        ordered = sorted(self.batch_times)
+        result = {
+            'rooms': len(self.rooms),
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'load': self.load(),
+            'batch_p50_ms': percentile(ordered, 50) * 1e3,
+            'batch_p99_ms': percentile(ordered, 99) * 1e3,
+        }
+        if per_room:
+            result['room_metrics'] = {room_id: room.metrics() for room_id, room in self.rooms.items()}
+        return result
+
+    def run(self, duration=None, poll=None):
+        """
+        Tick at tick_rate until duration passes or poll() returns False.
+        poll is called once per tick (workers read their commands there).
+        """
+        start = time.perf_counter()
+        next_tick = start
+        while duration is None or time.perf_counter() - start < duration:
+            self.tick()
+            if poll is not None and poll() is False:
+                return
+            next_tick += self.tick_duration
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif -delay > self.tick_duration:
+                # More than a whole tick behind: drop ticks instead of bursting
+                missed = int(-delay / self.tick_duration)
+                self.skipped += missed
+                next_tick += missed * self.tick_duration
+
+
+def worker_main(conn, tick_rate, capacity):
+    """Worker process: run a RoomScheduler and serve commands from the pool"""
+    scheduler = RoomScheduler(tick_rate, capacity)
+
+    def poll():
+        while conn.poll():
+            command, *args = conn.recv()
+            if command == 'stop':
+                return False
+            if command == 'input':
+                room = scheduler.rooms.get(args[0])
+                if room is not None:
+                    room.set_input(args[1], args[2])
+            elif command == 'admit':
+                conn.send(scheduler.admit(*args))
+            elif command == 'evict':
+                conn.send(scheduler.evict(*args))
+            elif command == 'state':
+                room = scheduler.rooms.get(args[0])
+                conn.send(capture_state(room.engine) if room is not None else None)
+            elif command == 'metrics':
+                conn.send(scheduler.metrics(*args))
+        return True
+
+    scheduler.run(poll=poll)
+    conn.close()
+
+
+class RoomPool:
+    """Spreads rooms over worker processes and keeps their load balanced"""
+    def __init__(self, workers=None, tick_rate=60, capacity=None):
+        self.tick_rate = tick_rate
+        self.connections = []
+        self.processes = []
+        for _ in range(workers or os.cpu_count()):
+            parent, child = Pipe()
+            process = Process(target=worker_main, args=(child, tick_rate, capacity), daemon=True)
+            process.start()
+            self.connections.append(parent)
+            self.processes.append(process)
+        self.placement = {}   # room_id -> worker index
+        self.room_ids = itertools.count()
+
+    def _call(self, worker, *message):
+        self.connections[worker].send(message)
+        return self.connections[worker].recv()
+
+    def _room_counts(self):
+        counts = [0] * len(self.connections)
+        for worker in self.placement.values():
+            counts[worker] += 1
+        return counts
+
+    def admit(self, spec, room_id=None):
+        """Place a new room on the emptiest worker; returns its id, or None if every worker is full"""
+        if room_id is None:
+            room_id = next(self.room_ids)
+        counts = self._room_counts()
+        for worker in sorted(range(len(counts)), key=counts.__getitem__):
+            if self._call(worker, 'admit', room_id, spec):
+                self.placement[room_id] = worker
+                return room_id
+        return None
+
+    def evict(self, room_id):
+        worker = self.placement.pop(room_id, None)
+        if worker is None:
+            return None
+        return self._call(worker, 'evict', room_id)
+
+    def set_input(self, room_id, slot, bits):
+        self.connections[self.placement[room_id]].send(('input', room_id, slot, bits))
+
+    def state(self, room_id):
+        return self._call(self.placement[room_id], 'state', room_id)
+
+    def metrics(self, per_room=False):
+        """One scheduler metrics dict per worker"""
+        return [self._call(worker, 'metrics', per_room) for worker in range(len(self.connections))]
+
+    def rebalance(self, tolerance=0.1):
+        """
+        Move rooms from the busiest to the least busy worker until their
+        loads are within tolerance x the mean worker load. Returns the
+        number of rooms moved.
+        """
+        metrics = self.metrics(per_room=True)
+        loads = [m['load'] for m in metrics]
+        limit = tolerance * statistics.fmean(loads)
+        costs = {}   # room_id -> share of a tick it takes
+        for m in metrics:
+            for room_id, room in m['room_metrics'].items():
+                costs[room_id] = room['p50_us'] / 1e6 * self.tick_rate
+        moved = 0
+        while True:
+            busiest = max(range(len(loads)), key=loads.__getitem__)
+            idlest = min(range(len(loads)), key=loads.__getitem__)
+            gap = loads[busiest] - loads[idlest]
+            candidates = [r for r, w in self.placement.items() if w == busiest and costs.get(r, 0) < gap]
+            if gap <= limit or not candidates:
+                return moved
+            room_id = max(candidates, key=lambda r: costs.get(r, 0))
+            moving = self._call(busiest, 'evict', room_id)
+            if not self._call(idlest, 'admit', room_id, *moving):
+                self._call(busiest, 'admit', room_id, *moving)
+                return moved
+            self.placement[room_id] = idlest
+            loads[busiest] -= costs[room_id]
+            loads[idlest] += costs[room_id]
+            moved += 1
+
+    def close(self):
+        for connection in self.connections:
+            connection.send(('stop',))
+        for process in self.processes:
+            process.join(timeout=5)
+
+
+def room_spec(index, seed=0):
+    """Spec for the index-th load-test room (alternating AI matchups)"""
+    left, right = [('reactive:0.8', 'predictive:25:6'), ('predictive:40:10', 'reactive:0.9')][index % 2]
+    return {'kind': 'ai', 'left': left, 'right': right, 'best_of': 5,
+            'seed': random.Random(f"{seed}:room:{index}").getrandbits(64)}
+
+
+def sustains(rooms, ticks=180, tick_rate=60, headroom=0.8):
+    """
+    Tick `rooms` AI rooms back to back and check that the mean batch fits in
+    headroom x the tick budget and the p99 batch in the whole budget.
+    Returns (ok, p99 seconds).
+    """
+    scheduler = RoomScheduler(tick_rate, window=ticks)
+    for i in range(rooms):
+        scheduler.admit(i, room_spec(i))
+    for _ in range(30):
+        scheduler.tick()  # Warm up
+    scheduler.batch_times.clear()
+    for _ in range(ticks):
+        scheduler.tick()
+    p99 = percentile(sorted(scheduler.batch_times), 99)
+    return scheduler.load() <= headroom and p99 <= 1.0 / tick_rate, p99
+
+
+def check_migration(ticks=30, seed=0):
+    """Move a remote room with held input between schedulers; it must keep its input and metrics"""
+    source, target = RoomScheduler(), RoomScheduler()
+    source.admit(0, {'kind': 'remote', 'seed': seed})
+    source.rooms[0].set_input(0, 1)
+    for _ in range(ticks):
+        source.tick()
+    before = source.rooms[0]
+    expected = (list(before.bits), len(before.tick_times), before.ticks, before.engine.snapshot())
+    target.admit(0, *source.evict(0))
+    after = target.rooms[0]
+    moved = (after.bits, len(after.tick_times), after.ticks, after.engine.snapshot())
+    ok = moved == expected
+    print(f"Migration: bits {expected[0]} -> {moved[0]}, tick_times {expected[1]} -> {moved[1]}, "
+          f"ticks {expected[2]} -> {moved[2]}, engine state {'kept' if moved[3] == expected[3] else 'changed'}")
+    return ok
+
+
+def measure_capacity(tick_rate=60, headroom=0.8, verify_seconds=3.0):
+    """Find how many AI rooms one core can tick at tick_rate, then verify in real time"""
+    rooms = 64
+    while True:
+        ok, p99 = sustains(rooms, tick_rate=tick_rate, headroom=headroom)
+        print(f"  {rooms:6d} rooms: p99 batch {p99 * 1e3:6.2f} ms {'ok' if ok else 'over budget'}")
+        if not ok:
+            break
+        rooms *= 2
+    low, high = rooms // 2, rooms
+    while high - low > max(8, low // 32):
+        middle = (low + high) // 2
+        ok, p99 = sustains(middle, tick_rate=tick_rate, headroom=headroom)
+        print(f"  {middle:6d} rooms: p99 batch {p99 * 1e3:6.2f} ms {'ok' if ok else 'over budget'}")
+        if ok:
+            low = middle
+        else:
+            high = middle
+
+    # Real-time run at the found capacity
+    scheduler = RoomScheduler(tick_rate)
+    for i in range(low):
+        scheduler.admit(i, room_spec(i))
+    scheduler.run(verify_seconds)
+    metrics = scheduler.metrics()
+    rooms = metrics['room_metrics'].values()
+    print(f"One core sustains {low} rooms at {tick_rate} Hz "
+          f"(mean batch within {headroom:.0%} of the {1e3 / tick_rate:.1f} ms tick)")
+    print(f"Real-time check, {verify_seconds:.0f}s: {metrics['ticks']} ticks, {metrics['overruns']} overruns, "
+          f"{metrics['skipped']} skipped, load {metrics['load']:.0%}, "
+          f"batch p99 {metrics['batch_p99_ms']:.2f} ms")
+    print(f"Per-room tick: median p50 {statistics.median(r['p50_us'] for r in rooms):.1f} us, "
+          f"worst p99 {max(r['p99_us'] for r in rooms):.1f} us")
+    return low
+
+
+def pool_test(workers, rooms, seconds, tick_rate=60):
+    """
+    Spread rooms over worker processes, unbalance them, then rebalance.
+    Returns False if rebalancing moved no rooms or left the room counts as
+    far apart as before.
+    """
+    pool = RoomPool(workers, tick_rate)
+    try:
+        ids = [pool.admit(room_spec(i)) for i in range(rooms)]
+        # Evict most rooms outside worker 0 to skew the load
+        others = [r for r in ids if pool.placement[r] != 0]
+        for room_id in others[:len(others) * 4 // 5]:
+            pool.evict(room_id)
+        time.sleep(seconds / 2)
+        before = pool.metrics()
+        moved = pool.rebalance()
+        time.sleep(seconds / 2)
+        after = pool.metrics()
+        for worker, (b, a) in enumerate(zip(before, after)):
+            print(f"Worker {worker}: {b['rooms']:5d} -> {a['rooms']:5d} rooms, load {b['load']:.0%} -> "
+                  f"{a['load']:.0%}, overruns {a['overruns']}, batch p99 {a['batch_p99_ms']:.2f} ms")
+        print(f"Rebalance moved {moved} rooms")
+    finally:
+        pool.close()
+    spread_before = max(b['rooms'] for b in before) - min(b['rooms'] for b in before)
+    spread_after = max(a['rooms'] for a in after) - min(a['rooms'] for a in after)
+    if moved == 0 or spread_after >= spread_before:
+        print("Rebalance did not even out the unbalanced pool")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-room headless match server")
+    parser.add_argument("--tick-rate", type=int, default=60)
+    parser.add_argument("--headroom", type=float, default=0.8,
+                        help="share of the tick a batch may use on average to count as sustained")
+    parser.add_argument("--workers", type=int, help="also run a pool test with this many worker processes")
+    parser.add_argument("--rooms", type=int, default=1000, help="rooms for the pool test")
+    parser.add_argument("--seconds", type=float, default=4.0, help="pool test duration")
+    args = parser.parse_args()
+
+    if not check_migration():
+        raise SystemExit(1)
+    print("\nSingle-core load test (AI vs AI rooms):")
+    measure_capacity(args.tick_rate, args.headroom)
+    if args.workers:
+        print(f"\nPool test: {args.rooms} rooms on {args.workers} workers")
+        if not pool_test(args.workers, args.rooms, args.seconds, args.tick_rate):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import random
+import statistics
+
+import pygame
+
+from .game_engine import GameEngine
+from .replay import KEY_S, KEY_W, ReplayKeys, encode_keys
+
+# Run-ahead input latency reduction
+#
+# Rendering shows the last tick blended with the one before it, and a key
+# press only reaches the simulation at the next tick, so a press takes at
+# least a tick (often two) to show up on screen. With run-ahead the
+# engine is snapshotted before each render, stepped `frames` ticks further
+# with the keys held right now, drawn, and restored, so what is shown is
+# where the game will be if the input stays the same. Only the movement keys
+# are held during speculative ticks (one-shot keys such as M, SPACE or ESC
+# would act on a state that is thrown away), and those ticks are silent,
+# unprofiled and never recorded in replays or telemetry.
+#
+# The CLI simulates main.py's loop on a virtual clock and measures the time
+# from pressing W to the first frame in which the paddle is drawn higher at
+# all, and to the first frame that shows the paddle's whole first move.
+
+WIDTH, HEIGHT = 800, 600
+TICK_RATE = 60
+PADDLE_STEP = 10   # Pixels the paddle moves per tick while W is held
+MOVEMENT_KEYS = KEY_W | KEY_S
+
+
+class RunAhead:
+    """Shows the game a few ticks ahead of the real simulation"""
+    def __init__(self, engine, frames=1):
+        self.engine = engine
+        self.frames = frames
+        self.saved = None
+        self.keys = ReplayKeys()   # Movement keys held during speculative ticks
+
+    def begin(self, keys=None):
+        """Step ahead with the current input; call end() once the frame is drawn"""
+        engine = self.engine
+        if not self.frames or engine.state != 'playing':
+            return
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        self.keys.bits = encode_keys(keys) & MOVEMENT_KEYS
+        self.saved = engine.snapshot()
+        sound, profiler = engine.sound_manager, engine.profiler
+        enabled, sound.enabled = sound.enabled, False
+        profiling, profiler.enabled = profiler.enabled, False
+        recorder, engine.replay_recorder = engine.replay_recorder, None
+        telemetry, engine.telemetry = engine.telemetry, None
+        for _ in range(self.frames):
+            engine.step(self.keys)
+        engine.telemetry = telemetry
+        engine.replay_recorder = recorder
+        profiler.enabled = profiling
+        sound.enabled = enabled
+
+    def end(self):
+        """Go back to the real state"""
+        if self.saved is not None:
+            self.engine.restore(self.saved)
+            self.saved = None
+
+
+def measure(run_ahead, render_fps, trials=500, seed=0):
+    """
+    Press W at random moments while main.py's loop runs on a virtual clock.
+
+    Returns:
+        (delays to the first visible movement, delays to the whole first
+        move) in seconds, excluding the display's own scan-out, which is the
+        same in every mode
+    """
+    rng = random.Random(seed)
+    tick = 1.0 / TICK_RATE
+    frame = 1.0 / render_fps
+    first, full = [], []
+    for trial in range(trials):
+        engine = GameEngine(WIDTH, HEIGHT, headless=True, seed=trial)
+        engine._start_series(3)
+        ahead = RunAhead(engine, run_ahead)
+        rest = engine.player.y
+        keys = ReplayKeys()
+        press = rng.uniform(0.1, 0.2)
+        now = rng.uniform(0, frame)
+        previous = accumulator = 0.0
+        while True:
+            accumulator += now - previous
+            previous = now
+            while accumulator >= tick:
+                keys.bits = KEY_W if now >= press else 0
+                engine.step(keys)
+                accumulator -= tick
+            keys.bits = KEY_W if now >= press else 0
+            ahead.begin(keys)
+            shown = engine._interpolated_paddle_rect(engine.player, accumulator / tick)
+            ahead.end()
+            if shown.y < int(rest) and len(first) == trial:
+                first.append(now - press)
+            if shown.y <= int(rest) - PADDLE_STEP:
+                full.append(now - press)
+                break
+            now += frame
+    return first, full
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless input-to-display latency with run-ahead")
+    parser.add_argument("--frames", type=int, nargs="+", default=[0, 1, 2], help="run-ahead ticks")
+    parser.add_argument("--fps", type=int, nargs="+", default=[60, 144], help="render rates")
+    parser.add_argument("--trials", type=int, default=500)
+    args = parser.parse_args()
+
+    print("Press-to-display latency in ms (mean / p95)")
+    print(f"{'fps':>4} {'ahead':>5} {'first pixel':>15} {'whole first move':>18}")
+    for fps in args.fps:
+        for frames in args.frames:
+            columns = []
+            for delays in measure(frames, fps, args.trials):
+                delays.sort()
+                p95 = delays[int(len(delays) * 0.95)]
+                columns.append(f"{statistics.mean(delays) * 1e3:.1f} / {p95 * 1e3:.1f}")
+            print(f"{fps:4} {frames:5} {columns[0]:>15} {columns[1]:>18}")
+
+
+if __name__ == "__main__":
+    main()
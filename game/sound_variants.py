@@ -0,0 +1,97 @@
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+# Panned and pitched sound variants
+#
+# A variant is a cached base buffer played faster (higher pitch) and louder
+# for a faster ball, and panned between the speakers by where the ball is.
+# It is derived with NumPy indexing and per-channel gains, never synthesized
+# again. At serve speed a variant is as loud as the base sound; faster balls
+# raise the Sound's volume rather than the samples, so buffers never clip.
+# Pan and speed are quantized so a rally only ever needs a handful of
+# distinct variants, which are kept in an LRU cache of pygame Sounds.
+
+PAN_STEPS = 9            # Positions from hard left (-1) to hard right (+1)
+SPEED_STEP = 0.5         # Ball speed quantum in pixels per frame
+SPEED_RANGE = (5, 12)    # Serve speed -> maximum speed
+PITCH_RANGE = (1.0, 1.5) # Playback rate at those speeds
+GAIN_RANGE = (1.0, 1.5)  # Volume factor at those speeds
+
+
+def quantize(pan, speed):
+    """Snap pan to PAN_STEPS positions and speed to SPEED_STEP"""
+    pan = max(-1.0, min(1.0, pan))
+    pan_index = round((pan + 1) / 2 * (PAN_STEPS - 1))
+    low, high = SPEED_RANGE
+    speed = max(low, min(high, speed))
+    return pan_index * 2 / (PAN_STEPS - 1) - 1, round(speed / SPEED_STEP) * SPEED_STEP
+
+
+def speed_curve(speed):
+    """(pitch, gain) for a ball speed"""
+    low, high = SPEED_RANGE
+    amount = (max(low, min(high, speed)) - low) / (high - low)
+    pitch = PITCH_RANGE[0] + amount * (PITCH_RANGE[1] - PITCH_RANGE[0])
+    gain = GAIN_RANGE[0] + amount * (GAIN_RANGE[1] - GAIN_RANGE[0])
+    return pitch, gain
+
+
+def derive(base, pan, pitch):
+    """
+    Make a variant of an int16 sample buffer.
+
+    Args:
+        base: Buffer of shape (samples, channels) or (samples,)
+        pan: -1 (left) to +1 (right); the far channel fades out while the
+             near one stays at full level, so pan 0 sounds like the base
+        pitch: Playback rate; 1.5 plays it 1.5x faster and higher
+
+    Returns:
+        New int16 buffer with the same channel layout
+    """
+    mono = base if base.ndim == 1 else base[:, 0]
+    # Resample by stepping through the base at the pitch ratio
+    signal = mono[(np.arange(int(len(mono) / pitch)) * pitch).astype(np.intp)].astype(np.float32)
+    if base.ndim == 1:
+        return signal.astype(np.int16)
+    gains = np.ones(base.shape[1], dtype=np.float32)
+    gains[0] *= min(1.0, 1 - pan)
+    gains[1:] *= min(1.0, 1 + pan)
+    return (signal[:, None] * gains).astype(np.int16)
+
+
+class VariantCache:
+    """LRU cache of panned, speed-scaled Sounds derived from base buffers"""
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self.bases = {}      # name -> (int16 buffer, volume)
+        self.sounds = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def add_base(self, name, sound):
+        """Register a loaded Sound as the base for name's variants"""
+        self.bases[name] = (pygame.sndarray.array(sound), sound.get_volume())
+
+    def get(self, name, pan=0.0, speed=SPEED_RANGE[0]):
+        """Sound for name at this pan and ball speed (derived on a cache miss)"""
+        pan, speed = quantize(pan, speed)
+        key = (name, pan, speed)
+        sound = self.sounds.get(key)
+        if sound is not None:
+            self.sounds.move_to_end(key)
+            self.hits += 1
+            return sound
+
+        self.misses += 1
+        base, volume = self.bases[name]
+        pitch, gain = speed_curve(speed)
+        sound = pygame.sndarray.make_sound(derive(base, pan, pitch))
+        sound.set_volume(min(1.0, volume * gain))
+        self.sounds[key] = sound
+        if len(self.sounds) > self.max_size:
+            # Evict the least recently used entry
+            self.sounds.popitem(last=False)
+        return sound
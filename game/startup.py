@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Startup timing
+#
+# StartupTimer records when each launch step finished, relative to launch,
+# and prints them as a report. The CLI launches fresh processes (so
+# no font scan or import is already cached in memory) and compares time to
+# first frame for the original startup (pygame.init(), four SysFont calls,
+# sounds synthesized up front without the disk cache) against the fast path main.py now uses
+# (only the display and font modules, cached font paths, sounds loaded in
+# the background).
+
+WIDTH, HEIGHT = 800, 600
+
+
+class StartupTimer:
+    """Time since launch at which each startup step finished"""
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []   # (step, seconds since start)
+
+    def mark(self, step):
+        self.marks.append((step, time.perf_counter() - self.start))
+
+    def report(self):
+        """One line per step: time since launch and time the step took"""
+        lines = []
+        previous = 0.0
+        for step, at in self.marks:
+            lines.append(f"{step:14} {at * 1e3:8.1f} ms  (+{(at - previous) * 1e3:.1f} ms)")
+            previous = at
+        return "\n".join(lines)
+
+
+def _launch(mode, timer):
+    """One startup in this process, like main.py (or the original main.py)"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from .game_engine import GameEngine, SoundManager
+    timer.mark('imports')
+
+    if mode == 'legacy':
+        pygame.init()
+    else:
+        pygame.display.init()
+        pygame.font.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    timer.mark('display')
+
+    if mode == 'legacy':
+        # What GameEngine.__init__ used to do: scan for fonts and synthesize
+        # every sound before returning, with no sound cache on disk
+        engine = GameEngine(WIDTH, HEIGHT, headless=True)
+        engine.headless = False
+        engine.sound_manager = SoundManager(cache_dir=None)
+        from .layers import LayerCache
+        from .text_cache import TextCache
+        engine.text_cache = TextCache()
+        engine.layers = LayerCache((WIDTH, HEIGHT))
+        engine.font = pygame.font.SysFont("Arial", 30)
+        engine.large_font = pygame.font.SysFont("Arial", 60, bold=True)
+        engine.medium_font = pygame.font.SysFont("Arial", 36)
+        engine.small_font = pygame.font.SysFont("Arial", 24)
+    else:
+        engine = GameEngine(WIDTH, HEIGHT, background_audio=True)
+    timer.mark('engine')
+
+    engine.render(screen)
+    pygame.display.flip()
+    timer.mark('first frame')
+
+    engine.sound_manager.ready.wait()
+    timer.mark('audio ready')
+    pygame.quit()
+
+
+def measure(mode, runs, cold=False):
+    """Launch runs fresh processes; returns {step: [seconds, ...]}"""
+    from . import fonts
+    steps = {}
+    for _ in range(runs):
+        if cold:
+            fonts.clear_cache()
+        result = subprocess.run([sys.executable, "-m", "game.startup", "--child", mode],
+                                capture_output=True, text=True, check=True)
+        for step, at in json.loads(result.stdout.strip().splitlines()[-1]):
+            steps.setdefault(step, []).append(at)
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time to first frame")
+    parser.add_argument("--runs", type=int, default=5, help="launches per configuration")
+    parser.add_argument("--child", choices=['legacy', 'fast'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        timer = StartupTimer()
+        _launch(args.child, timer)
+        print(json.dumps(timer.marks))
+        return
+
+    configurations = [
+        ('original', measure('legacy', args.runs)),
+        ('fast, cold font cache', measure('fast', args.runs, cold=True)),
+        ('fast, warm font cache', measure('fast', args.runs)),
+    ]
+    print(f"Median of {args.runs} launches, ms since the interpreter reached the launch code:")
+    steps = list(configurations[0][1])
+    print(f"{'':24}" + "".join(f"{step:>14}" for step in steps))
+    for name, results in configurations:
+        print(f"{name:24}" + "".join(f"{statistics.median(results[step]) * 1e3:14.1f}"
+                                      for step in steps))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import argparse
+import math
+import pickle
+import random
+import struct
+import time
+
+from .game_engine import GameEngine
+from .netcode import STATES, WINNERS
+from .replay import KEY_W, KEY_S, KEY_SPACE, ReplayKeys
+
+# Fixed-layout binary game state
+#
+# Every field of the simulation state (ball, both paddles, scores, series
+# and game state) has a fixed offset in one little-endian record of
+# STATE_SIZE bytes, so a state is written into a preallocated buffer with a
+# single struct.pack_into() call and read back with unpack_from(). Floats
+# are stored as doubles, so a round trip is exact. Random streams are not
+# part of the record; GameEngine.snapshot() still covers those.
+#
+# A delta holds a 64-bit mask of the fields that differ from a base record
+# followed by just those fields, copied with memoryview slices. Fields are
+# compared by their bytes. The record carries series_seed, but apply() does
+# not reseed the engine's random streams from it.
+
+# Field name and struct format, in record order
+FIELDS = (
+    ('ball_x', 'd'), ('ball_y', 'd'), ('ball_prev_x', 'd'), ('ball_prev_y', 'd'),
+    ('ball_velocity_x', 'd'), ('ball_velocity_y', 'd'), ('ball_prev_velocity_y', 'd'),
+    ('player_y', 'd'), ('player_prev_y', 'd'), ('player_prediction', 'd'),
+    ('player_prediction_vx', 'd'), ('player_prediction_vy', 'd'), ('player_reaction_timer', 'h'),
+    ('ai_y', 'd'), ('ai_prev_y', 'd'), ('ai_prediction', 'd'),
+    ('ai_prediction_vx', 'd'), ('ai_prediction_vy', 'd'), ('ai_reaction_timer', 'h'),
+    ('player_score', 'H'), ('ai_score', 'H'),
+    ('player_games_won', 'B'), ('ai_games_won', 'B'), ('series_target', 'B'),
+    ('series_seed', 'Q'),
+    ('state', 'B'), ('winner', 'B'), ('selected_option', 'B'), ('m_key_pressed', '?'),
+)
+STATE = struct.Struct('<' + ''.join(fmt for _, fmt in FIELDS))
+STATE_SIZE = STATE.size
+FIELD_NAMES = [name for name, _ in FIELDS]
+
+# (offset, size) of every field inside the record
+FIELD_SPANS = []
+_offset = 0
+for _, _fmt in FIELDS:
+    _size = struct.calcsize('<' + _fmt)
+    FIELD_SPANS.append((_offset, _size))
+    _offset += _size
+
+# The same record read as unsigned integers: fields compare by their bits,
+# so an unchanged NaN is not reported as a change
+RAW = struct.Struct('<' + ''.join({'d': 'Q', 'h': 'H', '?': 'B'}.get(fmt, fmt) for _, fmt in FIELDS))
+FIELD_INDICES = range(len(FIELDS))
+
+DELTA_HEADER = struct.Struct('<Q')            # mask of the fields present
+DELTA_MAX_SIZE = DELTA_HEADER.size + STATE_SIZE
+
+NONE = math.nan   # Stored for paddle predictions that are None
+
+
+def _optional(value):
+    return NONE if value is None else value
+
+
+def _paddle_values(paddle):
+    velocity = paddle.prediction_velocity or (NONE, NONE)
+    return (paddle.y, paddle.prev_y, _optional(paddle.prediction),
+            velocity[0], velocity[1], paddle.reaction_timer)
+
+
+def state_values(engine):
+    """The engine's state as a tuple in FIELDS order"""
+    ball = engine.ball
+    return ((ball.x, ball.y, ball.prev_x, ball.prev_y,
+             ball.velocity_x, ball.velocity_y, ball.prev_velocity_y)
+            + _paddle_values(engine.player) + _paddle_values(engine.ai)
+            + (engine.player_score, engine.ai_score,
+               engine.player_games_won, engine.ai_games_won, engine.series_target,
+               engine.series_seed,
+               STATES.index(engine.state), WINNERS.index(engine.winner),
+               engine.selected_option, engine.m_key_pressed))
+
+
+def pack_into(engine, buffer, offset=0):
+    """Write the engine's state into buffer at offset (STATE_SIZE bytes)"""
+    STATE.pack_into(buffer, offset, *state_values(engine))
+
+
+def unpack(buffer, offset=0):
+    """Read a record back as a tuple in FIELDS order"""
+    return STATE.unpack_from(buffer, offset)
+
+
+def _restore_paddle(paddle, y, prev_y, prediction, prediction_vx, prediction_vy, reaction_timer):
+    paddle.y = y
+    paddle.prev_y = prev_y
+    paddle.prediction = None if math.isnan(prediction) else prediction
+    paddle.prediction_velocity = None if math.isnan(prediction_vx) else (prediction_vx, prediction_vy)
+    paddle.reaction_timer = reaction_timer
+
+
+def apply(engine, values):
+    """Put an engine into the state of an unpacked record"""
+    ball = engine.ball
+    (ball.x, ball.y, ball.prev_x, ball.prev_y,
+     ball.velocity_x, ball.velocity_y, ball.prev_velocity_y) = values[0:7]
+    _restore_paddle(engine.player, *values[7:13])
+    _restore_paddle(engine.ai, *values[13:19])
+    (engine.player_score, engine.ai_score, engine.player_games_won, engine.ai_games_won,
+     series_target, engine.series_seed, state, winner,
+     engine.selected_option, engine.m_key_pressed) = values[19:]
+    engine.series_target = series_target
+    engine.series_mode = f'best_of_{series_target * 2 - 1}' if series_target else None
+    engine.state = STATES[state]
+    engine.winner = WINNERS[winner]
+
+
+def encode_delta(base, current, out):
+    """
+    Write the fields of current that differ from base into out.
+
+    Args:
+        base, current: STATE_SIZE byte records (any buffer)
+        out: Writable buffer of at least DELTA_MAX_SIZE bytes
+
+    Returns:
+        Number of bytes written
+    """
+    current = memoryview(current)
+    mask = 0
+    position = DELTA_HEADER.size
+    for i, old, new in zip(FIELD_INDICES, RAW.unpack_from(base), RAW.unpack_from(current)):
+        if old != new:
+            offset, size = FIELD_SPANS[i]
+            mask |= 1 << i
+            out[position:position + size] = current[offset:offset + size]
+            position += size
+    DELTA_HEADER.pack_into(out, 0, mask)
+    return position
+
+
+def decode_delta(base, delta, out):
+    """Rebuild a record into out from its base record and a delta"""
+    out, delta = memoryview(out), memoryview(delta)
+    out[:STATE_SIZE] = base
+    mask, = DELTA_HEADER.unpack_from(delta)
+    position = DELTA_HEADER.size
+    i = 0
+    while mask:
+        if mask & 1:
+            offset, size = FIELD_SPANS[i]
+            out[offset:offset + size] = delta[position:position + size]
+            position += size
+        mask >>= 1
+        i += 1
+
+
+def _play(engine, rng, frames):
+    """Drive an engine through random input, yielding after every tick"""
+    keys = ReplayKeys()
+    for _ in range(frames):
+        if engine.state == 'menu':
+            engine._start_series(rng.choice([3, 5, 7]))
+        keys.bits = rng.choice([0, KEY_W, KEY_S, KEY_SPACE])
+        engine.step(keys)
+        yield
+
+
+def _comparable(engine):
+    """Everything snapshot() holds except the random streams"""
+    snapshot = engine.snapshot()
+    return snapshot[:11] + snapshot[14:17]
+
+
+def check_round_trip(frames=20000, seed=0):
+    """Pack, unpack, apply and delta-encode every tick of a random session"""
+    rng = random.Random(seed)
+    engine = GameEngine(800, 600, headless=True, seed=seed)
+    engine.ai_mode = 'predictive'
+    copy = GameEngine(800, 600, headless=True, seed=seed)
+    record, previous, rebuilt, again = (bytearray(STATE_SIZE) for _ in range(4))
+    delta = bytearray(DELTA_MAX_SIZE)
+    failures = delta_bytes = 0
+    for _ in _play(engine, rng, frames):
+        pack_into(engine, record)
+        apply(copy, unpack(record))
+        pack_into(copy, again)
+        length = encode_delta(previous, record, delta)
+        decode_delta(previous, delta[:length], rebuilt)
+        delta_bytes += length
+        if again != record or rebuilt != record or _comparable(copy) != _comparable(engine):
+            failures += 1
+        previous[:] = record
+    print(f"Round trip: {frames} ticks, {failures} mismatches; record {STATE_SIZE} B, "
+          f"delta {delta_bytes / frames:.1f} B per tick on average")
+    return failures == 0
+
+
+def measure_throughput(repeats=100000, seed=0):
+    """Records and deltas per second, next to pickling GameEngine.snapshot()"""
+    rng = random.Random(seed)
+    engine = GameEngine(800, 600, headless=True, seed=seed)
+    states = []
+    record = bytearray(STATE_SIZE)
+    for _ in _play(engine, rng, 200):
+        pack_into(engine, record)
+        states.append(bytes(record))
+    base, current = states[-2], states[-1]
+    out = bytearray(DELTA_MAX_SIZE)
+    rebuilt = bytearray(STATE_SIZE)
+    length = encode_delta(base, current, out)
+    delta = bytes(out[:length])
+
+    def rate(func):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            func()
+        elapsed = time.perf_counter() - start
+        return repeats / elapsed, elapsed / repeats * 1e6
+
+    results = [
+        ('pack_into', rate(lambda: pack_into(engine, record))),
+        ('unpack', rate(lambda: unpack(record))),
+        ('encode_delta', rate(lambda: encode_delta(base, current, out))),
+        ('decode_delta', rate(lambda: decode_delta(base, delta, rebuilt))),
+        ('pickle snapshot()', rate(lambda: pickle.dumps(engine.snapshot()))),
+    ]
+    for name, (per_second, us) in results:
+        print(f"{name:18} {per_second:12,.0f}/s {us:8.2f} us")
+    print(f"Pickled snapshot: {len(pickle.dumps(engine.snapshot()))} B, record: {STATE_SIZE} B, "
+          f"one-tick delta: {length} B")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-trip and throughput check of the state codec")
+    parser.add_argument("--frames", type=int, default=20000, help="ticks to round-trip")
+    parser.add_argument("--repeats", type=int, default=100000, help="calls per throughput timing")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ok = check_round_trip(args.frames, args.seed)
+    measure_throughput(args.repeats, args.seed)
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
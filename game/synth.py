@@ -0,0 +1,119 @@
+import hashlib
+import os
+
+import numpy as np
+
+# Procedural sound synthesis
+#
+# Every effect is described by a small parameter dict and rendered with
+# whole-array NumPy operations. Rendered buffers are cached on disk keyed by
+# those parameters and the mixer format, so later launches only load them.
+
+CACHE_DIR = os.path.join("sounds", "cache")
+FULL_SCALE = 32767
+
+
+def sample_times(duration, sample_rate):
+    """Time in seconds of every sample in a clip"""
+    samples = int(sample_rate * duration)
+    return np.arange(samples) / sample_rate
+
+
+def tone(t, frequency):
+    """Constant-pitch sine wave"""
+    return np.sin(2 * np.pi * frequency * t)
+
+
+def sweep(t, start_frequency, end_frequency, duration):
+    """Sine wave whose pitch rises (or falls) linearly over the clip"""
+    frequency = start_frequency + (end_frequency - start_frequency) * t / duration
+    return np.sin(2 * np.pi * frequency * t)
+
+
+def linear_decay(t, duration, peak=1.0):
+    """Envelope falling linearly from peak to silence"""
+    return FULL_SCALE * (1 - t / duration) * peak
+
+
+def exponential_decay(t, rate, peak=1.0):
+    """Envelope falling exponentially from peak (rate in 1/seconds)"""
+    return FULL_SCALE * np.exp(-rate * t) * peak
+
+
+def render(params, sample_rate, channels=2):
+    """
+    Render a sound description into an int16 sample buffer.
+
+    Args:
+        params: dict with 'wave' ('tone' or 'sweep'), 'duration' and the
+                wave's frequencies, plus optional 'decay' ('linear' or
+                'exponential'), 'decay_rate' and 'peak'
+        sample_rate: Output sample rate in Hz
+        channels: Output channel count (the mono signal is copied to each)
+
+    Returns:
+        numpy int16 array of shape (samples, channels), or (samples,) for mono
+    """
+    duration = params['duration']
+    t = sample_times(duration, sample_rate)
+
+    if params['wave'] == 'tone':
+        signal = tone(t, params['frequency'])
+    elif params['wave'] == 'sweep':
+        signal = sweep(t, params['start_frequency'], params['end_frequency'], duration)
+    else:
+        raise ValueError(f"Unknown wave type: {params['wave']}")
+
+    peak = params.get('peak', 1.0)
+    if params.get('decay', 'linear') == 'exponential':
+        envelope = exponential_decay(t, params['decay_rate'], peak)
+    else:
+        envelope = linear_decay(t, duration, peak)
+
+    # astype truncates toward zero, same as int() on each sample
+    samples = (envelope * signal).astype(np.int16)
+    if channels == 1:
+        return samples
+    return np.repeat(samples[:, None], channels, axis=1)
+
+
+def cache_key(name, params, mixer_format):
+    """Stable file name for a rendered buffer"""
+    description = repr((name, sorted(params.items()), tuple(mixer_format)))
+    digest = hashlib.sha1(description.encode("utf-8")).hexdigest()[:16]
+    return f"{name}-{digest}.npy"
+
+
+def load_or_render(name, params, mixer_format, cache_dir=CACHE_DIR):
+    """
+    Return the sample buffer for a sound, rendering and caching it on a miss.
+
+    Args:
+        name: Sound name (only used to make cache files readable)
+        params: Sound description passed to render()
+        mixer_format: pygame.mixer.get_init() tuple (frequency, size, channels)
+        cache_dir: Directory holding cached .npy buffers (None renders
+                   without reading or writing the cache)
+    """
+    if cache_dir is None:
+        frequency, _, channels = mixer_format
+        return render(params, frequency, channels)
+    path = os.path.join(cache_dir, cache_key(name, params, mixer_format))
+    if os.path.exists(path):
+        try:
+            return np.load(path)
+        except (OSError, ValueError):
+            pass  # Corrupt or partial file, render it again
+
+    frequency, _, channels = mixer_format
+    samples = render(params, frequency, channels)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write then rename so an interrupted launch never leaves half a file
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, samples)
+        os.replace(temp_path, path)
+    except OSError:
+        pass  # Read-only install, just keep the rendered buffer in memory
+    return samples
@@ -0,0 +1,208 @@
+import argparse
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# Rally telemetry
+#
+# The engine reports every paddle hit (where on the paddle it struck and
+# the ball's velocity after the bounce) and every point (who scored, after
+# how many hits). Reporting only appends a tuple to an in-memory ring
+# buffer; a background thread drains it every flush_interval seconds and
+# writes each batch to SQLite in one transaction, so update() never waits
+# on the disk. If the writer falls behind and the buffer fills up, the
+# oldest events are dropped and counted.
+#
+# Rows are keyed by series (the series seed in hex), game (games already
+# finished in that series) and point (points already played in that game).
+# The (series, game) indexes serve per-series and per-game queries alike.
+
+DEFAULT_PATH = os.path.join("telemetry", "rallies.db")
+EDGE_HIT = 0.7   # |relative hit| from which a hit counts as an edge hit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hits (
+    series TEXT NOT NULL,
+    game INTEGER NOT NULL,
+    point INTEGER NOT NULL,
+    hit INTEGER NOT NULL,          -- 1 for the first hit of the rally
+    side TEXT NOT NULL,            -- 'player' or 'ai'
+    relative_hit REAL NOT NULL,    -- -1 paddle top, 0 center, +1 bottom
+    speed REAL NOT NULL,           -- ball speed after the hit, px/tick
+    time REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS points (
+    series TEXT NOT NULL,
+    game INTEGER NOT NULL,
+    point INTEGER NOT NULL,
+    scorer TEXT NOT NULL,
+    hits INTEGER NOT NULL,         -- rally length in paddle hits
+    time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS hits_series_game ON hits (series, game);
+CREATE INDEX IF NOT EXISTS points_series_game ON points (series, game);
+"""
+
+
+class Telemetry:
+    """Ring-buffered rally events written to SQLite by a background thread"""
+    def __init__(self, path=DEFAULT_PATH, capacity=4096, flush_interval=1.0):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.events = deque(maxlen=capacity)   # Appends and pops are thread-safe
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+
+        # Current rally: (series, game, point) and paddle hits so far
+        self.rally = None
+        self.rally_hits = 0
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _append(self, event):
+        if len(self.events) == self.capacity:
+            self.dropped += 1   # The deque discards the oldest event
+        self.events.append(event)
+
+    def hit(self, engine):
+        """Record the paddle hit the ball just bounced off"""
+        ball = engine.ball
+        rally = (engine.series_seed, engine.player_games_won + engine.ai_games_won,
+                 engine.player_score + engine.ai_score)
+        if rally != self.rally:
+            self.rally = rally
+            self.rally_hits = 0
+        self.rally_hits += 1
+        self._append(('hit', rally, self.rally_hits, ball.velocity_x,
+                      ball.velocity_y, ball.last_hit, time.time()))
+
+    def point(self, engine, scorer):
+        """Record a point; call it after the score changed, before the game can end"""
+        rally = (engine.series_seed, engine.player_games_won + engine.ai_games_won,
+                 engine.player_score + engine.ai_score - 1)
+        hits = self.rally_hits if rally == self.rally else 0
+        self.rally = None
+        self._append(('point', rally, scorer, hits, time.time()))
+
+    def _run(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path)
+        db.executescript(SCHEMA)
+        while not self._stop.wait(self.flush_interval):
+            self._flush(db)
+        self._flush(db)
+        db.close()
+
+    def _flush(self, db):
+        """Write everything buffered so far as one transaction"""
+        hits, points = [], []
+        events = self.events
+        while events:
+            event = events.popleft()
+            (series, game, point) = event[1]
+            series = f"{series:016x}"
+            if event[0] == 'hit':
+                _, _, hit, velocity_x, velocity_y, relative_hit, when = event
+                # Paddles bounce the ball back toward the other side
+                side = 'player' if velocity_x > 0 else 'ai'
+                hits.append((series, game, point, hit, side, relative_hit,
+                             math.hypot(velocity_x, velocity_y), when))
+            else:
+                _, _, scorer, rally_hits, when = event
+                points.append((series, game, point, scorer, rally_hits, when))
+        if not hits and not points:
+            return
+        with db:
+            db.executemany("INSERT INTO hits VALUES (?, ?, ?, ?, ?, ?, ?, ?)", hits)
+            db.executemany("INSERT INTO points VALUES (?, ?, ?, ?, ?, ?)", points)
+        self.written += len(hits) + len(points)
+        self.batches += 1
+
+    def close(self):
+        """Flush what is left and stop the writer"""
+        self._stop.set()
+        self._thread.join()
+
+
+def summary(db, series=None):
+    """Aggregate stats as a list of (label, value) rows"""
+    where, params = ("WHERE series = ?", (series,)) if series else ("", ())
+    rows = []
+    count, games, points, mean, longest = db.execute(
+        f"SELECT COUNT(DISTINCT series), COUNT(DISTINCT series || ':' || game), COUNT(*), "
+        f"AVG(hits), MAX(hits) FROM points {where}", params).fetchone()
+    rows.append(("series", count))
+    rows.append(("games", games))
+    rows.append(("points", points))
+    if points:
+        rows.append(("mean rally (hits)", f"{mean:.2f}"))
+        rows.append(("longest rally (hits)", longest))
+    for side in ('player', 'ai'):
+        hits, offset, edge, speed, top = db.execute(
+            f"SELECT COUNT(*), AVG(ABS(relative_hit)), AVG(ABS(relative_hit) >= ?), "
+            f"AVG(speed), MAX(speed) FROM hits WHERE side = ? "
+            f"{where.replace('WHERE', 'AND')}", (EDGE_HIT, side) + params).fetchone()
+        won, won_rally = db.execute(
+            f"SELECT COUNT(*), AVG(hits) FROM points WHERE scorer = ? "
+            f"{where.replace('WHERE', 'AND')}", (side,) + params).fetchone()
+        rows.append((f"{side} hits", hits))
+        if hits:
+            rows.append((f"{side} mean |relative hit|", f"{offset:.2f}"))
+            rows.append((f"{side} edge hits", f"{edge:.1%}"))
+            rows.append((f"{side} speed after hit", f"{speed:.2f} (max {top:.2f})"))
+        rows.append((f"{side} points won", won))
+        if won:
+            rows.append((f"{side} mean rally when scoring", f"{won_rally:.2f}"))
+    return rows
+
+
+def rally_lengths(db, series=None):
+    """(rally length in hits, points) for every length played"""
+    where, params = ("WHERE series = ?", (series,)) if series else ("", ())
+    return db.execute(f"SELECT hits, COUNT(*) FROM points {where} GROUP BY hits ORDER BY hits",
+                      params).fetchall()
+
+
+def list_series(db):
+    """(series, games, points, mean rally, last point time) per series, newest first"""
+    return db.execute(
+        "SELECT series, COUNT(DISTINCT game), COUNT(*), AVG(hits), MAX(time) FROM points "
+        "GROUP BY series ORDER BY MAX(time) DESC").fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate rally telemetry stats")
+    parser.add_argument("--db", default=DEFAULT_PATH, help="telemetry database")
+    parser.add_argument("--series", help="only this series (hex seed, see --list)")
+    parser.add_argument("--list", action="store_true", help="list recorded series")
+    parser.add_argument("--rallies", action="store_true", help="print the rally length histogram")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"No telemetry database at {args.db}")
+    db = sqlite3.connect(args.db)
+    if args.list:
+        print(f"{'series':16} {'games':>5} {'points':>6} {'rally':>6}  last point")
+        for series, games, points, mean, when in list_series(db):
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(when))
+            print(f"{series:16} {games:5} {points:6} {mean:6.2f}  {stamp}")
+        return
+    for label, value in summary(db, args.series):
+        print(f"{label:30} {value}")
+    if args.rallies:
+        print("\nRally length (hits): points")
+        for hits, points in rally_lengths(db, args.series):
+            print(f"{hits:4}: {points}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from collections import OrderedDict
+
+# Text surface cache
+#
+# font.render() rasterizes the whole string every call, which makes it the
+# most expensive thing in a frame. Rendered surfaces are kept here and reused
+# until the text (or its font/color) actually changes.
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by font, string and color"""
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Drop-in replacement for font.render(text, antialias, color).
+
+        The returned surface is shared between callers, so it must be
+        treated as read-only.
+        """
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            # Evict the least recently used entry
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop every cached surface"""
+        self.surfaces.clear()
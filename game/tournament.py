@@ -0,0 +1,248 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from multiprocessing import Pool
+
+from .game_engine import GameEngine
+
+# Monte Carlo tournament runner
+#
+# Plays many headless series between two AI-controlled paddles across a
+# process pool and reports win rates, rally lengths and game durations with
+# 95% confidence intervals. Every series is seeded from (seed, matchup,
+# series index), so results do not depend on the number of workers.
+
+WIDTH, HEIGHT = 800, 600
+Z_95 = 1.96
+
+
+class AIConfig:
+    """Settings for one AI-controlled paddle"""
+    def __init__(self, mode='reactive', difficulty=0.8, noise=0.0, reaction_delay=0):
+        self.mode = mode
+        self.difficulty = difficulty
+        self.noise = noise
+        self.reaction_delay = reaction_delay
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Parse 'reactive:DIFFICULTY' or 'predictive:NOISE:DELAY'
+        (e.g. 'reactive:0.8', 'predictive:25:6')
+        """
+        parts = text.split(':')
+        if parts[0] == 'reactive':
+            difficulty = float(parts[1]) if len(parts) > 1 else 0.8
+            return cls('reactive', difficulty=difficulty)
+        if parts[0] == 'predictive':
+            noise = float(parts[1]) if len(parts) > 1 else 0.0
+            delay = int(parts[2]) if len(parts) > 2 else 0
+            return cls('predictive', noise=noise, reaction_delay=delay)
+        raise ValueError(f"Unknown AI config: {text}")
+
+    def label(self):
+        if self.mode == 'reactive':
+            return f"reactive:{self.difficulty:g}"
+        return f"predictive:{self.noise:g}:{self.reaction_delay}"
+
+    def apply_to_engine(self, engine):
+        """Use this config for the engine's own (right-hand) AI paddle"""
+        engine.ai_mode = self.mode
+        engine.ai_difficulty = self.difficulty
+        engine.ai_noise = self.noise
+        engine.ai_reaction_delay = self.reaction_delay
+
+    def move_player(self, engine):
+        """Drive the engine's left-hand (player) paddle for one frame"""
+        if self.mode == 'predictive':
+            engine.player.predict_track(engine.ball, engine.height, self.noise, self.reaction_delay)
+        else:
+            engine.player.auto_track(engine.ball, engine.height, self.difficulty, side='left')
+
+
+def series_seed(seed, matchup, index):
+    """Deterministic per-series seed, independent of scheduling"""
+    return random.Random(f"{seed}:{matchup}:{index}").getrandbits(64)
+
+
+def play_series(left, right, best_of, winning_score, seed, max_frames):
+    """
+    Play one headless series between two AI paddles.
+
+    Returns:
+        dict with the series winner ('player', 'ai' or None if a game hit
+        max_frames), rally lengths (paddle hits per point) and game
+        durations in frames
+    """
+    engine = GameEngine(WIDTH, HEIGHT, headless=True, seed=seed)
+    engine.winning_score = winning_score
+    right.apply_to_engine(engine)
+    engine._start_series(best_of)
+
+    rallies = []
+    durations = []
+    hits = 0
+    game_frames = 0
+
+    while engine.state != 'series_over':
+        if game_frames >= max_frames:
+            return {'winner': None, 'rallies': rallies, 'durations': durations}
+
+        left.move_player(engine)
+        direction = engine.ball.velocity_x
+        points = engine.player_score + engine.ai_score
+        engine.update()
+        game_frames += 1
+
+        if engine.player_score + engine.ai_score != points:
+            rallies.append(hits)
+            hits = 0
+        elif (engine.ball.velocity_x > 0) != (direction > 0):
+            hits += 1
+
+        if engine.state != 'playing':
+            durations.append(game_frames)
+            game_frames = 0
+            if engine.state == 'game_over':
+                engine._next_game()
+
+    return {'winner': engine.winner, 'rallies': rallies, 'durations': durations}
+
+
+def run_chunk(job):
+    """Worker entry point: play a contiguous block of series for one matchup"""
+    matchup, left, right, start, count, args = job
+    totals = {'player': 0, 'ai': 0, 'timeouts': 0,
+              'rally_sum': 0, 'rally_sq': 0, 'rally_n': 0,
+              'duration_sum': 0, 'duration_sq': 0, 'duration_n': 0}
+    for index in range(start, start + count):
+        result = play_series(left, right, args['best_of'], args['winning_score'],
+                             series_seed(args['seed'], matchup, index), args['max_frames'])
+        if result['winner'] is None:
+            totals['timeouts'] += 1
+        else:
+            totals[result['winner']] += 1
+        for rally in result['rallies']:
+            totals['rally_sum'] += rally
+            totals['rally_sq'] += rally * rally
+            totals['rally_n'] += 1
+        for duration in result['durations']:
+            totals['duration_sum'] += duration
+            totals['duration_sq'] += duration * duration
+            totals['duration_n'] += 1
+    return matchup, totals
+
+
+def wilson_interval(wins, total):
+    """95% Wilson score interval for a win rate"""
+    if total == 0:
+        return 0.0, 0.0, 0.0
+    p = wins / total
+    denominator = 1 + Z_95 ** 2 / total
+    center = (p + Z_95 ** 2 / (2 * total)) / denominator
+    margin = Z_95 * math.sqrt(p * (1 - p) / total + Z_95 ** 2 / (4 * total ** 2)) / denominator
+    return p, max(0.0, center - margin), min(1.0, center + margin)
+
+
+def mean_interval(total, squares, n):
+    """Mean and 95% normal-approximation half width"""
+    if n == 0:
+        return 0.0, 0.0
+    mean = total / n
+    if n < 2:
+        return mean, 0.0
+    variance = max(0.0, (squares - n * mean * mean) / (n - 1))
+    return mean, Z_95 * math.sqrt(variance / n)
+
+
+def summarize(left, right, totals):
+    """Turn summed counters into the reported statistics"""
+    played = totals['player'] + totals['ai']
+    win_rate, low, high = wilson_interval(totals['player'], played)
+    rally, rally_ci = mean_interval(totals['rally_sum'], totals['rally_sq'], totals['rally_n'])
+    duration, duration_ci = mean_interval(totals['duration_sum'], totals['duration_sq'],
+                                          totals['duration_n'])
+    return {
+        'left': left.label(),
+        'right': right.label(),
+        'series': played + totals['timeouts'],
+        'left_wins': totals['player'],
+        'right_wins': totals['ai'],
+        'timeouts': totals['timeouts'],
+        'left_win_rate': win_rate,
+        'left_win_rate_ci': [low, high],
+        'mean_rally': rally,
+        'mean_rally_ci': rally_ci,
+        'mean_game_frames': duration,
+        'mean_game_frames_ci': duration_ci,
+    }
+
+
+def run_tournament(lefts, rights, series, workers, chunk_size, **args):
+    """Play every left x right matchup and return one summary per matchup"""
+    matchups = list(itertools.product(lefts, rights))
+    jobs = []
+    for matchup, (left, right) in enumerate(matchups):
+        for start in range(0, series, chunk_size):
+            jobs.append((matchup, left, right, start, min(chunk_size, series - start), args))
+
+    merged = [None] * len(matchups)
+    with Pool(workers) as pool:
+        for matchup, totals in pool.imap_unordered(run_chunk, jobs):
+            if merged[matchup] is None:
+                merged[matchup] = totals
+            else:
+                for key, value in totals.items():
+                    merged[matchup][key] += value
+
+    return [summarize(left, right, totals) for (left, right), totals in zip(matchups, merged)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless AI tournament runner")
+    parser.add_argument("--left", nargs="+", default=["reactive:0.8"],
+                        help="AI configs for the left paddle (reactive:DIFF or predictive:NOISE:DELAY)")
+    parser.add_argument("--right", nargs="+", default=["reactive:0.8"],
+                        help="AI configs for the right paddle")
+    parser.add_argument("--series", type=int, default=200, help="series per matchup")
+    parser.add_argument("--best-of", type=int, default=3, choices=[3, 5, 7])
+    parser.add_argument("--winning-score", type=int, default=5, help="points per game")
+    parser.add_argument("--max-frames", type=int, default=60 * 60 * 10,
+                        help="frames before a game is abandoned as a timeout")
+    parser.add_argument("--seed", type=int, default=0, help="base random seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=10, help="series per job")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    lefts = [AIConfig.parse(text) for text in args.left]
+    rights = [AIConfig.parse(text) for text in args.right]
+
+    start = time.perf_counter()
+    results = run_tournament(lefts, rights, args.series, args.workers, args.chunk_size,
+                             best_of=args.best_of, winning_score=args.winning_score,
+                             max_frames=args.max_frames, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        low, high = result['left_win_rate_ci']
+        print(f"{result['left']:>20} vs {result['right']:<20} "
+              f"left wins {result['left_win_rate']:6.1%} [{low:.1%}, {high:.1%}]  "
+              f"rally {result['mean_rally']:5.2f} ±{result['mean_rally_ci']:.2f}  "
+              f"game {result['mean_game_frames']:7.0f} ±{result['mean_game_frames_ci']:.0f} frames  "
+              f"timeouts {result['timeouts']}")
+    total_series = sum(result['series'] for result in results)
+    print(f"{total_series} series in {elapsed:.1f}s on {args.workers} workers "
+          f"({total_series / elapsed:.1f} series/s)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
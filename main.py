@@ -1,57 +1,205 @@
+import time
+
+LAUNCH_TIME = time.perf_counter()
+
 import pygame
 from game.game_engine import GameEngine
+from game.run_ahead import RunAhead
+from game.startup import StartupTimer
+from game.telemetry import Telemetry
 
-# Initialize pygame/Start application
-pygame.init()
+startup = StartupTimer(LAUNCH_TIME)
+startup.mark('imports')
+
+# Start only the subsystems the game uses (the mixer is started by the
+# engine's SoundManager) instead of everything pygame.init() brings up
+pygame.display.init()
+pygame.font.init()
 
 # Screen dimensions
 WIDTH, HEIGHT = 800, 600
 SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Ping Pong - Pygame Version")
+startup.mark('display')
 
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
+# Timing: the simulation runs at a fixed tick rate, rendering runs as fast as
+# RENDER_FPS allows and interpolates between the last two ticks
+TICK_RATE = 60          # Simulation ticks per second
+RENDER_FPS = 144        # Rendered frames per second (0 = uncapped)
+MAX_FRAME_TIME = 0.25   # Longest frame we try to catch up on, in seconds
+
+# Audio: sample rate and mixer buffer size in samples. Smaller buffers
+# play effects sooner but can drop out on slow machines; measure with
+# python -m game.audio
+AUDIO_FREQUENCY = 22050
+AUDIO_BUFFER = 512
+
+# Idle screens (menu, game over, series over): True sleeps in
+# pygame.event.wait() and only redraws after input or a state change, False
+# keeps rendering at RENDER_FPS. IDLE_TIMEOUT is the longest sleep, in ms
+IDLE_WAIT = True
+IDLE_TIMEOUT = 500
+IDLE_STATES = ('menu', 'game_over', 'series_over')
+
+# Run-ahead: draw the game this many ticks ahead with the keys held right
+# now, then return to the real state (0 = off). Cuts input-to-display
+# latency by about a tick per frame of run-ahead; measure with
+# python -m game.run_ahead
+RUN_AHEAD = 0
+
+# Rendering: True only redraws and presents the regions that changed each
+# frame, False clears and flips the whole screen
+DIRTY_RECTS = True
+
+# Balls in play at once; more than 1 turns on chaos mode (replays are
+# only recorded with a single ball)
+BALL_COUNT = 1
+
+# Every series played is saved here as a compact replay (None disables it)
+REPLAY_DIR = "replays"
+
+# Paddle hits and points are logged here for python -m game.telemetry
+# (None disables it); writes happen on a background thread
+TELEMETRY_DB = "telemetry/rallies.db"
+
+# Print how long each startup step took, up to the first frame and until
+# the sounds finished loading in the background
+STARTUP_REPORT = False
+
+# Frame profiler: F3 toggles it (with its overlay) at runtime; timings are
+# exported here as CSV/JSON on exit
+PROFILE = False
+PROFILE_DIR = "profiles"
+
 # Clock
 clock = pygame.time.Clock()
-FPS = 60
 
 # Game loop
-engine = GameEngine(WIDTH, HEIGHT)
+engine = GameEngine(WIDTH, HEIGHT, background_audio=True,
+                    audio_frequency=AUDIO_FREQUENCY, audio_buffer=AUDIO_BUFFER)
+startup.mark('engine')
+engine.replay_dir = REPLAY_DIR
+engine.ball_count = BALL_COUNT
+profiler = engine.profiler
+run_ahead = RunAhead(engine, RUN_AHEAD)
+if PROFILE:
+    profiler.toggle()
 
 def main():
+    # Started here rather than at import, so importing main writes nothing
+    if TELEMETRY_DB is not None:
+        engine.telemetry = Telemetry(TELEMETRY_DB)
     running = True
+    tick_duration = 1.0 / TICK_RATE
+    accumulator = 0.0
+    previous_time = time.perf_counter()
+    first_frame = True
+    audio_loading = True
+    drawn_state = None   # State shown by the last idle redraw
+
     while running:
-        SCREEN.fill(BLACK)
-        
+        # Nothing moves on idle screens: sleep until input arrives instead of
+        # drawing the same frame again (the timeout only lets the startup
+        # report notice the sounds finishing). The profiler overlay keeps
+        # the loop at full rate while it is shown
+        idle = IDLE_WAIT and engine.state in IDLE_STATES and not profiler.enabled
+        if idle and drawn_state == engine.state:
+            event = pygame.event.wait(IDLE_TIMEOUT)
+            if event.type in (pygame.NOEVENT, pygame.MOUSEMOTION) and not audio_loading:
+                continue
+            if event.type != pygame.NOEVENT:
+                pygame.event.post(event)
+            # Sleeping is not lag to catch up on once play resumes
+            previous_time = time.perf_counter()
+            accumulator = tick_duration
+
+        # Measure real time since the last frame (clamped after stalls so we
+        # don't try to simulate seconds of backlog at once)
+        now = time.perf_counter()
+        accumulator += min(now - previous_time, MAX_FRAME_TIME)
+        previous_time = now
+
+        frame_start = profiler.clock()
+
         # Collect events for menu handling
+        start = profiler.clock()
         events = pygame.event.get()
-        
+        profiler.add('events', start)
+
         for event in events:
             if event.type == pygame.QUIT:
                 running = False
-        
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle()
+                engine.request_full_redraw()
+
         # Handle menu events (navigation)
+        start = profiler.clock()
         menu_result = engine.handle_menu_events(events)
+        profiler.add('menu_events', start)
         if menu_result == 'quit':
             running = False
-        
-        # Handle game input (movement and other keys)
-        result = engine.handle_input()
-        if result == 'quit':
-            running = False
-        
-        # Update game state
-        engine.update()
-        
-        # Render current state
-        engine.render(SCREEN)
 
-        pygame.display.flip()
-        clock.tick(FPS)
+        # Run as many fixed ticks as real time calls for (possibly none)
+        while running and accumulator >= tick_duration:
+            # Handle game input (movement and other keys) and update game state
+            result = engine.step()
+            if result == 'quit':
+                running = False
+            accumulator -= tick_duration
+            if idle:
+                # Idle screens only react to input: one tick per wakeup
+                accumulator = min(accumulator, 0.0)
+
+        # Render current state, blended between the last two ticks
+        alpha = accumulator / tick_duration
+        start = profiler.clock()
+        run_ahead.begin()
+        if DIRTY_RECTS:
+            rects = engine.render_dirty(SCREEN, alpha)
+        else:
+            SCREEN.fill(BLACK)
+            engine.render(SCREEN, alpha)
+        run_ahead.end()
+        overlay_rect = profiler.draw(SCREEN)
+        profiler.add('render', start)
+
+        start = profiler.clock()
+        if DIRTY_RECTS:
+            if overlay_rect is not None:
+                rects.append(overlay_rect)
+            pygame.display.update(rects)
+        else:
+            pygame.display.flip()
+        profiler.add('present', start)
+        profiler.add('frame', frame_start)
+
+        drawn_state = engine.state if idle else None
+
+        # Startup timing: first frame on screen, then sounds loaded
+        if first_frame:
+            first_frame = False
+            startup.mark('first frame')
+        if audio_loading and engine.sound_manager.ready.is_set():
+            audio_loading = False
+            startup.mark('audio ready')
+            if STARTUP_REPORT:
+                print(startup.report())
+
+        if not idle:
+            clock.tick(RENDER_FPS)
 
+    # Keep the replay of a series that was quit part way through
+    engine.finish_replay()
+    if engine.telemetry is not None:
+        engine.telemetry.close()
+    for path in profiler.export(PROFILE_DIR):
+        print(f"Saved frame profile to {path}")
     pygame.quit()
 
-if _name_ == "_main_":
-    main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()